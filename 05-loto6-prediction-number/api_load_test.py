@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+予測APIの負荷試験
+Keep-Alive接続を使う複数スレッドでリクエストを送り、requests/sec とレイテンシを表示します
+"""
+
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from collections import Counter
+
+DEFAULT_PATHS = [
+    "/predictions",
+    "/analysis/frequency",
+    "/draws/recent?count=10",
+    "/tickets?count=10&method=balanced",
+]
+
+
+def worker(host, port, paths, deadline, conditional, latencies, statuses, lock):
+    """締め切りまでリクエストを送り続ける"""
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    etags = {}
+    local_latencies = []
+    local_statuses = Counter()
+    i = 0
+
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        headers = {}
+        if conditional and path in etags:
+            headers["If-None-Match"] = etags[path]
+
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            local_statuses["error"] += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        local_latencies.append(time.perf_counter() - start)
+        local_statuses[response.status] += 1
+
+        etag = response.getheader("ETag")
+        if etag:
+            etags[path] = etag
+
+    conn.close()
+    with lock:
+        latencies.extend(local_latencies)
+        statuses.update(local_statuses)
+
+
+def percentile(sorted_values, q):
+    index = min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="予測APIの負荷試験")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--concurrency", type=int, default=16, help="同時接続数")
+    parser.add_argument("--duration", type=float, default=10.0, help="試験時間(秒)")
+    parser.add_argument("--path", action="append", help="対象パス（複数指定可）")
+    parser.add_argument("--conditional", action="store_true",
+                        help="If-None-Match を送信して304応答を計測")
+    args = parser.parse_args()
+
+    paths = args.path or DEFAULT_PATHS
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+
+    print(f"🎯 {args.host}:{args.port} に {args.concurrency}接続 × {args.duration:.0f}秒")
+    started = time.perf_counter()
+    deadline = started + args.duration
+    threads = [
+        threading.Thread(target=worker, args=(args.host, args.port, paths, deadline,
+                                              args.conditional, latencies, statuses, lock))
+        for _ in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    if not latencies:
+        print("❌ 成功したリクエストがありません")
+        return
+
+    latencies.sort()
+    print(f"リクエスト数: {len(latencies):,}  ({len(latencies) / elapsed:,.0f} requests/sec)")
+    print("ステータス: " + ", ".join(f"{status}={count:,}" for status, count in sorted(statuses.items(), key=str)))
+    print("レイテンシ: "
+          f"平均 {statistics.mean(latencies) * 1000:.2f}ms / "
+          f"p50 {percentile(latencies, 50) * 1000:.2f}ms / "
+          f"p95 {percentile(latencies, 95) * 1000:.2f}ms / "
+          f"p99 {percentile(latencies, 99) * 1000:.2f}ms / "
+          f"最大 {latencies[-1] * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
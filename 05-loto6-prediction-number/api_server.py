@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+ロト6予測 HTTP APIサーバー
+他のサービスから予測結果をJSONで取得するためのエントリーポイント
+"""
+
+import argparse
+import os
+import sys
+
+# srcディレクトリをパスに追加
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ロト6予測 HTTP APIサーバー")
+    parser.add_argument("--host", default="127.0.0.1", help="待ち受けアドレス")
+    parser.add_argument("--port", type=int, default=8600, help="待ち受けポート")
+    parser.add_argument("--ttl", type=float, default=300.0, help="キャッシュとデータの有効期間(秒)")
+    parser.add_argument("--access-log", action="store_true", help="アクセスログを出力")
+    args = parser.parse_args()
+
+    # 予測スタックは引数解析後に読み込む（--help を高速に返すため）
+    from loto6_predictor.api.server import create_server, warm_up
+
+    server = create_server(args.host, args.port, args.ttl, args.access_log)
+    print("📊 予測結果を事前計算しています...", file=sys.stderr)
+    warm_up(server)
+    print(f"🚀 http://{args.host}:{args.port} で待ち受け中 (Ctrl+C で終了)", file=sys.stderr)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,4 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
 from datetime import datetime
 import sys
 import os
@@ -16,7 +13,8 @@ from loto6_predictor.ui.components import (
     display_advanced_prediction_card,
     display_best_prediction_highlight,
     display_stats_card, 
-    display_frequency_ranking
+    display_frequency_ranking,
+    display_randomness_tests
 )
 
 # ページ設定
@@ -41,6 +39,12 @@ def load_data():
     return predictor
 
 
+@st.cache_data(show_spinner=False)
+def load_randomness_tests(dataset_version: str, _predictor):
+    """乱数性検定（データセットバージョンごとにキャッシュ）"""
+    return _predictor.analyze_randomness()
+
+
 def main():
     # タイトル
     st.title("🎯 高度AI分析ロト6予測システム")
@@ -177,10 +181,21 @@ def main():
             consecutive_avg = pattern_analysis.get("consecutive_avg", 0)
             st.write(f"**連続番号**")
             st.write(f"平均連続ペア: {consecutive_avg:.2f}")
+        
+        # 乱数性検定
+        st.subheader("🎲 乱数性検定")
+        
+        with st.spinner("乱数性検定を実行中..."):
+            randomness = load_randomness_tests(predictor.get_dataset_version(), predictor)
+        display_randomness_tests(randomness)
     
     with tab3:
         st.header("📈 出現頻度グラフ")
         
+        # plotly は読み込みが重いためグラフ描画時にのみインポート
+        import plotly.express as px
+        import plotly.graph_objects as go
+        
         # 頻度データ取得
         numbers, frequencies = predictor.get_frequency_data_for_chart()
         
@@ -243,8 +258,7 @@ def main():
                     "合計値": sum(draw["numbers"])
                 })
             
-            df = pd.DataFrame(df_data)
-            st.dataframe(df, use_container_width=True)
+            st.dataframe(df_data, use_container_width=True)
         else:
             st.info("過去の抽選結果データがありません")
 
@@ -3,15 +3,11 @@
 ロト6予測クラス（モジュール化版）
 """
 
-import json
-import requests
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
 from collections import Counter
 import statistics
-from typing import List, Dict, Tuple
-import re
+from typing import List, Dict
+
+# requests / numpy は利用するメソッド内で読み込む（起動時間短縮）
 
 
 class Loto6Predictor:
@@ -23,6 +19,8 @@ class Loto6Predictor:
         """
         過去のロト6当選番号データをCSVから取得
         """
+        import requests
+
         try:
             # CSVデータを取得
             url = "https://loto6.thekyo.jp/data/loto6.csv"
@@ -201,6 +199,8 @@ class Loto6Predictor:
         """
         バランスを考慮した予測番号を生成
         """
+        import numpy as np
+
         prediction = []
         attempts = 0
         max_attempts = 1000
@@ -4,15 +4,22 @@
 過去の当選番号を分析して次回の当選番号を予測します
 """
 
+import argparse
 import json
-import requests
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
+import os
+import sys
+import time
+from datetime import datetime
 from collections import Counter
 import statistics
-from typing import List, Dict, Tuple
-import re
+from typing import List, Dict
+
+# srcディレクトリをパスに追加（バッチモードでパッケージを利用）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from loto6_predictor.constants import BATCH_METHODS, OUTPUT_FORMATS
+
+# numpy / requests と分析モジュールは利用する処理の中で読み込む（--help などの起動を高速化）
 
 
 class Loto6Predictor:
@@ -25,6 +32,7 @@ class Loto6Predictor:
         過去のロト6当選番号データをCSVから取得
         """
         print("過去の当選番号データを取得中...")
+        import requests
         
         try:
             # CSVデータを取得
@@ -216,6 +224,7 @@ class Loto6Predictor:
         """
         バランスを考慮した予測番号を生成
         """
+        import numpy as np
         prediction = []
         attempts = 0
         max_attempts = 1000
@@ -305,6 +314,8 @@ class Loto6Predictor:
         if filename is None:
             filename = f"loto6_prediction_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
+        import numpy as np
+
         # numpy型をPython標準型に変換
         def convert_numpy_types(obj):
             if isinstance(obj, np.integer):
@@ -332,10 +343,130 @@ class Loto6Predictor:
         print(f"結果を {filename} に保存しました")
 
 
-def main():
+# バッチモードのワーカー状態（プロセスごとに初期化）
+_batch_state = {}
+
+
+def _init_batch_worker(pool, scorer, method, fmt):
+    """ワーカープロセスの初期化"""
+    from loto6_predictor.data.ticket_writer import create_ticket_writer
+    _batch_state["pool"] = pool
+    _batch_state["scorer"] = scorer
+    _batch_state["method"] = method
+    _batch_state["encoder"] = create_ticket_writer(fmt)
+
+
+def _run_batch_chunk(task):
+    """1チャンク分のチケットを生成・採点してエンコード"""
+    import numpy as np
+    from loto6_predictor.prediction.batch_scorer import generate_tickets
+    count, seed = task
+    rng = np.random.default_rng(seed)
+    tickets = generate_tickets(_batch_state["pool"], count, rng)
+    scorer = _batch_state["scorer"]
+    balance = scorer.balance_scores(tickets)
+    confidence = scorer.confidence_scores(tickets, _batch_state["method"])
+    return _batch_state["encoder"].encode_chunk(tickets, balance, confidence), count
+
+
+def run_batch(args) -> int:
+    """大量チケットを生成・採点してファイルへストリーム出力"""
+    if args.tickets <= 0:
+        print("エラー: --tickets には1以上を指定してください", file=sys.stderr)
+        return 1
+    if not args.out:
+        print("エラー: バッチモードでは --out が必要です", file=sys.stderr)
+        return 1
+
+    import multiprocessing
+    import numpy as np
+    from loto6_predictor.analysis.advanced_analyzer import AdvancedAnalyzer
+    from loto6_predictor.prediction.batch_scorer import BatchScorer, candidate_pool
+    from loto6_predictor.data.ticket_writer import create_ticket_writer, format_from_filename
+
+    predictor = Loto6Predictor()
+    predictor.fetch_historical_data()
+    freq_analysis = predictor.analyze_frequency()
+
+    features = AdvancedAnalyzer(predictor.data).extract_advanced_features()
+    scorer = BatchScorer(predictor.data, features)
+    pool = candidate_pool(args.method, predictor.data, freq_analysis)
+
+    # チャンク分割とチャンクごとの独立した乱数シード
+    chunk_size = max(1, args.chunk_size)
+    counts = [chunk_size] * (args.tickets // chunk_size)
+    if args.tickets % chunk_size:
+        counts.append(args.tickets % chunk_size)
+    seeds = np.random.SeedSequence(args.seed).spawn(len(counts))
+    tasks = list(zip(counts, seeds))
+
+    fmt = args.format or format_from_filename(args.out)
+    workers = max(1, min(args.workers or 1, len(tasks)))
+    print(f"バッチ生成: {args.tickets:,}枚 / 手法: {args.method} / 形式: {fmt} / "
+          f"ワーカー: {workers}", file=sys.stderr)
+
+    start = time.perf_counter()
+    with open(args.out, "wb") as stream:
+        writer = create_ticket_writer(fmt, stream)
+        writer.write_header()
+
+        if workers == 1:
+            _init_batch_worker(pool, scorer, args.method, fmt)
+            results = map(_run_batch_chunk, tasks)
+            _consume_batch_results(results, writer, args.tickets, start)
+        else:
+            with multiprocessing.Pool(
+                workers, initializer=_init_batch_worker, initargs=(pool, scorer, args.method, fmt)
+            ) as process_pool:
+                # imapは投入順に結果を返すので出力順序は決定的
+                results = process_pool.imap(_run_batch_chunk, tasks)
+                _consume_batch_results(results, writer, args.tickets, start)
+
+    elapsed = time.perf_counter() - start
+    rate = writer.written / elapsed if elapsed > 0 else 0.0
+    print(f"\n完了: {writer.written:,}枚を {args.out} に保存しました "
+          f"({elapsed:.2f}秒, {rate:,.0f} tickets/s)", file=sys.stderr)
+    return 0
+
+
+def _consume_batch_results(results, writer, total: int, start: float):
+    """チャンク結果を書き出しながらスループットを表示"""
+    for payload, count in results:
+        writer.write_encoded(payload, count)
+        elapsed = time.perf_counter() - start
+        rate = writer.written / elapsed if elapsed > 0 else 0.0
+        print(f"\r  {writer.written:,}/{total:,}枚  {rate:,.0f} tickets/s",
+              end="", file=sys.stderr, flush=True)
+
+
+def parse_args(argv=None):
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="ロト6予測プログラム")
+    parser.add_argument("--tickets", type=int,
+                        help="バッチモード: 生成・採点するチケット数")
+    parser.add_argument("--method", choices=BATCH_METHODS, default="balanced",
+                        help="バッチモードの候補選択手法 (default: balanced)")
+    parser.add_argument("--out",
+                        help="バッチモードの出力ファイル (.csv / .ndjson / .bin)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS,
+                        help="出力形式 (省略時は拡張子から推定)")
+    parser.add_argument("--chunk-size", type=int, default=100_000,
+                        help="1チャンクあたりのチケット数 (default: 100000)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="ワーカープロセス数 (default: CPUコア数)")
+    parser.add_argument("--seed", type=int,
+                        help="乱数シード（指定すると出力が再現可能）")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """
     メイン実行関数
     """
+    args = parse_args(argv)
+    if args.tickets is not None:
+        return run_batch(args)
+
     predictor = Loto6Predictor()
     
     try:
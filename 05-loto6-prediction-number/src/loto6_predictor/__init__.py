@@ -2,7 +2,13 @@
 Loto6 Predictor Package
 """
 
-from .core.predictor import Loto6Predictor
-
 __version__ = "1.0.0"
-__all__ = ["Loto6Predictor"]
\ No newline at end of file
+__all__ = ["Loto6Predictor"]
+
+
+def __getattr__(name):
+    # サブモジュールだけを使う場合に予測スタック全体を読み込まないよう遅延インポート
+    if name == "Loto6Predictor":
+        from .core.predictor import Loto6Predictor
+        return Loto6Predictor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
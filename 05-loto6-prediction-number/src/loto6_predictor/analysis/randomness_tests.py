@@ -0,0 +1,319 @@
+"""
+乱数性検定モジュール
+全抽選履歴に対する検定バッテリー（p値は並べ替え・シャッフル検定で算出）
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Optional
+
+NUMBER_MAX = 43
+PICK = 6
+SUM_MIN = sum(range(1, PICK + 1))                          # 21
+SUM_MAX = sum(range(NUMBER_MAX - PICK + 1, NUMBER_MAX + 1))  # 243
+
+# 1タスクあたりのシャッフル数（メモリ使用量の上限を決める）
+SHUFFLE_BATCH = 50
+
+# データセットバージョンごとの結果キャッシュ
+_RESULT_CACHE: "OrderedDict[tuple, Dict]" = OrderedDict()
+_RESULT_CACHE_SIZE = 8
+
+
+def dataset_version(data: List[Dict]) -> str:
+    """抽選データの内容から決まるバージョン文字列"""
+    payload = json.dumps(
+        [[draw["draw_date"], list(draw["numbers"]), draw["bonus"]] for draw in data],
+        separators=(",", ":")
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _indicator_matrix(data: List[Dict]) -> np.ndarray:
+    """(抽選回数, 43) の出現フラグ行列"""
+    matrix = np.zeros((len(data), NUMBER_MAX), dtype=bool)
+    for i, draw in enumerate(data):
+        matrix[i, np.asarray(draw["numbers"]) - 1] = True
+    return matrix
+
+
+def _null_sum_cdf() -> np.ndarray:
+    """一様抽選における合計値の厳密な累積分布 (SUM_MIN..SUM_MAX)"""
+    # ways[k][s] = k個の異なる番号で合計sになる組み合わせ数
+    ways = np.zeros((PICK + 1, SUM_MAX + 1), dtype=np.float64)
+    ways[0][0] = 1
+    for num in range(1, NUMBER_MAX + 1):
+        for k in range(PICK, 0, -1):
+            ways[k][num:] += ways[k - 1][:-num]
+    pmf = ways[PICK][SUM_MIN:]
+    return np.cumsum(pmf) / pmf.sum()
+
+
+def _runs(matrix: np.ndarray) -> np.ndarray:
+    """番号ごとの連（ラン）の数。matrix は (..., 抽選回数, 43)"""
+    return (matrix[..., 1:, :] != matrix[..., :-1, :]).sum(axis=-2) + 1
+
+
+def _lag1_autocorrelation(matrix: np.ndarray, mean: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """番号ごとのラグ1自己相関"""
+    centered = matrix - mean
+    numerator = (centered[..., 1:, :] * centered[..., :-1, :]).sum(axis=-2)
+    return numerator / denominator
+
+
+def _sum_ks(sums: np.ndarray, null_cdf: np.ndarray) -> np.ndarray:
+    """合計値の経験分布と理論分布のKS統計量。sums は (..., 抽選回数)"""
+    batch_shape = sums.shape[:-1]
+    flat = sums.reshape(-1, sums.shape[-1]) - SUM_MIN
+    bins = len(null_cdf)
+    offsets = np.arange(len(flat))[:, None] * bins
+    counts = np.bincount((flat + offsets).ravel(), minlength=len(flat) * bins).reshape(len(flat), bins)
+    empirical_cdf = np.cumsum(counts, axis=1) / sums.shape[-1]
+    return np.abs(empirical_cdf - null_cdf).max(axis=1).reshape(batch_shape)
+
+
+def _pair_chi_square(cooccurrence: np.ndarray, expected: float) -> np.ndarray:
+    """共起行列の上三角に対するカイ二乗統計量"""
+    upper = np.triu_indices(NUMBER_MAX, k=1)
+    deviations = cooccurrence[..., upper[0], upper[1]] - expected
+    return (deviations ** 2).sum(axis=-1) / expected
+
+
+def _count_chi_square(counts: np.ndarray, n_draws: int) -> np.ndarray:
+    """番号ごとの2セル（出現/非出現）カイ二乗統計量"""
+    p = PICK / NUMBER_MAX
+    expected_hit = n_draws * p
+    expected_miss = n_draws * (1 - p)
+    return ((counts - expected_hit) ** 2 / expected_hit +
+            (counts - expected_hit) ** 2 / expected_miss)
+
+
+def _null_exceedances(matrix: np.ndarray, observed: Dict, n_shuffles: int, seed) -> Dict:
+    """帰無分布のシャッフルを生成し、観測値以上に極端だった回数を数える
+
+    時系列の検定（ラン・自己相関）は抽選順の並べ替え、
+    出現数・共起・合計値の検定は43個の球のシャッフル（一様抽選）を帰無仮説とする。
+    """
+    rng = np.random.default_rng(seed)
+    n_draws = matrix.shape[0]
+    null_cdf = _null_sum_cdf()
+    pair_expected = n_draws * PICK * (PICK - 1) / (NUMBER_MAX * (NUMBER_MAX - 1))
+    mean = matrix.mean(axis=0)
+    denominator = ((matrix - mean) ** 2).sum(axis=0)
+    safe_denominator = np.where(denominator > 0, denominator, 1.0)
+
+    exceed = {
+        "chi_overall": 0,
+        "chi_number": np.zeros(NUMBER_MAX, dtype=np.int64),
+        "runs": np.zeros(NUMBER_MAX, dtype=np.int64),
+        "autocorrelation": np.zeros(NUMBER_MAX, dtype=np.int64),
+        "pair_overall": 0,
+        "pair": np.zeros((NUMBER_MAX, NUMBER_MAX), dtype=np.int64),
+        "sum_ks": 0,
+    }
+
+    remaining = n_shuffles
+    while remaining > 0:
+        batch = min(SHUFFLE_BATCH, remaining)
+        remaining -= batch
+
+        # 1. 抽選順の並べ替え (batch, 抽選回数, 43)
+        order = np.argsort(rng.random((batch, n_draws)), axis=1)
+        permuted = matrix[order]
+        runs = _runs(permuted)
+        exceed["runs"] += (np.abs(runs - observed["runs_expected"]) >=
+                           observed["runs_deviation"]).sum(axis=0)
+        autocorrelation = _lag1_autocorrelation(permuted, mean, safe_denominator)
+        exceed["autocorrelation"] += (np.abs(autocorrelation - observed["autocorrelation_expected"]) >=
+                                      observed["autocorrelation_deviation"]).sum(axis=0)
+
+        # 2. 一様抽選のシミュレーション (batch, 抽選回数, 6)
+        keys = rng.random((batch, n_draws, NUMBER_MAX), dtype=np.float32)
+        picks = np.argpartition(keys, PICK - 1, axis=2)[:, :, :PICK]
+        simulated = np.zeros((batch, n_draws, NUMBER_MAX), dtype=np.float32)
+        np.put_along_axis(simulated, picks, 1.0, axis=2)
+
+        counts = simulated.sum(axis=1)
+        chi_number = _count_chi_square(counts, n_draws)
+        exceed["chi_number"] += (chi_number >= observed["chi_number"]).sum(axis=0)
+        exceed["chi_overall"] += int((chi_number.sum(axis=1) >= observed["chi_overall"]).sum())
+
+        cooccurrence = np.matmul(simulated.transpose(0, 2, 1), simulated)
+        exceed["pair_overall"] += int(
+            (_pair_chi_square(cooccurrence, pair_expected) >= observed["pair_overall"]).sum()
+        )
+        exceed["pair"] += (np.abs(cooccurrence - pair_expected) >= observed["pair_deviation"]).sum(axis=0)
+
+        sums = (picks.astype(np.int64) + 1).sum(axis=2)
+        exceed["sum_ks"] += int((_sum_ks(sums, null_cdf) >= observed["sum_ks"]).sum())
+
+    return exceed
+
+
+class RandomnessTestSuite:
+    """乱数性検定バッテリークラス
+
+    番号ごとのカイ二乗検定・ラン検定・ラグ1自己相関、共起行列のペア独立性検定、
+    合計値分布のKS検定を行う。p値はシャッフル数 n_shuffles のモンテカルロ推定。
+    """
+
+    def __init__(self, data: List[Dict], n_shuffles: int = 2000, seed: int = 0,
+                 workers: Optional[int] = None):
+        self.data = data
+        self.n_shuffles = n_shuffles
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+        self.version = dataset_version(data)
+
+    def run(self) -> Dict:
+        """全検定を実行（同一データセットの結果はキャッシュから返す）"""
+        key = (self.version, self.n_shuffles, self.seed)
+        if key in _RESULT_CACHE:
+            _RESULT_CACHE.move_to_end(key)
+            return _RESULT_CACHE[key]
+
+        results = self._run_tests()
+
+        _RESULT_CACHE[key] = results
+        while len(_RESULT_CACHE) > _RESULT_CACHE_SIZE:
+            _RESULT_CACHE.popitem(last=False)
+        return results
+
+    def _observed_statistics(self, matrix: np.ndarray) -> Dict:
+        """観測データの検定統計量"""
+        n_draws = matrix.shape[0]
+        mean = matrix.mean(axis=0)
+        denominator = ((matrix - mean) ** 2).sum(axis=0)
+        safe_denominator = np.where(denominator > 0, denominator, 1.0)
+
+        counts = matrix.sum(axis=0).astype(np.float64)
+        chi_number = _count_chi_square(counts, n_draws)
+
+        # 並べ替え帰無分布での期待値
+        hits = counts
+        runs_expected = 1 + 2 * hits * (n_draws - hits) / n_draws
+        runs = _runs(matrix)
+        autocorrelation_expected = -1.0 / (n_draws - 1)
+        autocorrelation = _lag1_autocorrelation(matrix, mean, safe_denominator)
+
+        as_float = matrix.astype(np.float64)
+        cooccurrence = as_float.T @ as_float
+        pair_expected = n_draws * PICK * (PICK - 1) / (NUMBER_MAX * (NUMBER_MAX - 1))
+
+        sums = np.array([sum(draw["numbers"]) for draw in self.data])
+
+        return {
+            "counts": counts,
+            "chi_number": chi_number,
+            "chi_overall": chi_number.sum(),
+            "runs": runs,
+            "runs_expected": runs_expected,
+            "runs_deviation": np.abs(runs - runs_expected),
+            "autocorrelation": autocorrelation,
+            "autocorrelation_expected": autocorrelation_expected,
+            "autocorrelation_deviation": np.abs(autocorrelation - autocorrelation_expected),
+            "cooccurrence": cooccurrence,
+            "pair_expected": pair_expected,
+            "pair_overall": _pair_chi_square(cooccurrence, pair_expected),
+            "pair_deviation": np.abs(cooccurrence - pair_expected),
+            "sum_ks": float(_sum_ks(sums[None, :], _null_sum_cdf())[0]),
+        }
+
+    def _collect_exceedances(self, matrix: np.ndarray, observed: Dict) -> Dict:
+        """シャッフルをタスクに分割し、プロセスプールで並列実行"""
+        task_count = max(1, min(self.workers * 2, -(-self.n_shuffles // SHUFFLE_BATCH)))
+        sizes = [self.n_shuffles // task_count] * task_count
+        for i in range(self.n_shuffles % task_count):
+            sizes[i] += 1
+        seeds = np.random.SeedSequence(self.seed).spawn(task_count)
+
+        if self.workers == 1 or task_count == 1:
+            parts = [_null_exceedances(matrix, observed, size, seed) for size, seed in zip(sizes, seeds)]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                parts = list(executor.map(
+                    _null_exceedances,
+                    [matrix] * task_count, [observed] * task_count, sizes, seeds
+                ))
+
+        total = parts[0]
+        for part in parts[1:]:
+            for name, value in part.items():
+                total[name] = total[name] + value
+        return total
+
+    def _run_tests(self) -> Dict:
+        """検定本体"""
+        matrix = _indicator_matrix(self.data)
+        n_draws = matrix.shape[0]
+        if n_draws < 2:
+            return {"dataset_version": self.version, "n_draws": n_draws, "n_shuffles": 0}
+
+        observed = self._observed_statistics(matrix)
+        exceed = self._collect_exceedances(matrix, observed)
+
+        # 観測値自身を含めた (1 + 超過数) / (1 + シャッフル数)
+        def p_value(count):
+            return float((1 + count) / (1 + self.n_shuffles))
+
+        expected_hits = n_draws * PICK / NUMBER_MAX
+        numbers = range(1, NUMBER_MAX + 1)
+
+        upper = np.triu_indices(NUMBER_MAX, k=1)
+        pair_order = np.argsort(-observed["pair_deviation"][upper])[:10]
+        top_pairs = []
+        for index in pair_order:
+            i, j = upper[0][index], upper[1][index]
+            top_pairs.append({
+                "pair": (int(i) + 1, int(j) + 1),
+                "observed": int(observed["cooccurrence"][i, j]),
+                "expected": observed["pair_expected"],
+                "p_value": p_value(exceed["pair"][i, j]),
+            })
+
+        return {
+            "dataset_version": self.version,
+            "n_draws": n_draws,
+            "n_shuffles": self.n_shuffles,
+            "chi_square": {
+                "statistic": float(observed["chi_overall"]),
+                "p_value": p_value(exceed["chi_overall"]),
+                "per_number": {
+                    num: {
+                        "observed": int(observed["counts"][num - 1]),
+                        "expected": expected_hits,
+                        "statistic": float(observed["chi_number"][num - 1]),
+                        "p_value": p_value(exceed["chi_number"][num - 1]),
+                    }
+                    for num in numbers
+                },
+            },
+            "runs": {
+                num: {
+                    "runs": int(observed["runs"][num - 1]),
+                    "expected": float(observed["runs_expected"][num - 1]),
+                    "p_value": p_value(exceed["runs"][num - 1]),
+                }
+                for num in numbers
+            },
+            "autocorrelation": {
+                num: {
+                    "lag1": float(observed["autocorrelation"][num - 1]),
+                    "p_value": p_value(exceed["autocorrelation"][num - 1]),
+                }
+                for num in numbers
+            },
+            "pair_independence": {
+                "statistic": float(observed["pair_overall"]),
+                "p_value": p_value(exceed["pair_overall"]),
+                "top_pairs": top_pairs,
+            },
+            "sum_ks": {
+                "statistic": observed["sum_ks"],
+                "p_value": p_value(exceed["sum_ks"]),
+            },
+        }
@@ -0,0 +1 @@
+# API module
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""
+レスポンスキャッシュモジュール
+ETag付きのメモリキャッシュと同一リクエストの集約（シングルフライト）
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+# 保持するレスポンスの上限（count などのパラメータごとに別エントリになるため）
+MAX_ENTRIES = 256
+
+
+class CachedResponse:
+    """エンコード済みレスポンス"""
+
+    __slots__ = ("body", "etag", "created_at")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self.created_at = time.monotonic()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match ヘッダーが ETag に一致するか（弱い比較）
+
+    カンマ区切りの複数タグ、W/ 付きの弱いタグ、* に対応する。
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == opaque:
+            return True
+    return False
+
+
+class _InFlight:
+    """計算中のリクエスト"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[CachedResponse] = None
+        self.error: Optional[BaseException] = None
+
+
+class ResponseCache:
+    """TTL付きレスポンスキャッシュ
+
+    同じキーへの同時リクエストは1回の計算にまとめられ、
+    後続のリクエストは最初の計算結果を待って共有する。
+    エントリ数は max_entries までで、超えると最も長く使われていないものから捨てる。
+    期限切れのエントリは参照時と追加時に破棄する。
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._in_flight: Dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+    def _is_fresh(self, entry: CachedResponse) -> bool:
+        return time.monotonic() - entry.created_at < self.ttl
+
+    def get_or_compute(self, key: str, compute: Callable[[], bytes]) -> CachedResponse:
+        """キャッシュ済みならそれを返し、なければ1回だけ計算する"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._is_fresh(entry):
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    return entry
+                del self._entries[key]
+
+            flight = self._in_flight.get(key)
+            if flight is None:
+                flight = _InFlight()
+                self._in_flight[key] = flight
+                leader = True
+                self.stats["misses"] += 1
+            else:
+                leader = False
+                self.stats["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = CachedResponse(compute())
+            with self._lock:
+                self._store(key, flight.result)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            flight.done.set()
+
+    def _store(self, key: str, entry: CachedResponse):
+        """エントリを追加し、期限切れと上限を超えた分を破棄する（ロック内で呼ぶ）"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        for stale in [k for k, e in self._entries.items() if not self._is_fresh(e)]:
+            del self._entries[stale]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def clear(self):
+        """全エントリを破棄"""
+        with self._lock:
+            self._entries.clear()
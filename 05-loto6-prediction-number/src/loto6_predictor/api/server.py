@@ -0,0 +1,237 @@
+"""
+予測HTTP APIサーバー
+Loto6Predictor の結果をJSONで提供する（標準ライブラリのみで動作）
+"""
+
+import json
+import threading
+import time
+import numpy as np
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+from .cache import ResponseCache, etag_matches
+from ..core.predictor import Loto6Predictor
+from ..analysis.advanced_analyzer import AdvancedAnalyzer
+from ..constants import BATCH_METHODS
+from ..prediction.batch_scorer import BatchScorer, candidate_pool, generate_tickets
+
+MAX_RECENT_DRAWS = 100
+MAX_TICKETS = 10000
+
+
+class PredictionService:
+    """APIが利用する予測処理（データは data_ttl 秒ごとに再取得）"""
+
+    def __init__(self, data_ttl: float = 300.0):
+        self.data_ttl = data_ttl
+        self.predictor = Loto6Predictor()
+        self._loaded_at = None
+        self._scorer = None
+        # Loto6Predictor は状態を持つため計算は直列化する
+        self._lock = threading.Lock()
+
+    def _ensure_data(self):
+        """データが古ければ再取得して分析し直す"""
+        now = time.monotonic()
+        if self._loaded_at is not None and now - self._loaded_at < self.data_ttl:
+            return
+        self.predictor.fetch_historical_data()
+        self.predictor.analysis_results = {}
+        self.predictor.analyze_frequency()
+        self.predictor.analyze_patterns()
+        features = AdvancedAnalyzer(self.predictor.data).extract_advanced_features()
+        self._scorer = BatchScorer(self.predictor.data, features)
+        self._loaded_at = now
+
+    def _meta(self) -> Dict:
+        return {
+            "dataset_version": self.predictor.get_dataset_version(),
+            "draw_count": len(self.predictor.data),
+        }
+
+    def predictions(self) -> Dict:
+        """全予測手法の結果（信頼度順）"""
+        with self._lock:
+            self._ensure_data()
+            return {**self._meta(), "predictions": self.predictor.predict_numbers()}
+
+    def frequency(self) -> Dict:
+        """出現頻度分析"""
+        with self._lock:
+            self._ensure_data()
+            return {**self._meta(), "frequency": self.predictor.analysis_results["frequency"]}
+
+    def recent_draws(self, count: int) -> Dict:
+        """直近の抽選結果"""
+        with self._lock:
+            self._ensure_data()
+            return {**self._meta(), "draws": self.predictor.get_recent_draws(count)}
+
+    def tickets(self, count: int, method: str) -> Dict:
+        """チケットを生成して信頼度順に返す"""
+        with self._lock:
+            self._ensure_data()
+            pool = candidate_pool(method, self.predictor.data, self.predictor.analysis_results["frequency"])
+            scorer = self._scorer
+            meta = self._meta()
+
+        tickets = generate_tickets(pool, count, np.random.default_rng())
+        balance = scorer.balance_scores(tickets)
+        confidence = scorer.confidence_scores(tickets, method)
+        order = np.argsort(-confidence, kind="stable")
+        return {
+            **meta,
+            "method": method,
+            "tickets": [
+                {"numbers": tickets[i].tolist(), "balance": int(balance[i]),
+                 "confidence": round(float(confidence[i]), 2)}
+                for i in order
+            ],
+        }
+
+
+def _json_default(obj):
+    """numpy型をJSONに変換"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"JSONに変換できない型です: {type(obj).__name__}")
+
+
+def encode_json(payload) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+def _int_param(params: Dict[str, List[str]], name: str, default: int, upper: int) -> int:
+    """整数クエリパラメータを検証して取得"""
+    raw = params.get(name, [str(default)])[-1]
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name} は整数で指定してください")
+    if not 1 <= value <= upper:
+        raise ValueError(f"{name} は1から{upper}の範囲で指定してください")
+    return value
+
+
+# ルートごとに (正規化したキャッシュキー, 計算関数) を返す
+Route = Callable[[PredictionService, Dict[str, List[str]]], Tuple[str, Callable[[], Dict]]]
+
+
+def _route_predictions(service, params):
+    return "/predictions", service.predictions
+
+
+def _route_frequency(service, params):
+    return "/analysis/frequency", service.frequency
+
+
+def _route_recent_draws(service, params):
+    count = _int_param(params, "count", 10, MAX_RECENT_DRAWS)
+    return f"/draws/recent?count={count}", lambda: service.recent_draws(count)
+
+
+def _route_tickets(service, params):
+    count = _int_param(params, "count", 10, MAX_TICKETS)
+    method = params.get("method", ["balanced"])[-1]
+    if method not in BATCH_METHODS:
+        raise ValueError(f"method は {', '.join(BATCH_METHODS)} のいずれかを指定してください")
+    return f"/tickets?count={count}&method={method}", lambda: service.tickets(count, method)
+
+
+ROUTES: Dict[str, Route] = {
+    "/predictions": _route_predictions,
+    "/analysis/frequency": _route_frequency,
+    "/draws/recent": _route_recent_draws,
+    "/tickets": _route_tickets,
+}
+
+
+class PredictionRequestHandler(BaseHTTPRequestHandler):
+    """APIリクエストハンドラー"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "Loto6PredictorAPI/1.0"
+    # ヘッダーと本文を別々に書き出すため、Nagle と遅延ACKによる約40msの待ちを防ぐ
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+
+        if url.path == "/health":
+            cache = self.server.cache
+            self._send_json(200, {"status": "healthy", "cache": {**cache.stats, "entries": len(cache)}})
+            return
+
+        route = ROUTES.get(url.path)
+        if route is None:
+            self._send_json(404, {"error": "not found", "endpoints": sorted(ROUTES)})
+            return
+
+        try:
+            key, compute = route(self.server.service, parse_qs(url.query))
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            entry = self.server.cache.get_or_compute(key, lambda: encode_json(compute()))
+        except Exception as e:
+            self._send_json(500, {"error": f"計算エラー: {e}"})
+            return
+
+        max_age = max(0, int(self.server.cache.ttl - (time.monotonic() - entry.created_at)))
+        headers = {"ETag": entry.etag, "Cache-Control": f"max-age={max_age}"}
+
+        if etag_matches(self.headers.get("If-None-Match"), entry.etag):
+            self._send(304, b"", headers)
+        else:
+            self._send(200, entry.body, headers)
+
+    def _send_json(self, status: int, payload: Dict):
+        self._send(status, encode_json(payload), {"Cache-Control": "no-store"})
+
+    def _send(self, status: int, body: bytes, headers: Dict[str, str]):
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.access_log:
+            super().log_message(format, *args)
+
+
+class PredictionHTTPServer(ThreadingHTTPServer):
+    """キャッシュと予測サービスを保持するHTTPサーバー"""
+
+    daemon_threads = True
+
+    def __init__(self, address, service: PredictionService, cache: ResponseCache,
+                 access_log: bool = False):
+        super().__init__(address, PredictionRequestHandler)
+        self.service = service
+        self.cache = cache
+        self.access_log = access_log
+
+
+def create_server(host: str = "127.0.0.1", port: int = 8600, ttl: float = 300.0,
+                  access_log: bool = False) -> PredictionHTTPServer:
+    """APIサーバーを作成（serve_forever で起動）"""
+    return PredictionHTTPServer(
+        (host, port), PredictionService(data_ttl=ttl), ResponseCache(ttl=ttl), access_log
+    )
+
+
+def warm_up(server: PredictionHTTPServer):
+    """主要エンドポイントを事前計算してキャッシュに載せる"""
+    for path in ["/predictions", "/analysis/frequency", "/draws/recent"]:
+        key, compute = ROUTES[path](server.service, {})
+        server.cache.get_or_compute(key, lambda: encode_json(compute()))
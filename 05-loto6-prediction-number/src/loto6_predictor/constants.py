@@ -0,0 +1,10 @@
+"""
+共通定数
+CLIの引数定義などから重い依存関係なしで参照できるよう分離
+"""
+
+# バッチ生成で利用できる手法
+BATCH_METHODS = ["high_frequency", "low_frequency", "balanced", "trending"]
+
+# チケットの出力形式
+OUTPUT_FORMATS = ["csv", "ndjson", "bin"]
@@ -3,11 +3,10 @@
 """
 
 from typing import List, Dict
-from ..data.fetcher import DataFetcher
 from ..analysis.frequency import FrequencyAnalyzer
 from ..analysis.pattern import PatternAnalyzer
-from ..prediction.strategies import PredictionStrategies
-from ..prediction.advanced_engine import AdvancedPredictionEngine
+
+# requests / numpy を使うモジュールは必要になったメソッド内で読み込む（起動時間短縮）
 
 
 class Loto6Predictor:
@@ -16,14 +15,37 @@ class Loto6Predictor:
     def __init__(self):
         self.data = []
         self.analysis_results = {}
-        self.data_fetcher = DataFetcher()
         self.advanced_engine = None
+        self._data_fetcher = None
+        self._async_fetcher = None
+
+    def __getstate__(self):
+        # キャッシュから復元する際に requests を読み込まないよう取得クラスは除外
+        state = self.__dict__.copy()
+        state["_data_fetcher"] = None
+        state["_async_fetcher"] = None
+        return state
+
+    @property
+    def data_fetcher(self):
+        """CSVパーサー兼サンプルデータ提供クラス"""
+        if self._data_fetcher is None:
+            from ..data.fetcher import DataFetcher
+            self._data_fetcher = DataFetcher()
+        return self._data_fetcher
+
+    @property
+    def async_fetcher(self):
+        """ミラー並列取得クラス"""
+        if self._async_fetcher is None:
+            from ..data.async_fetcher import AsyncDataFetcher
+            self._async_fetcher = AsyncDataFetcher()
+        return self._async_fetcher
     
     def fetch_historical_data(self) -> List[Dict]:
-        """過去のロト6当選番号データをCSVから取得"""
+        """過去のロト6当選番号データをCSVから取得（ミラー並列・締め切り付き）"""
         try:
-            csv_data = self.data_fetcher.fetch_csv_data()
-            self.data = self.data_fetcher.parse_csv_to_draw_data(csv_data)
+            self.data = self.async_fetcher.fetch_sync()
             return self.data
         except Exception:
             # フォールバック
@@ -44,8 +66,22 @@ class Loto6Predictor:
         self.analysis_results["patterns"] = analysis
         return analysis
     
+    def analyze_randomness(self, n_shuffles: int = 2000) -> Dict:
+        """乱数性検定バッテリー（データセットバージョンごとにキャッシュ）"""
+        from ..analysis.randomness_tests import RandomnessTestSuite
+        suite = RandomnessTestSuite(self.data, n_shuffles=n_shuffles)
+        analysis = suite.run()
+        self.analysis_results["randomness"] = analysis
+        return analysis
+    
+    def get_dataset_version(self) -> str:
+        """現在の抽選データのバージョン"""
+        from ..analysis.randomness_tests import dataset_version
+        return dataset_version(self.data)
+    
     def predict_numbers(self) -> Dict:
         """高度な予測番号を生成（信頼度順）"""
+        from ..prediction.advanced_engine import AdvancedPredictionEngine
         if not self.analysis_results:
             self.analyze_frequency()
             self.analyze_patterns()
@@ -0,0 +1,154 @@
+"""
+非同期データ取得モジュール
+複数のミラーを並列に取得し、最初に検証を通過したデータを採用する
+"""
+
+import asyncio
+import os
+import random
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Optional, Sequence
+from .fetcher import DataFetcher
+
+DEFAULT_URLS = ["https://loto6.thekyo.jp/data/loto6.csv"]
+
+# カンマ区切りでミラーURLを上書きできる環境変数
+URLS_ENV_VAR = "LOTO6_DATA_URLS"
+
+
+class FetchError(Exception):
+    """全ミラーからの取得に失敗した場合の例外"""
+
+
+def validate_draws(draws: List[Dict], min_draws: int = 10) -> List[Dict]:
+    """パース済みの抽選データを検証"""
+    if len(draws) < min_draws:
+        raise ValueError(f"抽選データが少なすぎます: {len(draws)}回分")
+
+    for draw in draws:
+        numbers = draw["numbers"]
+        if len(numbers) != 6 or len(set(numbers)) != 6:
+            raise ValueError(f"本数字が不正です: {draw['draw_date']} {numbers}")
+        if not all(1 <= num <= 43 for num in numbers):
+            raise ValueError(f"本数字が範囲外です: {draw['draw_date']} {numbers}")
+        if not 1 <= draw["bonus"] <= 43 or draw["bonus"] in numbers:
+            raise ValueError(f"ボーナス数字が不正です: {draw['draw_date']} {draw['bonus']}")
+
+    return draws
+
+
+class AsyncDataFetcher:
+    """複数ミラー並列取得クラス
+
+    各ミラーへのリクエストはコネクションプール付きの requests.Session を
+    専用スレッドプールで実行し、asyncio で競争させる。ミラーごとに
+    ジッター付き指数バックオフで再試行し、全体は deadline 秒で打ち切る。
+    """
+
+    def __init__(self, urls: Optional[Sequence[str]] = None, deadline: float = 8.0,
+                 attempt_timeout: float = 5.0, max_retries: int = 2,
+                 backoff_base: float = 0.25, backoff_max: float = 2.0,
+                 min_draws: int = 10, limit: int = 1000):
+        env_urls = [url.strip() for url in os.environ.get(URLS_ENV_VAR, "").split(",") if url.strip()]
+        self.urls = list(urls or env_urls or DEFAULT_URLS)
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.min_draws = min_draws
+        self.limit = limit
+        self.parser = DataFetcher()
+        self._session: Optional[requests.Session] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __getstate__(self):
+        # セッションとスレッドプールはpickleできないため除外（st.cache_data対策）
+        state = self.__dict__.copy()
+        state["_session"] = None
+        state["_executor"] = None
+        return state
+
+    def _ensure_pool(self):
+        """ミラーごとに接続を使い回すセッションとスレッドプールを初期化"""
+        if self._session is None:
+            pool_size = max(4, len(self.urls) * 2)
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=len(self.urls), pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+            self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="loto6-fetch")
+
+    def _get(self, url: str) -> str:
+        """1回分のHTTP GET（スレッドプール上で実行）"""
+        connect_timeout = min(3.0, self.attempt_timeout)
+        response = self._session.get(url, timeout=(connect_timeout, self.attempt_timeout))
+        response.raise_for_status()
+        response.encoding = 'utf-8'
+        return response.text
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """フルジッター付き指数バックオフ"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def _fetch_source(self, url: str) -> List[Dict]:
+        """1つのミラーから取得・パース・検証（再試行あり）"""
+        loop = asyncio.get_running_loop()
+        last_error: Optional[Exception] = None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt > 0:
+                await asyncio.sleep(self._backoff_delay(attempt - 1))
+            try:
+                csv_data = await loop.run_in_executor(self._executor, self._get, url)
+                draws = self.parser.parse_csv_to_draw_data(csv_data, limit=self.limit)
+                return validate_draws(draws, self.min_draws)
+            except (requests.RequestException, ValueError) as e:
+                last_error = e
+
+        raise FetchError(f"{url}: {last_error}")
+
+    async def _race(self) -> List[Dict]:
+        """全ミラーを同時に取得し、最初に成功した結果を返す"""
+        tasks = [asyncio.create_task(self._fetch_source(url)) for url in self.urls]
+        errors = []
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    return await next_done
+                except FetchError as e:
+                    errors.append(str(e))
+            raise FetchError("全てのミラーで取得に失敗しました: " + "; ".join(errors))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def fetch(self) -> List[Dict]:
+        """締め切り付きで抽選データを取得"""
+        self._ensure_pool()
+        try:
+            return await asyncio.wait_for(self._race(), timeout=self.deadline)
+        except asyncio.TimeoutError:
+            raise FetchError(f"データ取得が{self.deadline:.1f}秒以内に完了しませんでした")
+
+    def fetch_sync(self) -> List[Dict]:
+        """同期コードから呼び出すためのラッパー"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.fetch())
+
+        # 既にイベントループが動いているスレッドからは別スレッドで実行
+        with ThreadPoolExecutor(max_workers=1) as runner:
+            return runner.submit(asyncio.run, self.fetch()).result()
+
+    def close(self):
+        """セッションとスレッドプールを解放"""
+        if self._session is not None:
+            self._executor.shutdown(wait=False)
+            self._session.close()
+            self._session = None
+            self._executor = None
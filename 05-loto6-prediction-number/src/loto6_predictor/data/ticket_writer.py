@@ -0,0 +1,109 @@
+"""
+チケット出力モジュール
+バッチ生成したチケットをチャンク単位でファイルへ書き出す
+"""
+
+import io
+import json
+import numpy as np
+from typing import IO, Optional
+
+# バイナリ形式の1レコード (11バイト)
+# 読み込み: np.fromfile(path, dtype=TICKET_DTYPE)
+TICKET_DTYPE = np.dtype([
+    ("numbers", "u1", (6,)),
+    ("balance", "u1"),
+    ("confidence", "<f4"),
+])
+
+
+class TicketWriter:
+    """チケット書き出しの基底クラス
+
+    encode_chunk はワーカープロセス側でも呼べるよう状態を持たない。
+    ストリームは常にバイナリモードで開く。
+    """
+
+    def __init__(self, stream: IO[bytes]):
+        self.stream = stream
+        self.written = 0
+
+    def header(self) -> bytes:
+        """ファイル先頭に書くヘッダー（形式により不要）"""
+        return b""
+
+    def encode_chunk(self, tickets: np.ndarray, balance: np.ndarray, confidence: np.ndarray) -> bytes:
+        """1チャンク分のチケットをバイト列に変換"""
+        raise NotImplementedError
+
+    def write_header(self):
+        """ヘッダーを書き出す"""
+        self.stream.write(self.header())
+
+    def write_encoded(self, payload: bytes, count: int):
+        """エンコード済みチャンクを書き出す"""
+        self.stream.write(payload)
+        self.written += count
+
+    def write_chunk(self, tickets: np.ndarray, balance: np.ndarray, confidence: np.ndarray):
+        """1チャンク分のチケットを書き出す"""
+        self.write_encoded(self.encode_chunk(tickets, balance, confidence), len(tickets))
+
+
+class CsvTicketWriter(TicketWriter):
+    """CSV形式 (n1..n6, balance, confidence)"""
+
+    def header(self):
+        return b"n1,n2,n3,n4,n5,n6,balance,confidence\n"
+
+    def encode_chunk(self, tickets, balance, confidence):
+        buffer = io.BytesIO()
+        table = np.column_stack([tickets, balance, confidence])
+        np.savetxt(buffer, table, fmt=",".join(["%d"] * 7 + ["%.2f"]))
+        return buffer.getvalue()
+
+
+class NdjsonTicketWriter(TicketWriter):
+    """NDJSON形式（1行1チケット）"""
+
+    def encode_chunk(self, tickets, balance, confidence):
+        lines = [
+            json.dumps({"numbers": numbers, "balance": score, "confidence": round(conf, 2)})
+            for numbers, score, conf in zip(tickets.tolist(), balance.tolist(), confidence.tolist())
+        ]
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class BinaryTicketWriter(TicketWriter):
+    """固定長バイナリ形式（TICKET_DTYPE のレコード列）"""
+
+    def encode_chunk(self, tickets, balance, confidence):
+        records = np.empty(len(tickets), dtype=TICKET_DTYPE)
+        records["numbers"] = tickets
+        records["balance"] = balance
+        records["confidence"] = confidence
+        return records.tobytes()
+
+
+WRITERS = {
+    "csv": CsvTicketWriter,
+    "ndjson": NdjsonTicketWriter,
+    "bin": BinaryTicketWriter,
+}
+
+
+def create_ticket_writer(fmt: str, stream: Optional[IO[bytes]] = None) -> TicketWriter:
+    """出力形式に対応するライターを作成"""
+    if fmt not in WRITERS:
+        raise ValueError(f"未対応の出力形式です: {fmt}")
+    return WRITERS[fmt](stream)
+
+
+def format_from_filename(filename: str) -> str:
+    """拡張子から出力形式を推定"""
+    lowered = filename.lower()
+    if lowered.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if lowered.endswith(".bin"):
+        return "bin"
+    return "csv"
@@ -0,0 +1,184 @@
+"""
+バッチスコアリングモジュール
+大量のチケットをNumPy配列で一括生成・採点する
+"""
+
+import math
+import numpy as np
+from collections import Counter
+from typing import List, Dict, Optional
+from .confidence_scorer import ConfidenceScorer
+
+NUMBER_MAX = 43
+TICKET_SIZE = 6
+
+
+def candidate_pool(method: str, data: List[Dict], freq_analysis: Dict) -> np.ndarray:
+    """手法ごとの候補番号プールを作成（PredictionStrategiesと同じ選び方）"""
+    if method == "high_frequency":
+        candidates = [num for num, _ in freq_analysis["most_common"][:20]]
+    elif method == "low_frequency":
+        candidates = [num for num, _ in freq_analysis["least_common"][:20]]
+    elif method == "balanced":
+        candidates = list(range(1, NUMBER_MAX + 1))
+    elif method == "trending":
+        recent_numbers = [num for draw in data[-3:] for num in draw["numbers"]]
+        candidates = [num for num, _ in Counter(recent_numbers).most_common(20)]
+    else:
+        raise ValueError(f"未対応の手法です: {method}")
+
+    # 候補が少ない場合は全体から選択
+    if len(candidates) < TICKET_SIZE:
+        candidates = list(range(1, NUMBER_MAX + 1))
+
+    return np.array(sorted(candidates), dtype=np.uint8)
+
+
+def generate_tickets(pool: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """候補プールから重複なし6数字のチケットを一括生成
+
+    Returns:
+        (count, 6) の昇順ソート済み uint8 配列
+    """
+    # 行ごとの乱数キーの上位6つを選ぶ = 非復元抽出
+    keys = rng.random((count, len(pool)), dtype=np.float32)
+    picks = np.argpartition(keys, TICKET_SIZE - 1, axis=1)[:, :TICKET_SIZE]
+    tickets = pool[picks]
+    tickets.sort(axis=1)
+    return tickets
+
+
+class BatchScorer:
+    """チケット一括スコアリングクラス
+
+    AdvancedPredictionEngine._calculate_balance_score と
+    ConfidenceScorer.calculate_prediction_confidence を (N, 6) 配列向けに
+    ベクトル化したもの。結果はスカラー版と一致する。
+    """
+
+    def __init__(self, data: List[Dict], advanced_features: Optional[Dict] = None):
+        features = advanced_features or {}
+        scalar_scorer = ConfidenceScorer(data, features)
+        self.method_weights = scalar_scorer.method_weights
+        self._method_bonus = scalar_scorer._get_method_bonus
+
+        # 番号ごとの頻度スコア表（インデックス = 番号）
+        freq_counter = Counter(num for draw in data for num in draw["numbers"])
+        expected_freq = len(data) * TICKET_SIZE / NUMBER_MAX
+        self.freq_table = np.zeros(NUMBER_MAX + 1, dtype=np.float64)
+        for num in range(1, NUMBER_MAX + 1):
+            if expected_freq > 0:
+                freq_ratio = freq_counter.get(num, 0) / expected_freq
+                if 0.7 <= freq_ratio <= 1.3:
+                    score = 1.0 - abs(freq_ratio - 1.0) / 0.3
+                else:
+                    score = max(0, 1.0 - abs(freq_ratio - 1.0) / 2.0)
+            else:
+                score = 0.0
+            self.freq_table[num] = score
+
+        # 番号ごとのトレンドスコア表
+        self.trend_table = np.full(NUMBER_MAX + 1, 0.5, dtype=np.float64)
+        self.has_trend = "trend_changes" in features
+        for num, change_data in features.get("trend_changes", {}).items():
+            trend_score = 0.5 + (change_data["short_medium"] + change_data["medium_long"]) / 4.0
+            self.trend_table[num] = max(0, min(1, trend_score))
+
+        # 過去の合計値統計
+        past_sums = np.array([sum(draw["numbers"]) for draw in data], dtype=np.float64)
+        self.avg_sum = float(past_sums.mean()) if len(past_sums) else 132.0
+        self.std_sum = float(past_sums.std(ddof=1)) if len(past_sums) > 1 else 1.0
+
+        # チケットに依存しない統計スコア
+        self.static_stat_scores = []
+        if "deviation_from_uniform" in features:
+            ideal_deviation = 50
+            deviation = features["deviation_from_uniform"]
+            self.static_stat_scores.append(max(0, 1.0 - abs(deviation - ideal_deviation) / ideal_deviation))
+        if "entropy" in features:
+            self.static_stat_scores.append(features["entropy"] / math.log2(NUMBER_MAX))
+
+    def balance_scores(self, tickets: np.ndarray) -> np.ndarray:
+        """組み合わせのバランススコア (0-5)"""
+        t = tickets.astype(np.int16)
+        score = np.zeros(len(t), dtype=np.uint8)
+
+        # 1. 奇偶バランス
+        odd_count = (t % 2 == 1).sum(axis=1)
+        score += (odd_count >= 2) & (odd_count <= 4)
+
+        # 2. 合計値
+        total_sum = t.sum(axis=1)
+        score += (total_sum >= 120) & (total_sum <= 150)
+
+        # 3. 分散
+        variance = t.var(axis=1, ddof=1)
+        score += (variance >= 100) & (variance <= 200)
+
+        # 4. 連続番号
+        consecutive_count = (np.diff(t, axis=1) == 1).sum(axis=1)
+        score += consecutive_count <= 1
+
+        # 5. 区間分布 (1-10, 11-20, 21-30, 31-43)
+        zones = np.digitize(t, [11, 21, 31])
+        all_zones = np.ones(len(t), dtype=bool)
+        for zone in range(4):
+            all_zones &= (zones == zone).any(axis=1)
+        score += all_zones
+
+        return score
+
+    def frequency_confidence(self, tickets: np.ndarray) -> np.ndarray:
+        """頻度分析ベースの信頼度"""
+        return self.freq_table[tickets].mean(axis=1)
+
+    def pattern_confidence(self, tickets: np.ndarray) -> np.ndarray:
+        """パターンマッチング信頼度"""
+        t = tickets.astype(np.int16)
+
+        # 1. 奇偶バランス
+        odd_count = (t % 2 == 1).sum(axis=1)
+        odd_score = 1.0 - np.abs(odd_count - 3) / 3.0
+
+        # 2. 合計値の妥当性
+        sum_deviation = np.abs(t.sum(axis=1) - self.avg_sum) / self.std_sum
+        sum_score = np.maximum(0, 1.0 - sum_deviation / 1.5)
+
+        # 3. 数字間隔の妥当性
+        distances = np.diff(t, axis=1)
+        ideal_distance = 42 / 6
+        avg_distance = distances.mean(axis=1)
+        distance_score = np.maximum(0, 1.0 - np.abs(avg_distance - ideal_distance) / ideal_distance)
+
+        # 4. 連続番号の適切性
+        consecutive_count = (distances == 1).sum(axis=1)
+        consecutive_score = np.where(
+            consecutive_count <= 1, 1.0, np.maximum(0, 1.0 - (consecutive_count - 1) * 0.3)
+        )
+
+        return (odd_score + sum_score + distance_score + consecutive_score) / 4
+
+    def trend_confidence(self, tickets: np.ndarray) -> np.ndarray:
+        """トレンド分析信頼度"""
+        if not self.has_trend:
+            return np.full(len(tickets), 0.5)
+        return self.trend_table[tickets].mean(axis=1)
+
+    def statistical_confidence(self, tickets: np.ndarray) -> np.ndarray:
+        """統計的妥当性の信頼度"""
+        ideal_variance = 150
+        variance = tickets.astype(np.float64).var(axis=1, ddof=1)
+        variance_score = np.maximum(0, 1.0 - np.abs(variance - ideal_variance) / ideal_variance)
+        return (sum(self.static_stat_scores) + variance_score) / (len(self.static_stat_scores) + 1)
+
+    def confidence_scores(self, tickets: np.ndarray, method: str = "") -> np.ndarray:
+        """総合信頼度 (0-100)"""
+        weights = self.method_weights
+        confidence = (
+            self.frequency_confidence(tickets) * weights["frequency_analysis"] +
+            self.pattern_confidence(tickets) * weights["pattern_matching"] +
+            self.trend_confidence(tickets) * weights["trend_analysis"] +
+            self.statistical_confidence(tickets) * weights["statistical_validation"]
+        )
+        confidence += self._method_bonus(method)
+        return np.clip(confidence * 100, 0, 100)
@@ -158,4 +158,50 @@ def display_best_prediction_highlight(method_name: str, numbers: List[int], conf
             ">
                 {num:02d}
             </div>
-            """, unsafe_allow_html=True)
\ No newline at end of file
+            """, unsafe_allow_html=True)
+
+
+def display_randomness_tests(results: Dict):
+    """乱数性検定の結果を表示"""
+    if not results.get("n_shuffles"):
+        st.info("検定に必要なデータが不足しています")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        display_stats_card("カイ二乗検定", f"p = {results['chi_square']['p_value']:.3f}",
+                           f"全番号の出現数 (χ² = {results['chi_square']['statistic']:.1f})")
+    with col2:
+        display_stats_card("ペア独立性", f"p = {results['pair_independence']['p_value']:.3f}",
+                           "共起行列のカイ二乗検定")
+    with col3:
+        display_stats_card("合計値KS検定", f"p = {results['sum_ks']['p_value']:.3f}",
+                           f"D = {results['sum_ks']['statistic']:.4f}")
+    
+    st.caption(f"p値は {results['n_shuffles']:,} 回のシャッフルによる並べ替え検定で算出 "
+               f"(データバージョン: {results['dataset_version']})")
+    
+    # 番号別の検定結果
+    rows = []
+    for num, chi in results["chi_square"]["per_number"].items():
+        runs = results["runs"][num]
+        autocorrelation = results["autocorrelation"][num]
+        rows.append({
+            "番号": num,
+            "出現回数": chi["observed"],
+            "期待値": round(chi["expected"], 1),
+            "χ² p値": round(chi["p_value"], 3),
+            "ラン数": runs["runs"],
+            "ラン p値": round(runs["p_value"], 3),
+            "自己相関(ラグ1)": round(autocorrelation["lag1"], 3),
+            "自己相関 p値": round(autocorrelation["p_value"], 3),
+        })
+    
+    with st.expander("🔍 番号別の検定結果"):
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+    
+    with st.expander("🔗 期待値から最も離れたペア"):
+        for pair in results["pair_independence"]["top_pairs"]:
+            a, b = pair["pair"]
+            st.write(f"{a:2d} - {b:2d}: {pair['observed']}回 "
+                     f"(期待値 {pair['expected']:.1f}, p = {pair['p_value']:.3f})")
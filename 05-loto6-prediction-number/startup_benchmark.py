@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+起動時間ベンチマーク
+python -X importtime の出力を集計し、エントリーポイントごとのインポート時間を予算と比較します
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# (名前, python に渡す引数)
+TARGETS = [
+    ("main.py --help", ["main.py", "--help"]),
+    ("api_server.py --help", ["api_server.py", "--help"]),
+    ("import loto6_predictor", ["-c", "import sys; sys.path.insert(0, 'src'); import loto6_predictor"]),
+    # キャッシュ済み予測器の復元時と同じく、予測クラスの読み込みのみ
+    ("from loto6_predictor import Loto6Predictor",
+     ["-c", "import sys; sys.path.insert(0, 'src'); from loto6_predictor import Loto6Predictor"]),
+]
+
+# 起動時に読み込まれてはいけない重いモジュール
+HEAVY_MODULES = ["numpy", "pandas", "requests", "plotly", "streamlit"]
+
+
+def parse_importtime(stderr: str):
+    """-X importtime の出力から (モジュール名, 累積µs) を返す（インタプリタ起動分は除外）"""
+    top_level = []
+    loaded = set()
+    after_site = False
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        module = name.strip()
+        if not name.startswith("  "):
+            # site までの読み込みはスクリプトに関係なく発生する
+            if after_site:
+                top_level.append((module, int(cumulative)))
+            elif module == "site":
+                after_site = True
+                continue
+        if after_site:
+            loaded.add(module)
+    return top_level, loaded
+
+
+def run_once(args):
+    """1回実行して (経過秒, importtime出力) を返す"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    return time.perf_counter() - start, result.stderr
+
+
+def benchmark(name, args, repeat):
+    """ターゲットを繰り返し実行して中央値を集計"""
+    walls, imports = [], []
+    top_level, loaded = [], set()
+    for _ in range(repeat):
+        wall, stderr = run_once(args)
+        top_level, loaded = parse_importtime(stderr)
+        walls.append(wall)
+        imports.append(sum(cumulative for _, cumulative in top_level) / 1e6)
+    return {
+        "name": name,
+        "wall": statistics.median(walls),
+        "imports": statistics.median(imports),
+        "slowest": sorted(top_level, key=lambda item: item[1], reverse=True)[:5],
+        "heavy": [module for module in HEAVY_MODULES if module in loaded],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="起動時間ベンチマーク")
+    parser.add_argument("--budget-ms", type=float, default=100.0,
+                        help="スクリプトのインポート時間の上限(ms)")
+    parser.add_argument("--repeat", type=int, default=5, help="計測回数（中央値を採用）")
+    args = parser.parse_args()
+
+    baseline, _ = min((run_once(["-c", "pass"]) for _ in range(args.repeat)), key=lambda r: r[0])
+    print(f"インタプリタ起動: {baseline * 1000:.1f}ms (python -c pass)")
+
+    failed = False
+    for name, target_args in TARGETS:
+        result = benchmark(name, target_args, args.repeat)
+        over_budget = result["imports"] * 1000 > args.budget_ms
+        ok = not over_budget and not result["heavy"]
+        failed |= not ok
+
+        print(f"\n{'✅' if ok else '❌'} {name}")
+        print(f"  インポート: {result['imports'] * 1000:.1f}ms (予算 {args.budget_ms:.0f}ms) / "
+              f"実行時間: {result['wall'] * 1000:.1f}ms")
+        if result["heavy"]:
+            print(f"  重いモジュールを読み込んでいます: {', '.join(result['heavy'])}")
+        for module, cumulative in result["slowest"]:
+            print(f"    {cumulative / 1000:7.1f}ms  {module}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
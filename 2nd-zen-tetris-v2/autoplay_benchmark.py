@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+ZEN Tetris v2 - Autoplayer throughput benchmark.
+Plays headless games with the placement-search autoplayer and records
+pieces per second and games per minute in a history file.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from zen_tetris.ai import run_games
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(__file__), 'autoplay_history.jsonl')
+
+
+def git_revision():
+    """Get the current git commit, or None outside a checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_previous(path, config):
+    """Get the last recorded run with the same configuration."""
+    if not os.path.exists(path):
+        return None
+    previous = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("config") == config:
+                previous = entry
+    return previous
+
+
+def main():
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description="Autoplayer throughput benchmark")
+    parser.add_argument("--games", type=int, default=4, help="number of games (default: 4)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default: 1)")
+    parser.add_argument("--max-pieces", type=int, default=500, help="piece limit per game (default: 500)")
+    parser.add_argument("--seed", type=int, default=0, help="first game seed (default: 0)")
+    parser.add_argument("--no-lookahead", action="store_true", help="only search the current piece")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON lines file for results over time")
+    parser.add_argument("--no-history", action="store_true", help="do not record this run")
+    args = parser.parse_args()
+
+    config = {
+        "games": args.games,
+        "workers": args.workers,
+        "max_pieces": args.max_pieces,
+        "seed": args.seed,
+        "lookahead": not args.no_lookahead,
+    }
+
+    print(f"🤖 Autoplaying {args.games} games with {args.workers} worker(s)...")
+    start = time.perf_counter()
+    results = run_games(
+        range(args.seed, args.seed + args.games), max_pieces=args.max_pieces,
+        lookahead=not args.no_lookahead, workers=args.workers
+    )
+    wall = time.perf_counter() - start
+
+    pieces = sum(r.pieces for r in results)
+    lines = sum(r.lines for r in results)
+    summary = {
+        "pieces_per_second": round(pieces / wall, 1),
+        "games_per_minute": round(len(results) / wall * 60, 2),
+        "pieces": pieces,
+        "lines": lines,
+        "mean_score": round(sum(r.score for r in results) / len(results), 1),
+        "game_overs": sum(r.game_over for r in results),
+        "wall_seconds": round(wall, 3),
+    }
+
+    for r in results:
+        status = "game over" if r.game_over else "limit"
+        print(f"   seed {r.seed}: {r.pieces} pieces, {r.lines} lines, score {r.score} ({status})")
+    print(f"📊 {summary['pieces_per_second']} pieces/s, {summary['games_per_minute']} games/min "
+          f"({summary['wall_seconds']}s)")
+
+    if args.no_history:
+        return
+
+    previous = load_previous(args.history, config)
+    if previous:
+        before = previous["results"]["pieces_per_second"]
+        change = (summary["pieces_per_second"] - before) / before * 100 if before else 0.0
+        print(f"   previous run ({previous['revision'] or 'unknown'}): {before} pieces/s ({change:+.1f}%)")
+
+    entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "config": config,
+        "results": summary,
+    }
+    with open(args.history, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    print(f"📝 Recorded in {args.history}")
+
+
+if __name__ == "__main__":
+    main()
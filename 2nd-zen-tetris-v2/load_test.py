@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+ZEN Tetris v2 - WebSocket load test.
+Ramps up simulated players against a web server and reports, per step,
+state message rate, input-to-state latency, bandwidth, server CPU and
+whether the game loop kept its tick rate.
+
+Each simulated player sends moves, rotations and drops at a human pace
+and times how long the server takes to send a state showing the input's
+effect. The ramp stops at the first step where the loop falls behind or
+latency gets too high; the last healthy step is the server's capacity.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import websockets
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from zen_tetris.server.protocol import BINARY_HEADER
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(__file__), 'load_history.jsonl')
+
+# Inputs a simulated player sends, with relative weights
+ACTIONS = {"move": 6, "rotate": 3, "hard_drop": 1}
+
+# Seconds to wait for an input's effect before counting it as unanswered
+PROBE_TIMEOUT = 1.0
+
+# A step fails when games advance slower than this share of real time
+MIN_GAME_SPEED = 0.95
+
+
+def git_revision():
+    """Get the current git commit, or None outside a checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_previous(path, config):
+    """Get the last recorded run with the same configuration."""
+    if not os.path.exists(path):
+        return None
+    previous = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("config") == config:
+                previous = entry
+    return previous
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Get a nearest-rank percentile, or None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def moved_by_input(before, after) -> bool:
+    """Check whether a piece change can only come from a player input.
+
+    Gravity moves the piece one row down without changing anything else;
+    every other change (a move, a rotation, a new piece after a drop) is
+    the effect of the input being waited for.
+
+    Args:
+        before: (shape, rotation, x, y) when the input was sent, or None
+        after: (shape, rotation, x, y) in the latest state, or None
+    """
+    if after == before:
+        return False
+    if before is None or after is None:
+        return True
+    return after[:3] != before[:3] or after[3] < before[3]
+
+
+class SimulatedPlayer:
+    """One websocket client playing at a human pace."""
+
+    def __init__(self, url: str, wire_format: str, rate: float, rng: random.Random):
+        """Initialize the player.
+
+        Args:
+            url: Server base URL, e.g. "ws://127.0.0.1:8000"
+            wire_format: "delta" (protocol 2) or "binary"
+            rate: Average inputs per second
+            rng: Source of think times and input choices
+        """
+        query = "format=binary" if wire_format == "binary" else "v=2"
+        self.url = f"{url}/ws?{query}"
+        self.rate = rate
+        self.rng = rng
+        self.connected = False
+        self.failed: Optional[str] = None
+        self.piece = None
+        self.game_over = False
+        self._shapes: List[str] = []
+        self._probe = None
+        self._answered = asyncio.Event()
+        self.reset()
+
+    def reset(self):
+        """Start a new measurement window."""
+        self.messages = 0
+        self.bytes = 0
+        self.inputs = 0
+        self.unanswered = 0
+        self.latencies: List[float] = []
+
+    def on_message(self, message):
+        """Track the piece from a state message and finish a waiting probe."""
+        self.messages += 1
+        self.bytes += len(message)
+        if isinstance(message, bytes):
+            header = BINARY_HEADER.unpack_from(message)
+            self.game_over = bool(header[1] & 1)
+            shape = header[5]
+            self.piece = (self._shapes[shape - 1], *header[6:9]) if shape and not self.game_over else None
+        else:
+            data = json.loads(message)
+            if data.get("type") == "hello":
+                self._shapes = list(data["pieces"])
+                return
+            if "piece" in data:
+                self.piece = tuple(data["piece"]) if data["piece"] else None
+            if "game_over" in data:
+                self.game_over = data["game_over"]
+
+        probe = self._probe
+        if probe is not None and moved_by_input(probe[1], self.piece):
+            self.latencies.append(time.perf_counter() - probe[0])
+            self._probe = None
+            self._answered.set()
+
+    def choose_action(self) -> str:
+        """Pick the next input, steering moves away from the walls."""
+        action = self.rng.choices(list(ACTIONS), weights=list(ACTIONS.values()))[0]
+        if action != "move":
+            return action
+        x = self.piece[2]
+        if x <= 1:
+            return "move_right"
+        if x >= 6:
+            return "move_left"
+        return self.rng.choice(("move_left", "move_right"))
+
+    async def play(self, websocket, stop: asyncio.Event):
+        """Send inputs until stopped, waiting for each one's effect."""
+        while not stop.is_set():
+            await asyncio.sleep(self.rng.expovariate(self.rate))
+            if self.game_over:
+                await websocket.send(json.dumps({"type": "input", "action": "restart"}))
+                continue
+            if self.piece is None:
+                continue
+
+            self._answered.clear()
+            self._probe = (time.perf_counter(), self.piece)
+            self.inputs += 1
+            await websocket.send(json.dumps({"type": "input", "action": self.choose_action()}))
+            try:
+                await asyncio.wait_for(self._answered.wait(), PROBE_TIMEOUT)
+            except asyncio.TimeoutError:
+                # Blocked by the stack, or the server is too slow
+                self._probe = None
+                self.unanswered += 1
+
+    async def run(self, stop: asyncio.Event):
+        """Connect and play until stopped."""
+        try:
+            async with websockets.connect(self.url, max_size=None) as websocket:
+                self.connected = True
+                player = asyncio.create_task(self.play(websocket, stop))
+                try:
+                    async for message in websocket:
+                        self.on_message(message)
+                        if stop.is_set():
+                            break
+                finally:
+                    player.cancel()
+        except Exception as e:
+            self.failed = str(e) or type(e).__name__
+        finally:
+            self.connected = False
+
+
+def http_url(url: str, path: str) -> str:
+    """Get an HTTP URL on the server behind a websocket base URL."""
+    parts = urlsplit(url)
+    scheme = "https" if parts.scheme == "wss" else "http"
+    return f"{scheme}://{parts.netloc}{path}"
+
+
+def fetch_health(url: str) -> Dict:
+    """Get the server's /health report."""
+    with urllib.request.urlopen(http_url(url, "/health"), timeout=5) as response:
+        return json.load(response)
+
+
+def start_server(url: str) -> subprocess.Popen:
+    """Start a web server on the URL's port and wait until it answers."""
+    parts = urlsplit(url)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "web_server:app", "--host", parts.hostname,
+         "--port", str(parts.port or 8000), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            fetch_health(url)
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("server did not start")
+
+
+async def measure(url: str, players: List[SimulatedPlayer], seconds: float) -> Dict:
+    """Measure one step of the ramp.
+
+    Returns:
+        JSON-friendly results of the step
+    """
+    for player in players:
+        player.reset()
+    before = await asyncio.to_thread(fetch_health, url)
+    start = time.perf_counter()
+    await asyncio.sleep(seconds)
+    after = await asyncio.to_thread(fetch_health, url)
+    elapsed = time.perf_counter() - start
+
+    live = [player for player in players if player.connected]
+    latencies = [latency * 1000 for player in live for latency in player.latencies]
+    rates = [player.messages / elapsed for player in live]
+    inputs = sum(player.inputs for player in live)
+    unanswered = sum(player.unanswered for player in live)
+    loop_before, loop_after = before["scheduler"], after["scheduler"]
+
+    def rounded(value, digits=1):
+        return None if value is None else round(value, digits)
+
+    return {
+        "clients": len(players),
+        "connected": len(live),
+        "messages_per_client": rounded(sum(rates) / len(rates) if rates else 0.0),
+        "messages_per_client_p5": rounded(percentile(rates, 0.05)),
+        "latency_ms_p50": rounded(percentile(latencies, 0.50)),
+        "latency_ms_p95": rounded(percentile(latencies, 0.95)),
+        "latency_ms_p99": rounded(percentile(latencies, 0.99)),
+        "unanswered": round(unanswered / inputs, 3) if inputs else 0.0,
+        "kbytes_per_second": round(sum(player.bytes for player in live) / elapsed / 1024, 1),
+        "cpu_percent": round((after["cpu_seconds"] - before["cpu_seconds"]) / elapsed * 100, 1),
+        "target_hz": loop_after["target_hz"],
+        "tick_hz": round((loop_after["ticks"] - loop_before["ticks"]) / elapsed, 1),
+        "game_speed": round((loop_after["game_seconds"] - loop_before["game_seconds"]) / elapsed, 3),
+        "overruns": loop_after["overruns"] - loop_before["overruns"],
+        "dropped_ticks": loop_after["dropped_ticks"] - loop_before["dropped_ticks"],
+    }
+
+
+def step_problems(step: Dict, max_latency_ms: float) -> List[str]:
+    """Get the reasons a ramp step counts as overloaded."""
+    problems = []
+    if step["connected"] < step["clients"]:
+        problems.append(f"{step['clients'] - step['connected']} clients disconnected")
+    # The tick rate may drop under load; games falling behind real time may not
+    if step["game_speed"] < MIN_GAME_SPEED:
+        problems.append(f"games at {step['game_speed']}x speed ({step['tick_hz']} Hz loop)")
+    if step["latency_ms_p95"] is None or step["latency_ms_p95"] > max_latency_ms:
+        problems.append(f"p95 latency {step['latency_ms_p95']} ms")
+    return problems
+
+
+async def ramp(args) -> List[Dict]:
+    """Add players step by step and measure each step."""
+    rng = random.Random(args.seed)
+    stop = asyncio.Event()
+    players: List[SimulatedPlayer] = []
+    tasks = []
+    steps = []
+    try:
+        for clients in args.steps:
+            while len(players) < clients:
+                player = SimulatedPlayer(args.url, args.format, args.rate, random.Random(rng.random()))
+                players.append(player)
+                tasks.append(asyncio.create_task(player.run(stop)))
+                # Spread connections out instead of opening them in one burst
+                await asyncio.sleep(args.connect_interval)
+            await asyncio.sleep(args.settle)
+
+            step = await measure(args.url, players, args.step_seconds)
+            step["problems"] = step_problems(step, args.max_latency_ms)
+            steps.append(step)
+            print_step(step)
+
+            failed = [player.failed for player in players if player.failed]
+            if failed:
+                print(f"   ⚠️  {len(failed)} connection error(s), e.g. {failed[0]}")
+            if step["problems"]:
+                break
+    finally:
+        stop.set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return steps
+
+
+def print_header():
+    """Print the report table header."""
+    print(f"{'clients':>8} {'msg/s':>7} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} "
+          f"{'KB/s':>8} {'CPU %':>6} {'tick Hz':>8}  status")
+
+
+def print_step(step: Dict):
+    """Print one row of the report table."""
+    def show(value):
+        return "-" if value is None else value
+
+    status = "✅ ok" if not step["problems"] else "❌ " + ", ".join(step["problems"])
+    print(f"{step['clients']:>8} {step['messages_per_client']:>7} {show(step['latency_ms_p50']):>7} "
+          f"{show(step['latency_ms_p95']):>7} {show(step['latency_ms_p99']):>7} "
+          f"{step['kbytes_per_second']:>8} {step['cpu_percent']:>6} {step['tick_hz']:>8}  {status}")
+
+
+def summarize(steps: List[Dict]) -> Dict:
+    """Get the capacity found by the ramp."""
+    healthy = [step for step in steps if not step["problems"]]
+    if not healthy:
+        return {"capacity": 0, "clients_per_core": None, "latency_ms_p95": None}
+    best = healthy[-1]
+    cpu = best["cpu_percent"] / 100
+    return {
+        "capacity": best["clients"],
+        # Clients one fully used core would serve at this step's cost per client
+        "clients_per_core": round(best["clients"] / cpu) if cpu > 0 else None,
+        "latency_ms_p95": best["latency_ms_p95"],
+        "ramp_exhausted": len(healthy) == len(steps),
+    }
+
+
+def main():
+    """Run the ramp and print a report."""
+    parser = argparse.ArgumentParser(description="WebSocket load test for the web server")
+    parser.add_argument("--url", default="ws://127.0.0.1:8000", help="server to test (default: %(default)s)")
+    parser.add_argument("--spawn", action="store_true", help="start a server on the --url port for the test")
+    parser.add_argument("--steps", type=lambda text: [int(n) for n in text.split(",")],
+                        default=[10, 25, 50, 100, 200, 400], help="clients per ramp step, comma-separated")
+    parser.add_argument("--step-seconds", type=float, default=10.0, help="measurement time per step")
+    parser.add_argument("--settle", type=float, default=2.0, help="seconds between connecting and measuring")
+    parser.add_argument("--connect-interval", type=float, default=0.01, help="seconds between new connections")
+    parser.add_argument("--rate", type=float, default=4.0, help="inputs per second per client (default: 4)")
+    parser.add_argument("--format", choices=("delta", "binary"), default="delta", help="wire format")
+    parser.add_argument("--max-latency-ms", type=float, default=100.0, help="p95 latency limit per step")
+    parser.add_argument("--seed", type=int, default=0, help="seed for player behaviour")
+    parser.add_argument("--report", help="write the full report to this JSON file")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="JSON lines file for results over time")
+    parser.add_argument("--no-history", action="store_true", help="do not record this run")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        print(f"🚀 Starting web server for {args.url}")
+        server = start_server(args.url)
+
+    try:
+        health = fetch_health(args.url)
+    except OSError as e:
+        print(f"❌ Error: No server at {args.url} ({e}). Start one or pass --spawn.")
+        sys.exit(1)
+
+    print(f"📈 Load test against {args.url}: {args.format} format, {args.rate} inputs/s per client, "
+          f"{health['scheduler']['target_hz']} Hz loop")
+    print_header()
+    try:
+        steps = asyncio.run(ramp(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=10)
+
+    summary = summarize(steps)
+    if summary["capacity"]:
+        limit = "the largest step" if summary["ramp_exhausted"] else "overloaded after this"
+        print(f"📊 Capacity: {summary['capacity']} clients ({limit}), "
+              f"~{summary['clients_per_core']} clients per core, p95 {summary['latency_ms_p95']} ms")
+    else:
+        print("📊 Capacity: the first step is already overloaded")
+
+    config = {
+        "format": args.format,
+        "rate": args.rate,
+        "steps": args.steps,
+        "step_seconds": args.step_seconds,
+        "max_latency_ms": args.max_latency_ms,
+    }
+    entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "config": config,
+        "results": summary,
+        "steps": steps,
+    }
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(entry, f, indent=2)
+        print(f"📝 Report written to {args.report}")
+
+    if args.no_history:
+        return
+
+    previous = load_previous(args.history, config)
+    if previous:
+        before = previous["results"]["capacity"]
+        print(f"   previous run ({previous['revision'] or 'unknown'}): capacity {before} clients, "
+              f"~{previous['results']['clients_per_core']} per core")
+        if summary["capacity"] < before:
+            print("⚠️  Capacity dropped since the previous run")
+    with open(args.history, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    print(f"📝 Recorded in {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+ZEN Tetris v2 - Wire format benchmark.
+Replays the same autoplayed web game through each state encoder and
+compares encode time and message size.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from zen_tetris.ai import AutoPlayer
+from zen_tetris.constants import FPS
+from zen_tetris.server.protocol import BinaryStateEncoder, DeltaStateEncoder, JsonStateEncoder
+from zen_tetris.web_game import WebZenTetrisGame
+
+ENCODERS = {
+    "json (v1)": JsonStateEncoder,
+    "delta (v2)": DeltaStateEncoder,
+    "binary": BinaryStateEncoder,
+}
+
+
+def replay(encoder_class, seconds, seed, move_every):
+    """Play a game at the server tick rate and encode every frame.
+
+    Returns:
+        (messages, total bytes, encode seconds, largest message)
+    """
+    game = WebZenTetrisGame(seed=seed)
+    player = AutoPlayer(lookahead=False)
+    encoder = encoder_class()
+    greeting = encoder.greeting()
+
+    messages = 1 if greeting else 0
+    total = len(greeting) if greeting else 0
+    largest = 0
+    encode_time = 0.0
+    for frame in range(int(seconds * FPS)):
+        if frame % move_every == 0:
+            if game.game_over:
+                game.handle_input("restart")
+            player.play_piece(game, game.handle_input)
+        game.tick(1000 / FPS)
+
+        start = time.perf_counter()
+        message = encoder.encode(game)
+        encode_time += time.perf_counter() - start
+        if message is not None:
+            messages += 1
+            total += len(message)
+            largest = max(largest, len(message))
+    return messages, total, encode_time, largest
+
+
+def main():
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description="Wire format benchmark")
+    parser.add_argument("--seconds", type=float, default=60, help="game time to replay (default: 60)")
+    parser.add_argument("--seed", type=int, default=4, help="game seed (default: 4)")
+    parser.add_argument("--move-every", type=int, default=20,
+                        help="ticks between autoplayer placements (default: 20)")
+    args = parser.parse_args()
+
+    frames = int(args.seconds * FPS)
+    print(f"📡 Encoding {frames} frames ({args.seconds:g}s at {FPS} Hz) per format")
+    print(f"{'format':<12} {'msgs/s':>8} {'KiB/s':>10} {'bytes/msg':>10} {'max bytes':>10} {'us/frame':>9}")
+
+    baseline = None
+    for name, encoder_class in ENCODERS.items():
+        messages, total, encode_time, largest = replay(encoder_class, args.seconds, args.seed, args.move_every)
+        per_frame = encode_time / frames * 1e6
+        line = (f"{name:<12} {messages / args.seconds:>8.1f} {total / args.seconds / 1024:>10.2f} "
+                f"{total / max(messages, 1):>10.0f} {largest:>10} {per_frame:>9.1f}")
+        if baseline is None:
+            baseline = (total, per_frame)
+        else:
+            line += f"   size x{baseline[0] / max(total, 1):.0f} smaller, encode x{baseline[1] / per_frame:.1f} faster"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+ZEN Tetris v2 - Recorded game replay benchmark.
+Re-simulates input recordings headlessly, checks that every replay ends
+with the recorded score, and reports how much faster than real time the
+game rules run.
+
+Recordings come from the web server (set ZEN_TETRIS_RECORDINGS or pass
+--recordings to start_cluster.py), or are generated here by the
+autoplayer with --generate.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from zen_tetris.ai import AutoPlayer
+from zen_tetris.constants import FPS
+from zen_tetris.server import InputLog, RecordingError, load_recording, replay_recording, verify_recording
+from zen_tetris.server.recording import save_recording
+from zen_tetris.web_game import WebZenTetrisGame
+
+DEFAULT_RECORDINGS = os.path.join(os.path.dirname(__file__), 'recordings')
+
+
+def generate(directory, games, seconds, seed, move_every):
+    """Autoplay seeded games at the server tick rate and record them."""
+    tick_ms = 1000 / FPS
+    for game_seed in range(seed, seed + games):
+        game = WebZenTetrisGame(seed=game_seed)
+        game.input_log = InputLog(seed=game_seed, tick_ms=tick_ms)
+        player = AutoPlayer(lookahead=False)
+        for frame in range(int(seconds * FPS)):
+            if frame % move_every == 0:
+                if game.game_over:
+                    game.handle_input("restart")
+                player.play_piece(game, game.handle_input)
+            game.tick(tick_ms)
+        path = os.path.join(directory, f"autoplay-{game_seed}.json")
+        save_recording(path, game.input_log.to_dict(game))
+        print(f"   seed {game_seed}: {game.pieces_placed} pieces, score {game.score} -> {path}")
+
+
+def main():
+    """Replay the recordings and print a summary."""
+    parser = argparse.ArgumentParser(description="Replay recorded games and verify their scores")
+    parser.add_argument("--recordings", default=DEFAULT_RECORDINGS, help="directory of recordings")
+    parser.add_argument("--generate", type=int, default=0, metavar="GAMES",
+                        help="first record this many autoplayed games into the directory")
+    parser.add_argument("--seconds", type=float, default=300.0, help="game time per generated game")
+    parser.add_argument("--seed", type=int, default=0, help="first generated game seed (default: 0)")
+    parser.add_argument("--move-every", type=int, default=30, help="frames between generated moves")
+    parser.add_argument("--repeat", type=int, default=1, help="replay the corpus this many times")
+    args = parser.parse_args()
+
+    if args.generate:
+        print(f"🤖 Recording {args.generate} autoplayed games of {args.seconds:.0f}s...")
+        generate(args.recordings, args.generate, args.seconds, args.seed, args.move_every)
+
+    paths = sorted(glob.glob(os.path.join(args.recordings, "*.json")))
+    recordings = []
+    for path in paths:
+        try:
+            recordings.append((path, load_recording(path)))
+        except RecordingError as e:
+            print(f"⚠️  Skipping {e}")
+    if not recordings:
+        print(f"❌ Error: No recordings in {args.recordings}. Record some or pass --generate.")
+        sys.exit(1)
+
+    print(f"🎬 Verifying {len(recordings)} recordings...")
+    failures = 0
+    for path, recording in recordings:
+        differences = verify_recording(recording)
+        if differences:
+            failures += 1
+            print(f"   ❌ {os.path.basename(path)}: {'; '.join(differences)}")
+
+    frames = sum(recording["frames"] for _, recording in recordings) * args.repeat
+    game_seconds = sum(recording["frames"] * recording["tick_ms"] for _, recording in recordings) / 1000
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for _, recording in recordings:
+            replay_recording(recording)
+    wall = time.perf_counter() - start
+
+    print(f"📊 {frames / wall:,.0f} ticks/s, {game_seconds * args.repeat / wall:,.0f}x real time "
+          f"({game_seconds / 3600:.2f} game hours, {wall:.2f}s per {args.repeat} pass(es))")
+    if failures:
+        print(f"❌ {failures} of {len(recordings)} replays did not match their recording")
+        sys.exit(1)
+    print(f"✅ All {len(recordings)} replays match their recorded results")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""
+Autoplayer for ZEN Tetris v2.
+"""
+
+from .autoplayer import (
+    DEFAULT_WEIGHTS, AutoPlayer, GameResult, Placement, Weights,
+    best_placement, enumerate_placements, evaluate_boards, run_game, run_games
+)
+
+__all__ = [
+    "DEFAULT_WEIGHTS", "AutoPlayer", "GameResult", "Placement", "Weights",
+    "best_placement", "enumerate_placements", "evaluate_boards", "run_game", "run_games",
+]
@@ -0,0 +1,343 @@
+"""
+Placement-search autoplayer for ZEN Tetris v2.
+"""
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..constants import BOARD_WIDTH, BOARD_HEIGHT
+from ..core.board import FULL_ROW
+from ..core.engine import TetrisEngine
+from ..core.pieces import ROTATION_COUNT, ROTATIONS, RotationState
+
+Rows = Tuple[int, ...]
+
+
+class Weights(NamedTuple):
+    """Linear evaluation weights for a board after a placement."""
+
+    height: float     # Sum of column heights
+    lines: float      # Lines cleared by the placement
+    holes: float      # Empty cells below a filled cell
+    bumpiness: float  # Sum of height differences between neighbouring columns
+
+
+# Weights tuned for the classic 10x20 board (El-Tetris style)
+DEFAULT_WEIGHTS = Weights(height=-0.510066, lines=0.760666, holes=-0.35663, bumpiness=-0.184483)
+
+
+class Placement(NamedTuple):
+    """A final resting position for a piece and the board it leaves."""
+
+    rotation: int
+    x: int
+    y: int
+    lines: int   # Lines cleared by this placement
+    rows: Rows   # Board row masks after placing and clearing
+
+
+class GameResult(NamedTuple):
+    """Summary of one autoplayed game."""
+
+    seed: int
+    score: int
+    lines: int
+    pieces: int
+    elapsed: float  # Seconds
+    game_over: bool
+
+
+def _distinct_rotations(shape_type: str) -> Tuple[int, ...]:
+    """Get rotation indices with different shapes (O has one, I/S/Z have two)."""
+    seen = set()
+    rotations = []
+    for index, state in enumerate(ROTATIONS[shape_type]):
+        if state.row_masks not in seen:
+            seen.add(state.row_masks)
+            rotations.append(index)
+    return tuple(rotations)
+
+
+DISTINCT_ROTATIONS: Dict[str, Tuple[int, ...]] = {
+    shape_type: _distinct_rotations(shape_type) for shape_type in ROTATIONS
+}
+
+# Bit value of each column, for unpacking row masks into cells
+_COLUMN_BITS = 1 << np.arange(BOARD_WIDTH, dtype=np.int32)
+
+
+def board_rows(board) -> Rows:
+    """Get the row masks of a Board or BitBoard.
+
+    Args:
+        board: Any board with ``rows`` masks or a ``grid`` of colors
+
+    Returns:
+        One int per row, bit x set when column x is filled
+    """
+    rows = getattr(board, 'rows', None)
+    if rows is not None:
+        return tuple(rows)
+    return tuple(
+        sum(1 << x for x, cell in enumerate(row) if cell is not None)
+        for row in board.grid
+    )
+
+
+# Lowest cell of each piece column, indexed by shape type then rotation
+BOTTOM_PROFILES: Dict[str, Tuple[Tuple[Tuple[int, int], ...], ...]] = {
+    shape_type: tuple(tuple(enumerate(state.bottoms)) for state in states)
+    for shape_type, states in ROTATIONS.items()
+}
+
+
+def column_tops(rows: Rows) -> List[int]:
+    """Get the index of the highest filled row in each column.
+
+    Args:
+        rows: Board row masks
+
+    Returns:
+        Row index per column, BOARD_HEIGHT for empty columns
+    """
+    tops = [BOARD_HEIGHT] * BOARD_WIDTH
+    open_columns = FULL_ROW
+    for y, row in enumerate(rows):
+        new = row & open_columns
+        while new:
+            bit = new & -new
+            tops[bit.bit_length() - 1] = y
+            new ^= bit
+        open_columns &= ~row
+        if not open_columns:
+            break
+    return tops
+
+
+def lock_rows(rows: Rows, state: RotationState, x: int, y: int) -> Tuple[Rows, int]:
+    """Place a piece on row masks and clear completed lines.
+
+    Returns:
+        (new row masks, number of lines cleared)
+    """
+    new_rows = list(rows)
+    for dy, mask in enumerate(state.column_masks[x]):
+        new_rows[y + dy] |= mask
+    kept = [row for row in new_rows if row != FULL_ROW]
+    lines = BOARD_HEIGHT - len(kept)
+    if lines:
+        return (0,) * lines + tuple(kept), lines
+    return tuple(new_rows), 0
+
+
+def enumerate_placements(rows: Rows, shape_type: str) -> List[Placement]:
+    """Get every (rotation, column) placement of a piece dropped from the top.
+
+    A straight drop stops at the first filled cell of any column the piece
+    covers, so landing rows come from the column tops without stepping the
+    piece down.
+
+    Args:
+        rows: Board row masks
+        shape_type: Piece to place
+
+    Returns:
+        One Placement per rotation and column that fits below the spawn row
+    """
+    tops = column_tops(rows)
+    placements = []
+    for rotation in DISTINCT_ROTATIONS[shape_type]:
+        state = ROTATIONS[shape_type][rotation]
+        profile = BOTTOM_PROFILES[shape_type][rotation]
+        for x in range(len(state.column_masks)):
+            y = min(tops[x + dx] - dy for dx, dy in profile) - 1
+            if y < 0:
+                continue
+            new_rows, lines = lock_rows(rows, state, x, y)
+            placements.append(Placement(rotation, x, y, lines, new_rows))
+    return placements
+
+
+def evaluate_boards(boards: Sequence[Rows], lines: Sequence[int],
+                    weights: Weights = DEFAULT_WEIGHTS) -> np.ndarray:
+    """Score a batch of boards in one vectorised pass.
+
+    Args:
+        boards: Row masks of each board
+        lines: Lines cleared to reach each board
+        weights: Evaluation weights
+
+    Returns:
+        Array of scores, higher is better
+    """
+    rows = np.array(boards, dtype=np.int32).reshape(len(boards), BOARD_HEIGHT)
+    cells = (rows[:, :, None] & _COLUMN_BITS) != 0
+    # True from the top filled cell of each column downwards
+    covered = np.logical_or.accumulate(cells, axis=1)
+
+    heights = covered.sum(axis=1)
+    holes = (covered & ~cells).sum(axis=(1, 2))
+    bumpiness = np.abs(np.diff(heights, axis=1)).sum(axis=1)
+
+    return (weights.height * heights.sum(axis=1)
+            + weights.lines * np.asarray(lines)
+            + weights.holes * holes
+            + weights.bumpiness * bumpiness)
+
+
+def best_placement(rows: Rows, shape_type: str, next_shape: Optional[str] = None,
+                   weights: Weights = DEFAULT_WEIGHTS) -> Optional[Placement]:
+    """Choose the best placement for a piece.
+
+    With ``next_shape`` every placement of the current piece is followed by
+    every placement of the next piece, and all resulting boards are scored
+    in a single batch.
+
+    Args:
+        rows: Board row masks
+        shape_type: Current piece
+        next_shape: Next piece for a two-piece search, or None
+        weights: Evaluation weights
+
+    Returns:
+        Best placement of the current piece, or None if nothing fits
+    """
+    placements = enumerate_placements(rows, shape_type)
+    if not placements:
+        return None
+
+    if next_shape is None:
+        scores = evaluate_boards([p.rows for p in placements], [p.lines for p in placements], weights)
+        return placements[int(np.argmax(scores))]
+
+    boards = []
+    lines = []
+    owners = []
+    for index, placement in enumerate(placements):
+        for follow in enumerate_placements(placement.rows, next_shape):
+            boards.append(follow.rows)
+            lines.append(placement.lines + follow.lines)
+            owners.append(index)
+
+    if not boards:
+        # Every placement ends the game; any one will do
+        return placements[0]
+
+    scores = evaluate_boards(boards, lines, weights)
+    best = np.full(len(placements), -np.inf)
+    np.maximum.at(best, np.asarray(owners), scores)
+    return placements[int(np.argmax(best))]
+
+
+class AutoPlayer:
+    """Plays Tetris by searching all placements of the current and next pieces.
+
+    The player only sends ordinary actions (rotate, move, hard drop), so it
+    can drive the headless engine or any game built on it.
+    """
+
+    def __init__(self, weights: Weights = DEFAULT_WEIGHTS, lookahead: bool = True):
+        """Initialize the player.
+
+        Args:
+            weights: Evaluation weights
+            lookahead: Also search placements of the next piece
+        """
+        self.weights = weights
+        self.lookahead = lookahead
+
+    def choose(self, engine: TetrisEngine) -> Optional[Placement]:
+        """Choose a placement for the engine's current piece."""
+        current = engine.current_tetromino
+        next_shape = engine.next_tetromino.shape_type if self.lookahead and engine.next_tetromino else None
+        return best_placement(board_rows(engine.board), current.shape_type, next_shape, self.weights)
+
+    def actions_for(self, engine: TetrisEngine, placement: Optional[Placement]) -> List[str]:
+        """Get the actions that move the current piece to a placement.
+
+        Args:
+            engine: Game to play
+            placement: Target placement, or None to just drop the piece
+
+        Returns:
+            Action names ending with a hard drop
+        """
+        actions = []
+        if placement is not None:
+            current = engine.current_tetromino
+            actions.extend(["rotate"] * ((placement.rotation - current.rotation) % ROTATION_COUNT))
+            dx = placement.x - current.x
+            actions.extend(["move_right" if dx > 0 else "move_left"] * abs(dx))
+        actions.append("hard_drop")
+        return actions
+
+    def play_piece(self, engine: TetrisEngine,
+                   send: Optional[Callable[[str], object]] = None) -> Optional[Placement]:
+        """Choose a placement for the current piece and play it.
+
+        Args:
+            engine: Game to play
+            send: Callable receiving each action, e.g. ``game.handle_input``
+                (defaults to ``engine.step``)
+
+        Returns:
+            The chosen placement, or None if no placement fits
+        """
+        placement = self.choose(engine)
+        send = send or engine.step
+        for action in self.actions_for(engine, placement):
+            send(action)
+        return placement
+
+
+def run_game(seed: int, max_pieces: int = 500, weights: Weights = DEFAULT_WEIGHTS,
+             lookahead: bool = True) -> GameResult:
+    """Autoplay one headless game.
+
+    Args:
+        seed: Piece sequence seed
+        max_pieces: Stop after this many pieces even if the game continues
+        weights: Evaluation weights
+        lookahead: Also search placements of the next piece
+
+    Returns:
+        Result of the game
+    """
+    engine = TetrisEngine(seed=seed)
+    player = AutoPlayer(weights, lookahead)
+    start = time.perf_counter()
+    while not engine.game_over and engine.pieces_placed < max_pieces:
+        player.play_piece(engine)
+    return GameResult(
+        seed=seed,
+        score=engine.score,
+        lines=engine.lines_cleared,
+        pieces=engine.pieces_placed,
+        elapsed=time.perf_counter() - start,
+        game_over=engine.game_over,
+    )
+
+
+def run_games(seeds: Iterable[int], max_pieces: int = 500, weights: Weights = DEFAULT_WEIGHTS,
+              lookahead: bool = True, workers: int = 1) -> List[GameResult]:
+    """Autoplay several games, optionally over a process pool.
+
+    Args:
+        seeds: One seed per game
+        max_pieces: Piece limit per game
+        weights: Evaluation weights
+        lookahead: Also search placements of the next piece
+        workers: Number of processes (1 runs in this process)
+
+    Returns:
+        Results in seed order
+    """
+    play = partial(run_game, max_pieces=max_pieces, weights=weights, lookahead=lookahead)
+    if workers <= 1:
+        return [play(seed) for seed in seeds]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(play, seeds))
@@ -0,0 +1,14 @@
+"""
+Bitboard implementation of the game board for ZEN Tetris v2.
+"""
+
+from ..core.board import FULL_ROW, BitBoard as CoreBitBoard
+from .board import Board
+
+
+class BitBoard(CoreBitBoard, Board):
+    """Bitboard with the same drawing as Board.
+
+    Game rules come from the core bitboard; ``draw`` reads the ``grid``
+    view like the list-based board does.
+    """
@@ -0,0 +1,305 @@
+"""
+Layered renderer for ZEN Tetris v2 that only redraws what changed.
+"""
+
+import pygame
+from typing import Dict, List, Optional, Tuple
+
+from ..constants import (
+    BLOCK_SIZE, BOARD_HEIGHT, BOARD_OFFSET_X, BOARD_OFFSET_Y, BOARD_WIDTH,
+    COLORS, WINDOW_HEIGHT, WINDOW_WIDTH
+)
+from ..utils.colors import apply_earth_tone_gradient
+from .board import Board
+from .text import TextCache
+
+# Score panel right of the board, with the next piece preview below it
+PANEL_X = BOARD_OFFSET_X + BOARD_WIDTH * BLOCK_SIZE + 40
+PANEL_Y = BOARD_OFFSET_Y
+PANEL_RECT = pygame.Rect(PANEL_X, PANEL_Y, WINDOW_WIDTH - PANEL_X, 120)
+PREVIEW_RECT = pygame.Rect(PANEL_X, PANEL_Y + 120, 120, 80)
+
+# Board area including the grid line on its right and bottom edges
+BOARD_RECT = pygame.Rect(BOARD_OFFSET_X, BOARD_OFFSET_Y,
+                         BOARD_WIDTH * BLOCK_SIZE + 1, BOARD_HEIGHT * BLOCK_SIZE + 1)
+
+CONTROLS = (
+    "Controls:",
+    "Left/Right: Move",
+    "Down: Soft Drop",
+    "Up: Rotate",
+    "Space: Hard Drop",
+    "P: Pause",
+    "R: Restart",
+)
+
+# Particle rects beyond this are merged into their bounding box
+MAX_PARTICLE_RECTS = 64
+
+
+def board_key(board: Board) -> tuple:
+    """Get a value that changes whenever the settled blocks change."""
+    colors = getattr(board, 'colors', None)
+    if colors is not None:
+        return id(board), bytes(colors), len(board.palette)
+    return id(board), tuple(tuple(row) for row in board.grid)
+
+
+class GameRenderer:
+    """Composites the game from cached layers and reports dirty rects.
+
+    Layers, bottom to top:
+
+    * static: gradient, title, board frame, preview box and controls,
+      drawn once.
+    * base: static plus settled blocks, score panel and next piece. Each
+      part is redrawn only when its value changes.
+    * dynamic: ghost piece, falling piece, flashing lines and particles.
+      These are drawn every frame after their previous areas are restored
+      from base.
+    * overlay: pause or game over, composed once when it appears.
+    """
+
+    def __init__(self, screen: pygame.Surface, font_large: pygame.font.Font,
+                 font_medium: pygame.font.Font, font_small: pygame.font.Font):
+        """Initialize the renderer and draw the static layer.
+
+        Args:
+            screen: Display surface
+            font_large: Font for titles and overlays
+            font_medium: Font for the score panel
+            font_small: Font for labels and help text
+        """
+        self.screen = screen
+        self.font_large = font_large
+        self.font_medium = font_medium
+        self.font_small = font_small
+        self.text = TextCache()
+
+        self.static = screen.copy()
+        self._draw_static()
+        self.base = self.static.copy()
+
+        # Values the base layer was last drawn with
+        self._board_key: Optional[tuple] = None
+        self._panel_key: Optional[Tuple[int, int, int]] = None
+        self._next_shape: Optional[str] = None
+        self._preview_drawn = False
+
+        self._overlay_key: Optional[tuple] = None
+        self._dimmers: Dict[int, pygame.Surface] = {}
+        self._dynamic_rects: List[pygame.Rect] = []
+        self._full_redraw = True
+
+    def invalidate(self):
+        """Redraw the whole window on the next frame (e.g. after an expose)."""
+        self._full_redraw = True
+
+    def render(self, game) -> List[pygame.Rect]:
+        """Draw the next frame onto the screen.
+
+        Args:
+            game: ZenTetrisGame to draw
+
+        Returns:
+            Screen areas that changed, for ``pygame.display.update``
+        """
+        changed = self._update_base(game)
+        overlay = self._overlay(game)
+        if overlay is not None and overlay == self._overlay_key and not changed and not self._full_redraw:
+            # Nothing moves under an overlay
+            return []
+
+        # Overlays dim the whole window, so showing or hiding one redraws everything
+        full = self._full_redraw or overlay != self._overlay_key or overlay is not None
+        screen = self.screen
+        if full:
+            screen.blit(self.base, (0, 0))
+        else:
+            for rect in self._dynamic_rects + changed:
+                screen.blit(self.base, rect, rect)
+
+        dynamic = self._draw_dynamic(game)
+        if overlay is not None:
+            self._draw_overlay(overlay)
+
+        dirty = [screen.get_rect()] if full else self._dynamic_rects + changed + dynamic
+        self._dynamic_rects = dynamic
+        self._overlay_key = overlay
+        self._full_redraw = False
+        return dirty
+
+    def _draw_static(self):
+        """Draw everything that never changes."""
+        surface = self.static
+        apply_earth_tone_gradient(surface, WINDOW_WIDTH, WINDOW_HEIGHT)
+
+        # Title
+        title_surface = self.text.render(self.font_large, "ZEN Tetris v2", COLORS['text_primary'])
+        title_rect = title_surface.get_rect(centerx=WINDOW_WIDTH // 2, y=20)
+        surface.blit(title_surface, title_rect)
+
+        Board.draw_frame(surface, BOARD_OFFSET_X, BOARD_OFFSET_Y)
+
+        # Controls
+        controls_y = PANEL_Y + 200
+        for i, control in enumerate(CONTROLS):
+            color = COLORS['text_accent'] if i == 0 else COLORS['text_primary']
+            font = self.font_medium if i == 0 else self.font_small
+            text = self.text.render(font, control, color)
+            surface.blit(text, (PANEL_X, controls_y + i * 25))
+
+        # Next piece preview background
+        pygame.draw.rect(surface, COLORS['board_bg'], PREVIEW_RECT)
+        pygame.draw.rect(surface, COLORS['ui_accent'], PREVIEW_RECT, 2)
+
+    def _update_base(self, game) -> List[pygame.Rect]:
+        """Redraw the parts of the base layer whose values changed.
+
+        Returns:
+            Areas of the base layer that were redrawn
+        """
+        base = self.base
+        changed = []
+
+        key = board_key(game.board)
+        if key != self._board_key:
+            base.blit(self.static, BOARD_RECT, BOARD_RECT)
+            game.board.draw_blocks(base, BOARD_OFFSET_X, BOARD_OFFSET_Y)
+            self._board_key = key
+            changed.append(BOARD_RECT)
+
+        panel = (game.score, game.lines_cleared, game.level)
+        if panel != self._panel_key:
+            base.blit(self.static, PANEL_RECT, PANEL_RECT)
+            base.set_clip(PANEL_RECT)
+            for i, (label, value) in enumerate((("Score: ", game.score), ("Lines: ", game.lines_cleared),
+                                                ("Level: ", game.level))):
+                self.text.blit_number(base, self.font_medium, label, value, COLORS['text_primary'],
+                                      (PANEL_X, PANEL_Y + i * 40))
+            self.text.blit(base, self.font_small, "Next Piece", COLORS['text_primary'],
+                           (PANEL_X, PREVIEW_RECT.y - 25))
+            base.set_clip(None)
+            self._panel_key = panel
+            changed.append(PANEL_RECT)
+
+        next_shape = game.next_tetromino.shape_type if game.next_tetromino else None
+        if next_shape != self._next_shape or not self._preview_drawn:
+            base.blit(self.static, PREVIEW_RECT, PREVIEW_RECT)
+            if game.next_tetromino:
+                self._draw_preview(base, game.next_tetromino)
+            self._next_shape = next_shape
+            self._preview_drawn = True
+            changed.append(PREVIEW_RECT)
+
+        return changed
+
+    @staticmethod
+    def _draw_preview(surface: pygame.Surface, tetromino):
+        """Draw the next tetromino centered in the preview box."""
+        state = tetromino.state
+        start_x = PREVIEW_RECT.x + (PREVIEW_RECT.width - state.width * 20) // 2
+        start_y = PREVIEW_RECT.y + (PREVIEW_RECT.height - state.height * 20) // 2
+
+        for x, y in state.blocks:
+            block_rect = pygame.Rect(start_x + x * 20, start_y + y * 20, 18, 18)
+            pygame.draw.rect(surface, COLORS[tetromino.shape_type], block_rect)
+            pygame.draw.rect(surface, COLORS['shadow'], block_rect, 1)
+
+    def _draw_dynamic(self, game) -> List[pygame.Rect]:
+        """Draw flashing lines, the ghost and falling piece, and particles.
+
+        Returns:
+            Screen areas drawn
+        """
+        screen = self.screen
+        rects = []
+
+        if game.flash_timer > 0 and game.flash_lines:
+            # Redraw through the row below the last flashing one: like a full
+            # board draw, its blocks cover the glow that spills onto them
+            top = max(0, min(game.flash_lines))
+            bottom = min(BOARD_HEIGHT, max(game.flash_lines) + 2)
+            game.board.draw_blocks(screen, BOARD_OFFSET_X, BOARD_OFFSET_Y,
+                                   game.flash_lines, game.flash_timer, range(top, bottom))
+            # Flash glow reaches 2 pixels past each block
+            rects.append(pygame.Rect(BOARD_OFFSET_X - 2, BOARD_OFFSET_Y + top * BLOCK_SIZE - 2,
+                                     BOARD_WIDTH * BLOCK_SIZE + 4, (bottom - top) * BLOCK_SIZE + 4))
+
+        piece = game.current_tetromino
+        if piece and not game.game_over:
+            ghost = self._draw_ghost(screen, piece, game.board.landing_y(piece))
+            if ghost is not None:
+                rects.append(ghost)
+            piece.draw(screen, BOARD_OFFSET_X, BOARD_OFFSET_Y)
+            blocks = [pygame.Rect(BOARD_OFFSET_X + x * BLOCK_SIZE, BOARD_OFFSET_Y + y * BLOCK_SIZE,
+                                  BLOCK_SIZE, BLOCK_SIZE) for x, y in piece.get_blocks()]
+            rects.append(blocks[0].unionall(blocks[1:]))
+
+        particles = game.particle_system.draw(screen)
+        if len(particles) > MAX_PARTICLE_RECTS:
+            particles = [particles[0].unionall(particles[1:])]
+        rects.extend(particles)
+        return rects
+
+    @staticmethod
+    def _draw_ghost(surface: pygame.Surface, piece, landing_y: int) -> Optional[pygame.Rect]:
+        """Outline where the falling piece would land.
+
+        Returns:
+            Area drawn, or None when the piece is already resting there
+        """
+        if landing_y == piece.y:
+            return None
+        # Blend the piece color halfway into the board background
+        color = tuple((c + bg) // 2 for c, bg in zip(piece.color, COLORS['board_bg']))
+        blocks = [pygame.Rect(BOARD_OFFSET_X + (piece.x + dx) * BLOCK_SIZE,
+                              BOARD_OFFSET_Y + (landing_y + dy) * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
+                  for dx, dy in piece.state.blocks if landing_y + dy >= 0]
+        if not blocks:
+            return None
+        for block in blocks:
+            pygame.draw.rect(surface, color, block.inflate(-2, -2), 2)
+        return blocks[0].unionall(blocks[1:])
+
+    @staticmethod
+    def _overlay(game) -> Optional[tuple]:
+        """Get which overlay the game needs, if any."""
+        if game.paused:
+            return ("paused",)
+        if game.game_over:
+            return ("game_over", game.score)
+        return None
+
+    def _dimmer(self, alpha: int) -> pygame.Surface:
+        """Get a cached full-window black surface with the given alpha."""
+        dimmer = self._dimmers.get(alpha)
+        if dimmer is None:
+            dimmer = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+            dimmer.set_alpha(alpha)
+            dimmer.fill((0, 0, 0))
+            self._dimmers[alpha] = dimmer
+        return dimmer
+
+    def _draw_overlay(self, overlay: tuple):
+        """Draw the pause or game over overlay."""
+        screen = self.screen
+        center_x, center_y = WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2
+
+        if overlay[0] == "paused":
+            screen.blit(self._dimmer(128), (0, 0))
+            lines = (
+                (self.font_large, "PAUSED", COLORS['text_light'], 0),
+                (self.font_medium, "Press P to Resume", COLORS['text_light'], 60),
+            )
+        else:
+            screen.blit(self._dimmer(160), (0, 0))
+            lines = (
+                (self.font_large, "GAME OVER", COLORS['text_light'], -40),
+                (self.font_medium, f"Final Score: {overlay[1]}", COLORS['text_light'], 20),
+                (self.font_medium, "Press R to Restart", COLORS['text_accent'], 60),
+            )
+
+        for font, text, color, dy in lines:
+            surface = self.text.render(font, text, color)
+            screen.blit(surface, surface.get_rect(center=(center_x, center_y + dy)))
@@ -0,0 +1,93 @@
+"""
+Cached text rendering for ZEN Tetris v2.
+"""
+
+import pygame
+from collections import OrderedDict
+from typing import Tuple
+
+# Rendered strings kept before the least recently used is dropped
+MAX_CACHED_TEXTS = 256
+
+Color = Tuple[int, int, int]
+
+
+class TextCache:
+    """Rendered text surfaces keyed by (font, string, color), with LRU eviction.
+
+    Numbers are drawn from cached per-digit glyphs, so a changing score
+    never rasterizes new text.
+    """
+
+    def __init__(self, max_entries: int = MAX_CACHED_TEXTS):
+        """Initialize an empty cache.
+
+        Args:
+            max_entries: Most surfaces kept
+        """
+        self.max_entries = max_entries
+        self._surfaces: "OrderedDict[tuple, pygame.Surface]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def render(self, font: pygame.font.Font, text: str, color: Color) -> pygame.Surface:
+        """Get an antialiased rendering of a string.
+
+        Args:
+            font: Font to render with
+            text: String to render
+            color: RGB text color
+
+        Returns:
+            Cached surface; callers must not draw on it
+        """
+        key = (font, text, color)
+        surfaces = self._surfaces
+        surface = surfaces.get(key)
+        if surface is not None:
+            surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        surfaces[key] = surface
+        if len(surfaces) > self.max_entries:
+            surfaces.popitem(last=False)
+        return surface
+
+    def blit(self, surface: pygame.Surface, font: pygame.font.Font, text: str, color: Color,
+             position: Tuple[int, int]) -> pygame.Rect:
+        """Draw a string onto a surface.
+
+        Returns:
+            Area drawn
+        """
+        return surface.blit(self.render(font, text, color), position)
+
+    def blit_number(self, surface: pygame.Surface, font: pygame.font.Font, label: str, value: int,
+                    color: Color, position: Tuple[int, int]) -> pygame.Rect:
+        """Draw a label followed by a number composed from cached digit glyphs.
+
+        Args:
+            surface: Surface to draw on
+            font: Font to render with
+            label: Text before the number (e.g. "Score: ")
+            value: Number to draw
+            color: RGB text color
+            position: Top-left corner of the label
+
+        Returns:
+            Area drawn
+        """
+        x, y = position
+        height = 0
+        for part in (label, *str(value)):
+            glyph = self.render(font, part, color)
+            surface.blit(glyph, (x, y))
+            x += glyph.get_width()
+            height = max(height, glyph.get_height())
+        return pygame.Rect(position, (x - position[0], height))
@@ -74,6 +74,8 @@ FPS = 60
 DROP_SPEED = 500  # milliseconds (faster for testing)
 LINES_PER_LEVEL = 10
 SPEED_INCREASE_PER_LEVEL = 50  # milliseconds faster
+MIN_DROP_SPEED = 50  # milliseconds
+LINE_CLEAR_DELAY = 200  # milliseconds completed lines flash before clearing
 
 # Scoring
 SCORE_VALUES = {
@@ -82,6 +84,8 @@ SCORE_VALUES = {
     3: 500,   # Triple
     4: 800,   # Tetris
 }
+COMBO_BONUS = 50        # per consecutive clear
+MAX_COMBO_BONUS = 500
 
 # Particle settings
 PARTICLE_COUNT = 15
@@ -0,0 +1,9 @@
+"""
+Headless ZEN Tetris v2 core: board, pieces, rules and engine without pygame.
+"""
+
+from .board import Board, BitBoard
+from .engine import ACTIONS, StepResult, TetrisEngine
+from .pieces import ROTATIONS, Tetromino
+
+__all__ = ["ACTIONS", "BitBoard", "Board", "ROTATIONS", "StepResult", "TetrisEngine", "Tetromino"]
@@ -0,0 +1,451 @@
+"""
+Game board logic for ZEN Tetris v2.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..constants import BOARD_WIDTH, BOARD_HEIGHT
+from .pieces import Tetromino
+
+
+class Board:
+    """Game board storing a list-of-lists grid of colors."""
+    
+    def __init__(self):
+        """Initialize an empty board."""
+        # Board grid: None for empty, color tuple for filled
+        self.grid = [[None for _ in range(BOARD_WIDTH)] for _ in range(BOARD_HEIGHT)]
+    
+    def check_collision(self, tetromino: Tetromino) -> bool:
+        """Check if tetromino collides with board or boundaries.
+        
+        Args:
+            tetromino: Tetromino to check
+            
+        Returns:
+            True if collision detected
+        """
+        x = tetromino.x
+        y = tetromino.y
+        grid = self.grid
+        for dx, dy in tetromino.state.blocks:
+            block_x = x + dx
+            block_y = y + dy
+            
+            # Check horizontal boundaries
+            if block_x < 0 or block_x >= BOARD_WIDTH:
+                return True
+            
+            # Check bottom boundary (critical fix for infinite falling)
+            if block_y >= BOARD_HEIGHT:
+                return True
+            
+            # Check collision with existing blocks (but allow negative y for spawning)
+            if block_y >= 0 and grid[block_y][block_x] is not None:
+                return True
+        
+        return False
+    
+    def place_tetromino(self, tetromino: Tetromino):
+        """Place tetromino on the board.
+        
+        Args:
+            tetromino: Tetromino to place
+        """
+        for block_x, block_y in tetromino.get_blocks():
+            if 0 <= block_y < BOARD_HEIGHT and 0 <= block_x < BOARD_WIDTH:
+                self.grid[block_y][block_x] = tetromino.color
+    
+    def get_completed_lines(self) -> List[int]:
+        """Get list of completed line indices.
+        
+        Returns:
+            List of y-coordinates of completed lines
+        """
+        completed_lines = []
+        for y in range(BOARD_HEIGHT):
+            if all(self.grid[y][x] is not None for x in range(BOARD_WIDTH)):
+                completed_lines.append(y)
+        return completed_lines
+    
+    def clear_lines(self, line_indices: List[int]):
+        """Clear specified lines and drop blocks above.
+        
+        Args:
+            line_indices: List of line y-coordinates to clear
+        """
+        if not line_indices:
+            return
+            
+        # Sort in descending order to clear from bottom up
+        line_indices.sort(reverse=True)
+        
+        # Remove completed lines from bottom to top
+        for line_y in line_indices:
+            if 0 <= line_y < len(self.grid):
+                del self.grid[line_y]
+        
+        # Add empty lines at the top to maintain board height
+        lines_to_add = len(line_indices)
+        for _ in range(lines_to_add):
+            self.grid.insert(0, [None for _ in range(BOARD_WIDTH)])
+    
+    def get_block_color(self, x: int, y: int) -> Optional[Tuple[int, int, int]]:
+        """Get color of block at position.
+        
+        Args:
+            x: X coordinate
+            y: Y coordinate
+            
+        Returns:
+            Color tuple or None if empty
+        """
+        if 0 <= y < BOARD_HEIGHT and 0 <= x < BOARD_WIDTH:
+            return self.grid[y][x]
+        return None
+    
+    def is_empty(self) -> bool:
+        """Check if board is completely empty.
+        
+        Returns:
+            True if board has no placed blocks
+        """
+        for row in self.grid:
+            for cell in row:
+                if cell is not None:
+                    return False
+        return True
+    
+    def get_column_heights(self) -> List[int]:
+        """Get the stack height of each column.
+        
+        Returns:
+            Rows from the bottom up to and including the highest filled
+            cell, 0 for empty columns
+        """
+        heights = [0] * BOARD_WIDTH
+        for y, row in enumerate(self.grid):
+            for x, cell in enumerate(row):
+                if cell is not None and not heights[x]:
+                    heights[x] = BOARD_HEIGHT - y
+        return heights
+    
+    def get_column_holes(self) -> List[int]:
+        """Get the number of empty cells below the highest filled cell of each column.
+        
+        Returns:
+            Hole count per column
+        """
+        holes = [0] * BOARD_WIDTH
+        for x, height in enumerate(self.get_column_heights()):
+            for y in range(BOARD_HEIGHT - height, BOARD_HEIGHT):
+                if self.grid[y][x] is None:
+                    holes[x] += 1
+        return holes
+    
+    def landing_y(self, tetromino: Tetromino) -> int:
+        """Get the row a tetromino would lock at if dropped straight down.
+        
+        A piece above the stack lands one row above the first column top its
+        bottom cells meet, which takes one lookup per piece column. Only a
+        piece tucked under an overhang is stepped down cell by cell.
+        
+        Args:
+            tetromino: Tetromino in a free position
+            
+        Returns:
+            Y coordinate of the tetromino after the drop
+        """
+        x = tetromino.x
+        y = tetromino.y
+        heights = self.get_column_heights()
+        landing = BOARD_HEIGHT - 1 - max(
+            heights[x + dx] + dy for dx, dy in enumerate(tetromino.state.bottoms)
+        )
+        if landing >= y:
+            return landing
+        
+        # Some column's stack starts above the piece, so its top says nothing
+        try:
+            while not self.check_collision(tetromino):
+                tetromino.y += 1
+            return max(tetromino.y - 1, y)
+        finally:
+            tetromino.y = y
+
+
+# Bit x of a row mask is set when column x is filled
+FULL_ROW = (1 << BOARD_WIDTH) - 1
+
+
+class _GridRow:
+    """Mutable view of one bitboard row that behaves like a list of colors."""
+
+    __slots__ = ('_board', '_y')
+
+    def __init__(self, board: 'BitBoard', y: int):
+        self._board = board
+        self._y = y
+
+    def __len__(self) -> int:
+        return BOARD_WIDTH
+
+    def __getitem__(self, x: int) -> Optional[Tuple[int, int, int]]:
+        if not -BOARD_WIDTH <= x < BOARD_WIDTH:
+            raise IndexError("grid row index out of range")
+        return self._board.get_block_color(x % BOARD_WIDTH, self._y)
+
+    def __setitem__(self, x: int, color: Optional[Tuple[int, int, int]]):
+        if not -BOARD_WIDTH <= x < BOARD_WIDTH:
+            raise IndexError("grid row index out of range")
+        self._board.set_block(x % BOARD_WIDTH, self._y, color)
+
+    def __iter__(self) -> Iterator[Optional[Tuple[int, int, int]]]:
+        return iter(self._board.get_row_colors(self._y))
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class _GridView:
+    """List-of-rows view over a bitboard, compatible with ``Board.grid``."""
+
+    __slots__ = ('_rows',)
+
+    def __init__(self, board: 'BitBoard'):
+        self._rows = [_GridRow(board, y) for y in range(BOARD_HEIGHT)]
+
+    def __len__(self) -> int:
+        return BOARD_HEIGHT
+
+    def __getitem__(self, y: int) -> _GridRow:
+        return self._rows[y]
+
+    def __iter__(self) -> Iterator[_GridRow]:
+        return iter(self._rows)
+
+
+class BitBoard(Board):
+    """Game board storing each row as an integer bitmask.
+
+    Occupancy lives in ``rows`` (one int per row) and colors live in a
+    parallel ``colors`` bytearray of palette indices, so line checks,
+    collisions and clears work on whole rows at once. ``grid`` is a
+    writable view with the same shape as ``Board.grid``.
+
+    Column heights and hole counts are kept up to date as blocks are placed
+    and lines cleared, so landing rows and board features cost nothing to
+    read.
+    """
+
+    def __init__(self):
+        """Initialize an empty board."""
+        self._rows: List[int] = [0] * BOARD_HEIGHT
+        self.colors = bytearray(BOARD_WIDTH * BOARD_HEIGHT)
+        # Palette index 0 is reserved for empty cells
+        self.palette: List[Optional[Tuple[int, int, int]]] = [None]
+        self._palette_index: Dict[Tuple[int, int, int], int] = {}
+        self.grid = _GridView(self)
+        self._heights = [0] * BOARD_WIDTH
+        self._holes = [0] * BOARD_WIDTH
+
+    @property
+    def rows(self) -> List[int]:
+        """Row masks, one int per row with bit x set when column x is filled.
+
+        Assigning a new list recounts the column features; write single
+        cells through ``set_block`` or ``grid``.
+        """
+        return self._rows
+
+    @rows.setter
+    def rows(self, rows: List[int]):
+        self._rows = rows
+        for x in range(BOARD_WIDTH):
+            self._recount_column(x)
+
+    def _color_index(self, color: Tuple[int, int, int]) -> int:
+        """Get the palette index for a color, adding it if needed."""
+        index = self._palette_index.get(color)
+        if index is None:
+            if len(self.palette) > 255:
+                raise ValueError("BitBoard palette supports at most 255 colors")
+            index = len(self.palette)
+            self.palette.append(color)
+            self._palette_index[color] = index
+        return index
+
+    def set_block(self, x: int, y: int, color: Optional[Tuple[int, int, int]]):
+        """Fill or empty a single cell.
+
+        Args:
+            x: X coordinate
+            y: Y coordinate
+            color: Color tuple, or None to empty the cell
+        """
+        bit = 1 << x
+        if color is None:
+            self._rows[y] &= ~bit
+            self.colors[y * BOARD_WIDTH + x] = 0
+        else:
+            self._rows[y] |= bit
+            self.colors[y * BOARD_WIDTH + x] = self._color_index(color)
+        self._recount_column(x)
+
+    def _recount_column(self, x: int):
+        """Recompute the height and holes of one column from the row masks."""
+        bit = 1 << x
+        height = 0
+        filled = 0
+        for y, row in enumerate(self._rows):
+            if row & bit:
+                filled += 1
+                if not height:
+                    height = BOARD_HEIGHT - y
+        self._heights[x] = height
+        self._holes[x] = height - filled
+
+    def get_row_colors(self, y: int) -> List[Optional[Tuple[int, int, int]]]:
+        """Get the colors of one row.
+
+        Args:
+            y: Row index
+
+        Returns:
+            List of color tuples or None for empty cells
+        """
+        palette = self.palette
+        start = y * BOARD_WIDTH
+        return [palette[index] for index in self.colors[start:start + BOARD_WIDTH]]
+
+    def check_collision(self, tetromino: Tetromino) -> bool:
+        """Check if tetromino collides with board or boundaries.
+
+        Args:
+            tetromino: Tetromino to check
+
+        Returns:
+            True if collision detected
+        """
+        state = tetromino.state
+        x = tetromino.x
+        y = tetromino.y
+
+        # Shapes have no empty columns, so only these x keep all blocks inside the walls
+        if not 0 <= x < len(state.column_masks):
+            return True
+        if y + state.height > BOARD_HEIGHT:
+            return True
+
+        rows = self._rows
+        for dy, mask in enumerate(state.column_masks[x]):
+            # Rows above the board are allowed for spawning
+            if y + dy >= 0 and rows[y + dy] & mask:
+                return True
+
+        return False
+
+    def place_tetromino(self, tetromino: Tetromino):
+        """Place tetromino on the board.
+
+        Args:
+            tetromino: Tetromino to place
+        """
+        index = self._color_index(tetromino.color)
+        rows = self._rows
+        heights = self._heights
+        holes = self._holes
+        for block_x, block_y in tetromino.get_blocks():
+            if 0 <= block_y < BOARD_HEIGHT and 0 <= block_x < BOARD_WIDTH:
+                bit = 1 << block_x
+                if not rows[block_y] & bit:
+                    # Raising the column opens (height gain - 1) new holes;
+                    # a block below the top fills one instead
+                    height = max(heights[block_x], BOARD_HEIGHT - block_y)
+                    holes[block_x] += height - heights[block_x] - 1
+                    heights[block_x] = height
+                    rows[block_y] |= bit
+                self.colors[block_y * BOARD_WIDTH + block_x] = index
+
+    def get_completed_lines(self) -> List[int]:
+        """Get list of completed line indices.
+
+        Returns:
+            List of y-coordinates of completed lines
+        """
+        return [y for y, row in enumerate(self._rows) if row == FULL_ROW]
+
+    def clear_lines(self, line_indices: List[int]):
+        """Clear specified lines and drop blocks above.
+
+        Args:
+            line_indices: List of line y-coordinates to clear
+        """
+        cleared = {y for y in line_indices if 0 <= y < BOARD_HEIGHT}
+        if not cleared:
+            return
+
+        kept = [y for y in range(BOARD_HEIGHT) if y not in cleared]
+        old_rows = self._rows
+        rows = self._rows = [0] * len(cleared) + [old_rows[y] for y in kept]
+
+        colors = self.colors
+        self.colors = bytearray(BOARD_WIDTH * len(cleared)) + b''.join(
+            colors[y * BOARD_WIDTH:(y + 1) * BOARD_WIDTH] for y in kept
+        )
+
+        heights = self._heights
+        holes = self._holes
+        for x in range(BOARD_WIDTH):
+            bit = 1 << x
+            top = BOARD_HEIGHT - heights[x]
+            filled = heights[x] - holes[x] - sum(1 for y in cleared if old_rows[y] & bit)
+            # The stack sinks by the cleared rows it contained; if its top
+            # cell was cleared, holes below it become open space
+            height = heights[x] - sum(1 for y in cleared if y >= top)
+            while height and not rows[BOARD_HEIGHT - height] & bit:
+                height -= 1
+            heights[x] = height
+            holes[x] = height - filled
+
+    def get_block_color(self, x: int, y: int) -> Optional[Tuple[int, int, int]]:
+        """Get color of block at position.
+
+        Args:
+            x: X coordinate
+            y: Y coordinate
+
+        Returns:
+            Color tuple or None if empty
+        """
+        if 0 <= y < BOARD_HEIGHT and 0 <= x < BOARD_WIDTH:
+            return self.palette[self.colors[y * BOARD_WIDTH + x]]
+        return None
+
+    def is_empty(self) -> bool:
+        """Check if board is completely empty.
+
+        Returns:
+            True if board has no placed blocks
+        """
+        return not any(self._rows)
+
+    def get_column_heights(self) -> List[int]:
+        """Get the stack height of each column.
+
+        Returns:
+            Rows from the bottom up to and including the highest filled
+            cell, 0 for empty columns
+        """
+        return list(self._heights)
+
+    def get_column_holes(self) -> List[int]:
+        """Get the number of empty cells below the highest filled cell of each column.
+
+        Returns:
+            Hole count per column
+        """
+        return list(self._holes)
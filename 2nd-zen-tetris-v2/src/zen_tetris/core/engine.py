@@ -0,0 +1,248 @@
+"""
+Headless game engine for ZEN Tetris v2.
+"""
+
+import random
+from typing import List, NamedTuple, Optional, Type
+
+from .board import BitBoard, Board
+from .pieces import SHAPE_TYPES, Tetromino
+from .rules import drop_interval, level_for_lines, line_clear_score
+
+# Actions accepted by TetrisEngine.step
+ACTIONS = ("move_left", "move_right", "move_down", "rotate", "hard_drop", "pause", "restart")
+
+
+class StepResult(NamedTuple):
+    """Outcome of a single engine step."""
+
+    locked: bool        # A piece was placed on the board
+    lines_cleared: int  # Lines removed from the board during the step
+    game_over: bool
+
+
+class TetrisEngine:
+    """Pure-Python Tetris rules driven by ``step(action, dt)``.
+
+    Time only moves forward through ``step``, so games can be simulated as
+    fast as the CPU allows. Game front-ends subclass the engine to add
+    input, rendering and effects, choosing their board and piece classes
+    and overriding the ``_on_*`` hooks.
+    """
+
+    board_class: Type[Board] = BitBoard
+    piece_class: Type[Tetromino] = Tetromino
+    clear_delay = 0  # milliseconds completed lines stay on the board
+
+    def __init__(self, seed: Optional[int] = None):
+        """Initialize the engine and spawn the first pieces.
+
+        Args:
+            seed: Seed for the piece sequence (random when None)
+        """
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        """Start a new game."""
+        self.board = self.board_class()
+        self.current_tetromino: Optional[Tetromino] = None
+        self.next_tetromino: Optional[Tetromino] = None
+        self.game_over = False
+        self.paused = False
+
+        # Score and progression
+        self.score = 0
+        self.lines_cleared = 0
+        self.level = 1
+        self.combo_count = 0
+        self.pieces_placed = 0
+        self.drop_timer = 0.0
+        self.drop_speed = drop_interval(self.level)
+
+        # Completed lines waiting for clear_delay to pass
+        self.flash_lines: List[int] = []
+        self.clear_timer = 0.0
+
+        self._step_locked = False
+        self._step_lines = 0
+
+        self.next_tetromino = self._create_random_tetromino()
+        self._spawn_new_tetromino()
+
+    def step(self, action: Optional[str] = None, dt: float = 0.0) -> StepResult:
+        """Apply one action and advance game time.
+
+        Args:
+            action: One of ACTIONS, or None for no input
+            dt: Elapsed time in milliseconds
+
+        Returns:
+            What happened during the step
+        """
+        self._step_locked = False
+        self._step_lines = 0
+
+        if action is not None:
+            self.apply_action(action)
+        if dt > 0:
+            self.advance(dt)
+
+        return StepResult(self._step_locked, self._step_lines, self.game_over)
+
+    def apply_action(self, action: str):
+        """Apply a player action.
+
+        Args:
+            action: One of ACTIONS
+        """
+        if action == "restart":
+            self.reset()
+            return
+
+        if self.game_over:
+            return
+
+        if action == "pause":
+            self.paused = not self.paused
+            return
+
+        if self.paused:
+            return
+
+        if action == "move_left":
+            self.move(-1, 0)
+        elif action == "move_right":
+            self.move(1, 0)
+        elif action == "move_down":
+            self.move(0, 1)
+        elif action == "rotate":
+            self.rotate()
+        elif action == "hard_drop":
+            self.hard_drop()
+
+    def advance(self, dt: float):
+        """Advance line clearing and gravity timers.
+
+        Args:
+            dt: Elapsed time in milliseconds
+        """
+        if self.game_over or self.paused:
+            return
+
+        if self.flash_lines:
+            self.clear_timer -= dt
+            if self.clear_timer <= 0:
+                self._clear_completed_lines()
+
+        self.drop_timer += dt
+        if self.drop_timer >= self.drop_speed:
+            self.drop_timer = 0.0
+            if not self.move(0, 1):
+                self.lock()
+
+    def move(self, dx: int, dy: int) -> bool:
+        """Move the current tetromino if the target position is free.
+
+        Args:
+            dx: Columns to move
+            dy: Rows to move
+
+        Returns:
+            True if the tetromino moved
+        """
+        tetromino = self.current_tetromino
+        tetromino.x += dx
+        tetromino.y += dy
+        if self.board.check_collision(tetromino):
+            tetromino.x -= dx
+            tetromino.y -= dy
+            return False
+        return True
+
+    def rotate(self) -> bool:
+        """Rotate the current tetromino clockwise if it fits.
+
+        Returns:
+            True if the tetromino rotated
+        """
+        tetromino = self.current_tetromino
+        original_rotation = tetromino.rotation
+        tetromino.rotate()
+        if self.board.check_collision(tetromino):
+            tetromino.rotation = original_rotation
+            return False
+        return True
+
+    def hard_drop(self) -> int:
+        """Drop the current tetromino to the bottom and lock it.
+
+        Returns:
+            Number of rows dropped
+        """
+        tetromino = self.current_tetromino
+        landing = self.board.landing_y(tetromino)
+        rows = landing - tetromino.y
+        tetromino.y = landing
+        self.lock()
+        return rows
+
+    def lock(self):
+        """Place the current tetromino and spawn the next one."""
+        self.board.place_tetromino(self.current_tetromino)
+        self.pieces_placed += 1
+        self._step_locked = True
+
+        # The piece landed on lines still flashing from the previous piece;
+        # clearing them now moves it down together with the stack
+        if self.flash_lines:
+            self._clear_completed_lines()
+
+        completed_lines = self.board.get_completed_lines()
+        if completed_lines:
+            self.flash_lines = completed_lines
+            self._on_lines_completed(completed_lines)
+            if self.clear_delay > 0:
+                self.clear_timer = self.clear_delay
+            else:
+                self._clear_completed_lines()
+        else:
+            self.combo_count = 0
+
+        self._spawn_new_tetromino()
+
+    def _create_random_tetromino(self) -> Tetromino:
+        """Create a random tetromino."""
+        return self.piece_class(self.rng.choice(SHAPE_TYPES))
+
+    def _spawn_new_tetromino(self):
+        """Spawn the next tetromino at the top of the board."""
+        self.current_tetromino = self.next_tetromino
+        self.next_tetromino = self._create_random_tetromino()
+        self.current_tetromino.x = self.current_tetromino.state.spawn_x
+        self.current_tetromino.y = 0
+
+        if self.board.check_collision(self.current_tetromino):
+            self.game_over = True
+
+    def _clear_completed_lines(self):
+        """Remove flashing lines and update score and level."""
+        lines_count = len(self.flash_lines)
+        self.score += line_clear_score(lines_count, self.level, self.combo_count)
+        self.combo_count += 1
+        self.lines_cleared += lines_count
+        self._step_lines += lines_count
+
+        self.board.clear_lines(self.flash_lines)
+        self.flash_lines = []
+        self.clear_timer = 0.0
+
+        self.level = level_for_lines(self.lines_cleared)
+        self.drop_speed = drop_interval(self.level)
+
+    def _on_lines_completed(self, lines: List[int]):
+        """Hook called when lines complete, before they are cleared.
+
+        Args:
+            lines: Row indices of the completed lines
+        """
@@ -0,0 +1,184 @@
+"""
+Tetromino pieces and precomputed rotation tables for ZEN Tetris v2.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from ..constants import BOARD_WIDTH, COLORS, TETROMINO_SHAPES
+
+# Number of rotation states per piece (90 degree steps)
+ROTATION_COUNT = 4
+
+# Shape types in a fixed order for random selection
+SHAPE_TYPES = tuple(TETROMINO_SHAPES)
+
+
+class RotationState(NamedTuple):
+    """Immutable description of one rotation of a tetromino."""
+
+    matrix: Tuple[Tuple[str, ...], ...]  # Shape matrix of '0'/'1' cells
+    blocks: Tuple[Tuple[int, int], ...]  # (x, y) offsets of filled cells
+    row_masks: Tuple[int, ...]           # Bitmask per row, bit 0 = leftmost column
+    column_masks: Tuple[Tuple[int, ...], ...]  # row_masks shifted to each legal x
+    bottoms: Tuple[int, ...]             # Lowest filled row offset in each column
+    width: int
+    height: int
+    spawn_x: int                         # Column centering this rotation on the board
+
+
+def _rotate_clockwise(matrix: Sequence[Sequence[str]]) -> Tuple[Tuple[str, ...], ...]:
+    """Rotate a shape matrix 90 degrees clockwise."""
+    rows = len(matrix)
+    cols = len(matrix[0])
+    return tuple(
+        tuple(matrix[rows - 1 - i][j] for i in range(rows))
+        for j in range(cols)
+    )
+
+
+def _compile_state(matrix: Tuple[Tuple[str, ...], ...]) -> RotationState:
+    """Build the lookup data for one shape matrix."""
+    blocks = tuple(
+        (x, y)
+        for y, row in enumerate(matrix)
+        for x, cell in enumerate(row)
+        if cell == '1'
+    )
+    row_masks = tuple(
+        sum(1 << x for x, cell in enumerate(row) if cell == '1')
+        for row in matrix
+    )
+    width = len(matrix[0])
+    column_masks = tuple(
+        tuple(mask << x for mask in row_masks)
+        for x in range(BOARD_WIDTH - width + 1)
+    )
+    bottoms = tuple(
+        max(y for y, row in enumerate(matrix) if row[x] == '1')
+        for x in range(width)
+    )
+    return RotationState(
+        matrix=matrix,
+        blocks=blocks,
+        row_masks=row_masks,
+        column_masks=column_masks,
+        bottoms=bottoms,
+        width=width,
+        height=len(matrix),
+        spawn_x=BOARD_WIDTH // 2 - width // 2,
+    )
+
+
+def _compile_rotations(shape: List[List[str]]) -> Tuple[RotationState, ...]:
+    """Build all rotation states of a shape, starting from its spawn orientation."""
+    states = []
+    matrix = tuple(tuple(row) for row in shape)
+    for _ in range(ROTATION_COUNT):
+        states.append(_compile_state(matrix))
+        matrix = _rotate_clockwise(matrix)
+    return tuple(states)
+
+
+# Rotation states indexed by shape type, then rotation
+ROTATIONS: Dict[str, Tuple[RotationState, ...]] = {
+    shape_type: _compile_rotations(shape)
+    for shape_type, shape in TETROMINO_SHAPES.items()
+}
+
+
+def rotation_index(shape_type: str, matrix: Sequence[Sequence[str]]) -> int:
+    """Find the rotation whose matrix equals the given shape.
+
+    Args:
+        shape_type: One of 'I', 'O', 'T', 'S', 'Z', 'J', 'L'
+        matrix: Shape matrix of '0'/'1' cells
+
+    Returns:
+        Rotation index in ROTATIONS[shape_type]
+
+    Raises:
+        ValueError: If the matrix is not a rotation of the shape
+    """
+    key = tuple(tuple(row) for row in matrix)
+    for index, state in enumerate(ROTATIONS[shape_type]):
+        if state.matrix == key:
+            return index
+    raise ValueError(f"Shape is not a rotation of tetromino {shape_type!r}")
+
+
+class Tetromino:
+    """Represents a tetromino piece without any rendering.
+    
+    A piece is just its shape type, rotation index and position; all shape
+    data comes from the precomputed ``ROTATIONS`` tables.
+    """
+    
+    def __init__(self, shape_type: str):
+        """Initialize a tetromino.
+        
+        Args:
+            shape_type: One of 'I', 'O', 'T', 'S', 'Z', 'J', 'L'
+        """
+        self.shape_type = shape_type
+        self.color = COLORS[shape_type]
+        self.x = 0
+        self.y = 0
+        self.rotation = 0
+    
+    @property
+    def rotation(self) -> int:
+        """Rotation index into ``ROTATIONS[shape_type]``."""
+        return self._rotation
+    
+    @rotation.setter
+    def rotation(self, rotation: int):
+        self._rotation = rotation
+        # Precomputed data for the current rotation
+        self.state: RotationState = ROTATIONS[self.shape_type][rotation]
+        self._shape: Optional[List[List[str]]] = None
+    
+    @property
+    def shape(self) -> List[List[str]]:
+        """Shape matrix of the current rotation.
+        
+        Kept for compatibility; the list is a per-instance copy, so editing
+        it does not change the piece. Assigning a rotated matrix selects
+        the matching rotation.
+        """
+        if self._shape is None:
+            self._shape = [list(row) for row in self.state.matrix]
+        return self._shape
+    
+    @shape.setter
+    def shape(self, matrix: List[List[str]]):
+        self.rotation = rotation_index(self.shape_type, matrix)
+    
+    def rotate(self):
+        """Rotate the tetromino 90 degrees clockwise."""
+        self.rotation = (self._rotation + 1) % ROTATION_COUNT
+    
+    def get_blocks(self) -> List[Tuple[int, int]]:
+        """Get list of block positions relative to tetromino position.
+        
+        Returns:
+            List of (x, y) tuples for each block
+        """
+        x = self.x
+        y = self.y
+        return [(x + dx, y + dy) for dx, dy in self.state.blocks]
+    
+    def copy(self) -> 'Tetromino':
+        """Create a copy of this tetromino.
+        
+        Returns:
+            New Tetromino instance with same properties
+        """
+        new_tetromino = self.__class__.__new__(self.__class__)
+        new_tetromino.shape_type = self.shape_type
+        new_tetromino.color = self.color
+        new_tetromino.x = self.x
+        new_tetromino.y = self.y
+        new_tetromino._rotation = self._rotation
+        new_tetromino.state = self.state
+        new_tetromino._shape = None
+        return new_tetromino
\ No newline at end of file
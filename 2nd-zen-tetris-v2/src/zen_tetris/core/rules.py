@@ -0,0 +1,35 @@
+"""
+Scoring, level and drop timing rules for ZEN Tetris v2.
+"""
+
+from ..constants import (
+    SCORE_VALUES, COMBO_BONUS, MAX_COMBO_BONUS,
+    DROP_SPEED, LINES_PER_LEVEL, SPEED_INCREASE_PER_LEVEL, MIN_DROP_SPEED
+)
+
+
+def line_clear_score(lines: int, level: int, combo: int) -> int:
+    """Get the score for clearing lines.
+    
+    Args:
+        lines: Number of lines cleared at once
+        level: Current level
+        combo: Number of consecutive clears before this one
+        
+    Returns:
+        Points awarded
+    """
+    score = SCORE_VALUES.get(lines, SCORE_VALUES[1]) * level
+    if combo > 0:
+        score += min(combo * COMBO_BONUS, MAX_COMBO_BONUS)
+    return score
+
+
+def level_for_lines(lines_cleared: int) -> int:
+    """Get the level reached after clearing a total number of lines."""
+    return lines_cleared // LINES_PER_LEVEL + 1
+
+
+def drop_interval(level: int) -> int:
+    """Get the gravity interval in milliseconds for a level."""
+    return max(MIN_DROP_SPEED, DROP_SPEED - (level - 1) * SPEED_INCREASE_PER_LEVEL)
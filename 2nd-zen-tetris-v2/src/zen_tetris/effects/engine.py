@@ -0,0 +1,166 @@
+"""
+Particle simulation stored as NumPy arrays (structure of arrays).
+
+Pygame-free so it can run headless; ``ParticleSystem`` draws from it.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..constants import PARTICLE_LIFETIME, PARTICLE_GRAVITY, PARTICLE_SIZE_RANGE, PARTICLE_SPEED_RANGE
+
+# Size multiplier applied every frame
+PARTICLE_SHRINK = 0.98
+
+# Particles smaller than this are removed
+MIN_PARTICLE_SIZE = 0.1
+
+# Rows of ParticleEngine.data
+FIELDS = ("x", "y", "vx", "vy", "size", "life", "rotation", "rotation_speed")
+
+Color = Tuple[int, int, int]
+Coordinates = Union[float, Sequence[float], np.ndarray]
+
+
+class ParticleEngine:
+    """Fixed-capacity particle store with vectorized updates.
+
+    Each field is one row of a preallocated float32 array; only the first
+    ``count`` columns are live. Dead particles are removed by moving live
+    particles from the end into their slots, so removal costs scale with
+    the number of deaths rather than the number of particles.
+    """
+
+    def __init__(self, capacity: int = 500, seed: Optional[int] = None):
+        """Initialize an empty engine.
+
+        Args:
+            capacity: Most particles alive at once; the oldest are evicted beyond it
+            seed: Seed for spawn randomness (random when None)
+        """
+        self.capacity = capacity
+        self.count = 0
+        self.data = np.zeros((len(FIELDS), capacity), dtype=np.float32)
+        self.color_index = np.zeros(capacity, dtype=np.uint8)
+        self.palette: List[Color] = []
+        self._palette_index: Dict[Color, int] = {}
+        self.rng = np.random.default_rng(seed)
+
+        # Named views of the data rows
+        (self.x, self.y, self.vx, self.vy, self.size,
+         self.life, self.rotation, self.rotation_speed) = self.data
+
+    def __len__(self) -> int:
+        return self.count
+
+    def color_code(self, color: Color) -> int:
+        """Get the palette index for a color, adding it if new."""
+        index = self._palette_index.get(color)
+        if index is None:
+            if len(self.palette) >= 256:
+                raise ValueError("Particle palette is limited to 256 colors")
+            index = len(self.palette)
+            self.palette.append(color)
+            self._palette_index[color] = index
+        return index
+
+    def spawn(self, x: Coordinates, y: Coordinates, colors: Union[Color, Sequence[Color]], count: int = 1):
+        """Spawn ``count`` particles at each given position in one batch.
+
+        Args:
+            x: X position, or one X per emitter
+            y: Y position, or one Y per emitter
+            colors: One color for all emitters, or one color per emitter
+            count: Particles per emitter
+        """
+        xs, ys = np.broadcast_arrays(np.atleast_1d(np.asarray(x, dtype=np.float32)),
+                                     np.atleast_1d(np.asarray(y, dtype=np.float32)))
+        # Lists, tuples and NumPy arrays alike; tolist() gives plain ints for the palette
+        colors = np.asarray(colors)
+        if colors.ndim == 1 and colors.size:
+            codes = np.full(len(xs), self.color_code(tuple(colors.tolist())), dtype=np.uint8)
+        else:
+            codes = np.array([self.color_code(tuple(color)) for color in colors.tolist()], dtype=np.uint8)
+
+        total = len(xs) * count
+        if total == 0:
+            return
+        xs, ys, codes = np.repeat(xs, count), np.repeat(ys, count), np.repeat(codes, count)
+        if total > self.capacity:
+            # Only the newest particles of an oversized batch fit
+            xs, ys, codes = xs[-self.capacity:], ys[-self.capacity:], codes[-self.capacity:]
+            total = self.capacity
+
+        overflow = self.count + total - self.capacity
+        if overflow > 0:
+            self._evict_oldest(overflow)
+
+        start, end = self.count, self.count + total
+        rng = self.rng
+        self.x[start:end] = xs
+        self.y[start:end] = ys
+        self.vx[start:end] = rng.uniform(*PARTICLE_SPEED_RANGE, total)
+        self.vy[start:end] = rng.uniform(-8, -2, total)  # Initial upward velocity
+        self.size[start:end] = rng.uniform(*PARTICLE_SIZE_RANGE, total)
+        self.life[start:end] = PARTICLE_LIFETIME
+        self.rotation[start:end] = rng.uniform(0, 2 * np.pi, total)
+        self.rotation_speed[start:end] = rng.uniform(-0.2, 0.2, total)
+        self.color_index[start:end] = codes
+        self.count = end
+
+    def update(self):
+        """Advance all particles by one frame and remove dead ones."""
+        n = self.count
+        if n == 0:
+            return
+        x, y, vx, vy, size, life, rotation, rotation_speed = self.data[:, :n]
+        x += vx
+        y += vy
+        vy += PARTICLE_GRAVITY
+        rotation += rotation_speed
+        life -= 1
+        size *= PARTICLE_SHRINK
+
+        dead = np.flatnonzero((life <= 0) | (size <= MIN_PARTICLE_SIZE))
+        if dead.size:
+            self._remove(dead)
+
+    def _evict_oldest(self, amount: int):
+        """Remove the particles with the least life left."""
+        life = self.life[:self.count]
+        if amount >= self.count:
+            self.count = 0
+            return
+        self._remove(np.argpartition(life, amount - 1)[:amount])
+
+    def _remove(self, indices: np.ndarray):
+        """Swap-remove particles by index.
+
+        Args:
+            indices: Distinct live indices to remove
+        """
+        keep = self.count - len(indices)
+        # Holes below the new end are filled by survivors above it
+        holes = indices[indices < keep]
+        if holes.size:
+            removed_tail = np.zeros(len(indices), dtype=bool)
+            removed_tail[indices[indices >= keep] - keep] = True
+            survivors = np.flatnonzero(~removed_tail) + keep
+            self.data[:, holes] = self.data[:, survivors]
+            self.color_index[holes] = self.color_index[survivors]
+        self.count = keep
+
+    def clear(self):
+        """Remove all particles."""
+        self.count = 0
+
+    def colors(self) -> np.ndarray:
+        """Get the RGB color of every live particle as an (n, 3) array."""
+        if not self.palette:
+            return np.zeros((0, 3), dtype=np.uint8)
+        return np.asarray(self.palette, dtype=np.uint8)[self.color_index[:self.count]]
+
+    def alphas(self) -> np.ndarray:
+        """Get the opacity (0-255) of every live particle."""
+        return (255 * self.life[:self.count] / PARTICLE_LIFETIME).astype(np.int32)
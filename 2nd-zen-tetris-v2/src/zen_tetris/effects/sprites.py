@@ -0,0 +1,173 @@
+"""
+Pre-rendered star sprites for particle drawing.
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+from ..constants import COLORS, PARTICLE_SIZE_RANGE, TETROMINO_SHAPES
+
+# Quantization of sprite parameters
+SIZE_STEP = 0.5
+SIZE_BUCKETS = int(math.ceil(PARTICLE_SIZE_RANGE[1] / SIZE_STEP))
+ROTATION_BUCKETS = 8
+ALPHA_LEVELS = 8
+
+# A five-pointed star looks the same every 72 degrees
+STAR_SYMMETRY = 2 * math.pi / 5
+
+# Colors drawn with an extra glow
+GLOW_COLORS = (COLORS['particle_gold'], COLORS['particle_light'])
+
+# Colors of the Tetris golden rain
+TETRIS_GOLDS = (
+    COLORS['particle_gold'],
+    (218, 165, 32),  # Golden rod
+    (184, 134, 11),  # Dark golden rod
+)
+
+# Colors rendered when an atlas is created
+PARTICLE_COLORS = (
+    tuple(COLORS[shape] for shape in TETROMINO_SHAPES) + TETRIS_GOLDS + (COLORS['particle_light'],)
+)
+
+Color = Tuple[int, int, int]
+
+
+def render_star(size: float, rotation: float, color: Color, alpha: int) -> Optional[pygame.Surface]:
+    """Render one particle star on its own transparent surface.
+
+    Args:
+        size: Outer radius; the star is centered at (2 * size, 2 * size)
+        rotation: Rotation in radians
+        color: RGB color tuple
+        alpha: Opacity (0-255)
+
+    Returns:
+        Surface of side int(size * 4), or None if that is empty
+    """
+    surface_size = min(int(size * 4), 200)  # Limit surface size to prevent memory issues
+    if surface_size <= 0:
+        return None
+    center = size * 2
+
+    # Outer and inner star points
+    points = []
+    for i in range(5):
+        angle = rotation + (i * 2 * math.pi) / 5
+        points.append((center + math.cos(angle) * size, center + math.sin(angle) * size))
+        inner_angle = rotation + ((i + 0.5) * 2 * math.pi) / 5
+        points.append((center + math.cos(inner_angle) * size * 0.4,
+                       center + math.sin(inner_angle) * size * 0.4))
+
+    sprite = pygame.Surface((surface_size, surface_size), pygame.SRCALPHA)
+    pygame.draw.polygon(sprite, (*color, alpha), points)
+
+    # Add glow effect for earth-tone particles
+    if color in GLOW_COLORS:
+        glow_points = [(x * 1.5 - size, y * 1.5 - size) for x, y in points]
+        pygame.draw.polygon(sprite, (*color, alpha // 4), glow_points)
+    return sprite
+
+
+class ParticleSpriteAtlas:
+    """Star sprites for quantized (size, rotation, alpha) buckets, per color.
+
+    Each color gets one atlas surface holding every bucket, rendered once.
+    ``rects`` maps (color slot, size, alpha, rotation) bucket indices to the
+    sprite's area in that color's atlas, so whole particle arrays can be
+    looked up at once and drawn with a single ``Surface.blits`` call.
+    """
+
+    def __init__(self, colors: Iterable[Color] = PARTICLE_COLORS):
+        """Render the sprites of the given colors.
+
+        Args:
+            colors: Colors to pre-render; others are rendered on first use
+        """
+        self.surfaces: List[pygame.Surface] = []
+        self.rects = np.zeros((0, SIZE_BUCKETS, ALPHA_LEVELS, ROTATION_BUCKETS, 4), dtype=np.int32)
+        self.slots: Dict[Color, int] = {}
+
+        # Offset from a particle's center to its sprite's top-left corner
+        self.offsets = np.array([2 * SIZE_STEP * (s + 1) for s in range(SIZE_BUCKETS)], dtype=np.float32)
+        for color in colors:
+            self.slot(color)
+
+    def slot(self, color: Color) -> int:
+        """Get the atlas slot of a color, rendering its sprites if needed."""
+        slot = self.slots.get(color)
+        if slot is None:
+            surface, rects = self._render_color(color)
+            slot = len(self.surfaces)
+            self.surfaces.append(surface)
+            self.rects = np.concatenate([self.rects, rects[np.newaxis]])
+            self.slots[color] = slot
+        return slot
+
+    def slots_for(self, palette: Sequence[Color]) -> np.ndarray:
+        """Map a particle palette to atlas slots."""
+        return np.array([self.slot(tuple(color)) for color in palette], dtype=np.intp)
+
+    def _render_color(self, color: Color) -> Tuple[pygame.Surface, np.ndarray]:
+        """Render all buckets of one color into a new atlas surface.
+
+        Rows are (size, alpha) pairs, columns are rotations.
+        """
+        cells = [min(int(SIZE_STEP * (s + 1) * 4), 200) for s in range(SIZE_BUCKETS)]
+        width = max(cells) * ROTATION_BUCKETS
+        height = sum(cells) * ALPHA_LEVELS
+        atlas = pygame.Surface((width, height), pygame.SRCALPHA)
+        rects = np.zeros((SIZE_BUCKETS, ALPHA_LEVELS, ROTATION_BUCKETS, 4), dtype=np.int32)
+
+        y = 0
+        for s, cell in enumerate(cells):
+            size = SIZE_STEP * (s + 1)
+            for a in range(ALPHA_LEVELS):
+                alpha = 255 * (a + 1) // ALPHA_LEVELS
+                for r in range(ROTATION_BUCKETS):
+                    sprite = render_star(size, STAR_SYMMETRY * r / ROTATION_BUCKETS, color, alpha)
+                    x = r * cell
+                    atlas.blit(sprite, (x, y))
+                    rects[s, a, r] = (x, y, cell, cell)
+                y += cell
+
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+        return atlas, rects
+
+    def blit_sequence(self, slots: np.ndarray, x: np.ndarray, y: np.ndarray, size: np.ndarray,
+                      rotation: np.ndarray, alpha: np.ndarray) -> List[tuple]:
+        """Build ``Surface.blits`` arguments for arrays of particles.
+
+        Args:
+            slots: Atlas slot of each particle
+            x: Center X of each particle
+            y: Center Y of each particle
+            size: Outer radius of each particle
+            rotation: Rotation of each particle in radians
+            alpha: Opacity (0-255) of each particle
+
+        Returns:
+            (atlas surface, destination, area) for every visible particle
+        """
+        s = np.clip(np.rint(size / SIZE_STEP).astype(np.intp), 1, SIZE_BUCKETS) - 1
+        a = np.clip((alpha * ALPHA_LEVELS + 254) // 255, 0, ALPHA_LEVELS).astype(np.intp) - 1
+        r = ((rotation % STAR_SYMMETRY) * (ROTATION_BUCKETS / STAR_SYMMETRY)).astype(np.intp) % ROTATION_BUCKETS
+
+        visible = a >= 0
+        if not visible.all():
+            slots, x, y, s, a, r = slots[visible], x[visible], y[visible], s[visible], a[visible], r[visible]
+
+        rects = self.rects[slots, s, a, r]
+        offsets = self.offsets[s]
+        dest_x = (x - offsets).astype(np.int32)
+        dest_y = (y - offsets).astype(np.int32)
+        surfaces = self.surfaces
+        return [
+            (surfaces[slot], (dx, dy), rect)
+            for slot, dx, dy, rect in zip(slots.tolist(), dest_x.tolist(), dest_y.tolist(), rects.tolist())
+        ]
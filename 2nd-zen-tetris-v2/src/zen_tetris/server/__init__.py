@@ -0,0 +1,26 @@
+"""
+Web server support for ZEN Tetris v2: sessions and the shared game loop.
+"""
+
+from .broadcast import Broadcast, Spectator, watch_id
+from .metrics import Histogram, ServerMetrics
+from .protocol import (
+    PROTOCOL_VERSION, BinaryStateEncoder, DeltaStateEncoder, JsonStateEncoder, create_encoder
+)
+from .recording import InputLog, RecordingError, load_recording, replay_recording, verify_recording
+from .routing import HashRing
+from .scheduler import (
+    ABANDONED, ACTIVE, GAME_OVER, IDLE, PAUSED, SESSION_STATES, GameScheduler, GameSession, TickStats
+)
+from .sessions import SessionManager
+from .snapshot import SnapshotError, restore_game, snapshot_game
+from .store import MemoryStore, SqliteStore, create_store
+
+__all__ = [
+    "ABANDONED", "ACTIVE", "GAME_OVER", "IDLE", "PAUSED", "PROTOCOL_VERSION", "SESSION_STATES",
+    "BinaryStateEncoder", "Broadcast", "DeltaStateEncoder", "GameScheduler", "GameSession",
+    "HashRing", "Histogram", "InputLog", "JsonStateEncoder", "MemoryStore", "RecordingError",
+    "ServerMetrics", "SessionManager", "SnapshotError", "Spectator", "SqliteStore", "TickStats",
+    "create_encoder", "create_store", "load_recording", "replay_recording", "restore_game",
+    "snapshot_game", "verify_recording", "watch_id",
+]
@@ -0,0 +1,165 @@
+"""
+Spectator fan-out: many viewers watching one session's game.
+
+Each spectated session has a ``Broadcast`` with one shared encoder per
+wire format in use. The game loop encodes every frame once per format and
+appends the same message object to each spectator's queue; each
+spectator's own send task drains its queue at the pace of its connection.
+
+Queues are bounded. A spectator that falls ``max_queue`` messages behind
+loses its backlog and is resynchronised with a keyframe (a complete
+state) on the next frame, so a slow viewer skips frames instead of
+holding back the game loop or piling up memory.
+"""
+
+import asyncio
+import hashlib
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Union
+
+from .protocol import StateEncoder
+
+# Messages a spectator may fall behind before its backlog is dropped
+SPECTATOR_QUEUE = 8
+
+
+def watch_id(session_id: str) -> str:
+    """Get the public ID spectators use to watch a session.
+
+    A session ID lets its holder resume and play the game, so viewers get
+    a digest of it instead.
+    """
+    return hashlib.blake2b(session_id.encode(), digest_size=8).hexdigest()
+
+
+class Spectator:
+    """One viewer connection: a bounded message queue and its send loop."""
+
+    def __init__(self, send: Callable[[Union[str, bytes]], Awaitable[None]],
+                 max_queue: int = SPECTATOR_QUEUE):
+        """Initialize a spectator.
+
+        Args:
+            send: Coroutine function sending one text or binary message
+            max_queue: Messages queued before the backlog is dropped
+        """
+        self.send = send
+        self.max_queue = max_queue
+        self.closed = False
+        # False until the spectator has a complete state to apply deltas to
+        self.synced = False
+
+        # Counters for diagnostics
+        self.frames_dropped = 0
+
+        self._queue: Deque[Union[str, bytes]] = deque()
+        self._ready = asyncio.Event()
+
+    def offer(self, message: Union[str, bytes]):
+        """Queue a message without waiting; drop the backlog if it is full."""
+        if len(self._queue) >= self.max_queue:
+            # Too slow: forget the backlog and resynchronise from a keyframe
+            self.frames_dropped += len(self._queue)
+            self._queue.clear()
+            self.synced = False
+            return
+        self._queue.append(message)
+        self._ready.set()
+
+    async def send_loop(self):
+        """Deliver queued messages until closed."""
+        try:
+            while not self.closed:
+                await self._ready.wait()
+                self._ready.clear()
+                while self._queue and not self.closed:
+                    await self.send(self._queue.popleft())
+        except Exception:
+            # The connection is gone; the receiver task reports the disconnect
+            self.close()
+
+    def close(self):
+        """Stop the send loop."""
+        self.closed = True
+        self._ready.set()
+
+
+class _Channel:
+    """Spectators of one session using one wire format."""
+
+    def __init__(self, encoder: StateEncoder):
+        self.encoder = encoder
+        self.spectators: List[Spectator] = []
+
+    def publish(self, game):
+        """Encode the game's frame once and queue it for every spectator."""
+        message = self.encoder.encode(game)
+        keyframe = None
+        for spectator in self.spectators:
+            if spectator.synced:
+                if message is not None:
+                    spectator.offer(message)
+                continue
+            if keyframe is None:
+                keyframe = self.encoder.keyframe()
+                if keyframe is None:
+                    continue
+            spectator.synced = True
+            spectator.offer(keyframe)
+
+
+class Broadcast:
+    """Fans one session's frames out to its spectators."""
+
+    def __init__(self):
+        """Initialize a broadcast without spectators."""
+        self._channels: Dict[str, _Channel] = {}
+
+    def __len__(self) -> int:
+        return sum(len(channel.spectators) for channel in self._channels.values())
+
+    def subscribe(self, spectator: Spectator, encoder: StateEncoder):
+        """Add a spectator.
+
+        Args:
+            spectator: The new viewer
+            encoder: Shared encoder (``create_encoder(..., shared=True)``) for
+                the viewer's format; used only if no spectator has that format yet
+        """
+        channel = self._channels.get(encoder.format)
+        if channel is None:
+            channel = self._channels[encoder.format] = _Channel(encoder)
+        greeting = channel.encoder.greeting()
+        if greeting is not None:
+            spectator.offer(greeting)
+        channel.spectators.append(spectator)
+
+    def unsubscribe(self, spectator: Spectator) -> bool:
+        """Remove a spectator.
+
+        Returns:
+            False if it was not subscribed
+        """
+        for wire_format, channel in list(self._channels.items()):
+            if spectator in channel.spectators:
+                channel.spectators.remove(spectator)
+                if not channel.spectators:
+                    del self._channels[wire_format]
+                return True
+        return False
+
+    def publish(self, game):
+        """Send the game's current frame to every spectator."""
+        for channel in self._channels.values():
+            channel.publish(game)
+
+    @property
+    def unsynced(self) -> bool:
+        """Whether some spectator is waiting for a keyframe."""
+        return any(not spectator.synced for channel in self._channels.values()
+                   for spectator in channel.spectators)
+
+    @property
+    def spectators(self) -> List[Spectator]:
+        """All spectators, of every format."""
+        return [spectator for channel in self._channels.values() for spectator in channel.spectators]
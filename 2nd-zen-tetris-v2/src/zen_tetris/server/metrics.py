@@ -0,0 +1,233 @@
+"""
+Server metrics in the Prometheus text exposition format.
+
+Histograms are plain bucket counters updated in place, so observing a
+value costs a bisect and two additions. The game loop only observes once
+per iteration plus one sampled game update per tick; everything that can
+be read from existing counters (tick stats, queue depths, session
+message counts) is collected when the metrics are scraped instead.
+"""
+
+import bisect
+import time
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Content type of the text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bucket upper bounds
+SECONDS_BUCKETS = (0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025,
+                   0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+BYTES_BUCKETS = (32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+DEPTH_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+# GameSession counters reported as server-wide totals
+SESSION_COUNTERS = ("inputs_dropped", "frames_skipped", "messages_sent", "bytes_sent")
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels) -> str:
+    """Format labels as ``{name="value",...}`` (empty for none)."""
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value."""
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+class Histogram:
+    """Counts observations in fixed buckets, like a Prometheus histogram."""
+
+    def __init__(self, buckets: Sequence[float], labels: Labels = ()):
+        """Initialize an empty histogram.
+
+        Args:
+            buckets: Increasing bucket upper bounds (+Inf is added)
+            labels: Label names and values of this series
+        """
+        self.bounds = list(buckets)
+        self.labels = labels
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """Record one observation."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self) -> int:
+        """Number of observations."""
+        return sum(self.counts)
+
+    def samples(self, name: str) -> Iterable[str]:
+        """Get the exposition lines of this series."""
+        total = 0
+        for bound, count in zip(self.bounds + ["+Inf"], self.counts):
+            total += count
+            labels = self.labels + (("le", str(bound)),)
+            yield f"{name}_bucket{_format_labels(labels)} {total}"
+        labels = _format_labels(self.labels)
+        yield f"{name}_sum{labels} {_format_value(self.sum)}"
+        yield f"{name}_count{labels} {total}"
+
+
+class _Family:
+    """Exposition lines of one metric name."""
+
+    def __init__(self, name: str, kind: str, help: str):
+        self.name = name
+        self.lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+
+    def add(self, value: float, labels: Labels = ()):
+        """Add a counter or gauge sample."""
+        self.lines.append(f"{self.name}{_format_labels(labels)} {_format_value(value)}")
+
+    def add_histogram(self, histogram: Histogram):
+        """Add a histogram series."""
+        self.lines.extend(histogram.samples(self.name))
+
+
+class ServerMetrics:
+    """Histograms filled by the game loop and sessions of one server.
+
+    Attributes:
+        update_seconds: Duration of one game update, sampled one game per tick
+        loop_work_seconds: Ticking and publishing time per loop iteration
+        loop_lateness_seconds: How late each loop iteration started
+        input_queue_depth: Queued inputs applied in one tick, on ticks with input
+        send_seconds: Time to hand one message to the websocket
+    """
+
+    def __init__(self):
+        """Initialize empty histograms."""
+        self.update_seconds = Histogram(SECONDS_BUCKETS)
+        self.loop_work_seconds = Histogram(SECONDS_BUCKETS)
+        self.loop_lateness_seconds = Histogram(SECONDS_BUCKETS)
+        self.input_queue_depth = Histogram(DEPTH_BUCKETS)
+        self.send_seconds = Histogram(SECONDS_BUCKETS)
+        self.encode_seconds: Dict[str, Histogram] = {}
+        self.message_bytes: Dict[str, Histogram] = {}
+
+        # Counters of sessions and spectators that have left, so totals never go down
+        self.retired: Dict[str, int] = dict.fromkeys(SESSION_COUNTERS, 0)
+        self.spectator_frames_dropped = 0
+
+    def retire(self, session):
+        """Keep the counters of a session that stops being ticked."""
+        for name in SESSION_COUNTERS:
+            self.retired[name] += getattr(session, name)
+
+    def observe_encode(self, wire_format: str, seconds: float, message):
+        """Record building and serializing one state message.
+
+        Args:
+            wire_format: Encoder format name, e.g. "delta"
+            seconds: Time spent encoding
+            message: The encoded message, or None if nothing was sent
+        """
+        histogram = self.encode_seconds.get(wire_format)
+        if histogram is None:
+            labels = (("format", wire_format),)
+            histogram = self.encode_seconds[wire_format] = Histogram(SECONDS_BUCKETS, labels)
+            self.message_bytes[wire_format] = Histogram(BYTES_BUCKETS, labels)
+        histogram.observe(seconds)
+        if message is not None:
+            self.message_bytes[wire_format].observe(len(message))
+
+    def render(self, scheduler, manager=None) -> str:
+        """Get all metrics in the text exposition format.
+
+        Args:
+            scheduler: GameScheduler whose loop and sessions are reported
+            manager: SessionManager whose counters are reported, if any
+
+        Returns:
+            The exposition text, ending with a newline
+        """
+        families: List[_Family] = []
+
+        def family(name: str, kind: str, help: str) -> _Family:
+            families.append(_Family(f"zen_tetris_{name}", kind, help))
+            return families[-1]
+
+        def histogram(name: str, help: str, *series: Histogram):
+            metric = family(name, "histogram", help)
+            for item in series:
+                metric.add_histogram(item)
+
+        stats = scheduler.stats
+        family("ticks_total", "counter", "Game loop ticks run.").add(stats.ticks)
+        family("catch_up_ticks_total", "counter", "Extra ticks run to make up for a late loop.").add(
+            stats.catch_up_ticks)
+        family("dropped_ticks_total", "counter", "Ticks abandoned because the loop fell too far behind.").add(
+            stats.dropped_ticks)
+        family("loop_overruns_total", "counter", "Loop iterations whose work exceeded the tick interval.").add(
+            stats.overruns)
+        family("tick_rate_target_hz", "gauge", "Ticks per second, lowered under load when adaptive.").add(
+            1 / stats.interval)
+        family("tick_rate_changes_total", "counter", "Times the adaptive tick rate moved.").add(
+            stats.rate_changes)
+        family("game_seconds_total", "counter", "Game time advanced by the loop.").add(stats.game_seconds)
+        histogram("game_update_seconds", "Duration of one game update (one game sampled per tick).",
+                  self.update_seconds)
+        histogram("loop_work_seconds", "Ticking and publishing time per loop iteration.",
+                  self.loop_work_seconds)
+        histogram("loop_lateness_seconds", "Delay of each loop iteration past its deadline.",
+                  self.loop_lateness_seconds)
+
+        sessions = list(scheduler.sessions.values())
+        depths = [session.inputs.qsize() for session in sessions]
+        family("sessions", "gauge", "Sessions ticked by the game loop.").add(len(sessions))
+        states = family("sessions_by_state", "gauge", "Sessions in each lifecycle state.")
+        for state, count in scheduler.state_counts().items():
+            states.add(count, (("state", state),))
+        family("input_queue_depth", "gauge", "Inputs waiting for the next tick, over all sessions.").add(
+            sum(depths))
+        family("input_queue_depth_max", "gauge", "Most inputs waiting in one session.").add(
+            max(depths, default=0))
+        histogram("input_batch_size", "Queued inputs applied to a game in one tick, on ticks with input.",
+                  self.input_queue_depth)
+
+        def total(name: str, help: str, counter: str):
+            family(name, "counter", help).add(
+                self.retired[counter] + sum(getattr(session, counter) for session in sessions))
+
+        total("inputs_dropped_total", "Inputs dropped because a session's queue was full.", "inputs_dropped")
+        total("frames_skipped_total", "States replaced before a slow client received them.", "frames_skipped")
+        total("messages_sent_total", "Messages sent to all clients.", "messages_sent")
+        total("bytes_sent_total", "Bytes sent to all clients.", "bytes_sent")
+
+        histogram("state_encode_seconds", "Time to build and serialize one state message.",
+                  *self.encode_seconds.values())
+        histogram("state_message_bytes", "Size of sent state messages.", *self.message_bytes.values())
+        histogram("send_seconds", "Time to hand one message to the websocket.", self.send_seconds)
+
+        spectators = [spectator for broadcast in scheduler.broadcasts.values()
+                      for spectator in broadcast.spectators]
+        family("spectators", "gauge", "Connected spectators.").add(len(spectators))
+        family("spectated_sessions", "gauge", "Sessions with at least one spectator.").add(
+            len(scheduler.broadcasts))
+        family("spectator_frames_dropped_total", "counter",
+               "Messages dropped from the queues of spectators that fell behind.").add(
+            self.spectator_frames_dropped + sum(spectator.frames_dropped for spectator in spectators))
+
+        if manager is not None:
+            family("sessions_resumed_total", "counter", "Sessions resumed from a live game or a snapshot.").add(
+                manager.resumed)
+            family("snapshots_saved_total", "counter", "Session snapshots written to the store.").add(
+                manager.snapshots_saved)
+            family("sessions_evicted_total", "counter", "Sessions evicted after going without input.").add(
+                manager.evicted)
+
+        family("process_cpu_seconds_total", "counter", "CPU time used by the server process.").add(
+            time.process_time())
+
+        return "".join(line + "\n" for metric in families for line in metric.lines)
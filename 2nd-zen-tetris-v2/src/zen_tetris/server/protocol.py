@@ -0,0 +1,458 @@
+"""
+Game state encoders for the websocket protocol.
+
+Protocol 1 sends the full ``get_state`` dict every frame. Protocol 2 sends
+a snapshot when the client connects and afterwards only what changed:
+
+    {"type": "snapshot", "v": 2, "frame": 1, "palette": [...], "pieces": {...},
+     "board": ["0000000000", ...], "piece": ["T", 0, 3, 0], "next": "I",
+     "score": 0, "lines": 0, "level": 1, "game_over": false, "paused": false,
+     "flash": []}
+    {"type": "delta", "v": 2, "frame": 7, "rows": [[19, "1111000000"]],
+     "piece": ["I", 0, 3, 0], "score": 100,
+     "events": [{"type": "line_clear", "rows": [19], "colors": ["1111222333"],
+                 "seed": 2471337}]}
+
+Board rows are strings of hex digits, one palette index per cell (0 is
+empty). A delta only carries keys whose values changed; frames where
+nothing changed produce no message at all.
+
+With ``format=binary`` the client instead receives a JSON ``hello`` with
+the palette and piece tables, then one binary message per changed frame
+carrying the full protocol 1 state (see ``BinaryStateEncoder``).
+
+Spectators watch a session through encoders created with ``shared=True``:
+one such encoder serves every spectator of a session using its format, so
+each frame is encoded once, and it reads the game's events without taking
+them from the player's own encoder. ``keyframe()`` gives a spectator who
+joins or falls behind a complete state to continue the stream from.
+
+No protocol carries particles. Every effect event has a ``seed`` from
+which the browser simulates the burst, so the server keeps no particle
+state and all clients draw the same effect.
+"""
+
+import json
+import struct
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ..constants import BOARD_WIDTH, BOARD_HEIGHT, COLORS
+from ..core.pieces import ROTATIONS, SHAPE_TYPES
+
+PROTOCOL_VERSION = 2
+
+# Protocol palette: index 0 is empty, then one color per shape type, then effect colors
+PALETTE: List[Optional[Tuple[int, int, int]]] = (
+    [None] + [COLORS[shape] for shape in SHAPE_TYPES] + [(255, 215, 0)]
+)
+PALETTE_INDEX: Dict[Tuple[int, int, int], int] = {
+    color: index for index, color in enumerate(PALETTE) if color is not None
+}
+
+_HEX_DIGITS = b"0123456789abcdef"
+
+# Top-level fields compared between frames, in message order
+STATE_FIELDS = ("piece", "next", "score", "lines", "level", "game_over", "paused", "flash")
+
+
+# Binary frame layout (little-endian):
+#   header:    format version u8, flags u8 (1 = game over, 2 = paused), score u32,
+#              lines u32, level u16, piece shape u8 (0 = none), rotation u8, x i8, y i8,
+#              next shape u8, flashing rows u32 (bit y set)
+#   board:     BOARD_WIDTH * BOARD_HEIGHT 4-bit palette indices, two cells per byte,
+#              low nibble first, row by row
+#   events:    count u8, then per event: type u8 (EVENT_CODES), seed u32, row count u8,
+#              and per row: y u8 followed by the row's cells packed like the board
+BINARY_FORMAT_VERSION = 3
+BINARY_HEADER = struct.Struct('<BBIIHBBbbBI')
+EVENT_RECORD = struct.Struct('<BIB')
+EVENT_CODES = {"line_clear": 1, "tetris": 2}
+
+# Largest score a binary frame can carry; higher scores are sent as this
+_MAX_SCORE = 0xFFFFFFFF
+
+# Bytes of a binary frame before its event records
+_STATE_BYTES = BINARY_HEADER.size + BOARD_WIDTH * BOARD_HEIGHT // 2
+
+# Shape index in binary frames: 0 for none, else the shape's palette index
+_SHAPE_CODES = {shape: index + 1 for index, shape in enumerate(SHAPE_TYPES)}
+
+# Moves a nibble into the high half of a byte
+_HIGH_NIBBLE = bytes((value << 4) & 0xFF for value in range(256))
+
+
+def _palette_index(color: Optional[Tuple[int, int, int]]) -> int:
+    """Get the protocol palette index for a color (0 for empty or unknown)."""
+    if color is None:
+        return 0
+    return PALETTE_INDEX.get(color, 0)
+
+
+def _color_code(color: Optional[Tuple[int, int, int]]) -> int:
+    """Get the hex digit byte for a cell color."""
+    return _HEX_DIGITS[_palette_index(color)]
+
+
+def _pack_nibbles(cells: bytes) -> bytes:
+    """Pack palette indices two per byte, low nibble first."""
+    # OR the even cells with the odd cells shifted into the high nibble
+    low = int.from_bytes(cells[0::2], 'little')
+    high = int.from_bytes(cells[1::2].translate(_HIGH_NIBBLE), 'little')
+    return (low | high).to_bytes(len(cells) // 2, 'little')
+
+
+class _CellTranslator:
+    """Maps a board's cells to one byte per cell via protocol palette indices."""
+
+    def __init__(self, codes: bytes):
+        """Initialize the translator.
+
+        Args:
+            codes: Output byte for each protocol palette index
+        """
+        self.codes = codes
+        self._table: Optional[bytes] = None
+        self._palette_size = 0
+
+    def cells(self, board) -> bytes:
+        """Get BOARD_WIDTH * BOARD_HEIGHT codes, row by row.
+
+        Args:
+            board: BitBoard or list-based Board
+        """
+        colors = getattr(board, 'colors', None)
+        if colors is None:
+            return bytes(self.codes[_palette_index(cell)] for row in board.grid for cell in row)
+
+        # BitBoard palette indices are per board, so translate them with a table
+        palette = board.palette
+        if self._table is None or self._palette_size != len(palette):
+            table = bytearray(self.codes[:1] * 256)
+            for index, color in enumerate(palette):
+                table[index] = self.codes[_palette_index(color)]
+            self._table = bytes(table)
+            self._palette_size = len(palette)
+        return colors.translate(self._table)
+
+
+def _piece_tables() -> Dict[str, List[Tuple[Tuple[int, int], ...]]]:
+    """Get block offsets of every rotation, for clients to draw pieces."""
+    return {shape: [state.blocks for state in ROTATIONS[shape]] for shape in SHAPE_TYPES}
+
+
+class _EventReader:
+    """Hands a game's new effect events to one encoder.
+
+    A player's encoder drains ``game.events``. A shared encoder only reads
+    the events emitted since its last call (counted by the game's
+    ``event_count``) and leaves the queue to the player's encoder; the game
+    loop encodes spectator frames before the player's send loop runs, so no
+    event is drained before every reader has seen it. A restarted game has
+    a new queue whose count starts again from zero.
+    """
+
+    def __init__(self, shared: bool):
+        """Initialize the reader.
+
+        Args:
+            shared: Read without draining the queue
+        """
+        self.shared = shared
+        self._seen: Optional[int] = None
+        self._queue = None
+
+    def take(self, game) -> List[Dict[str, Any]]:
+        """Get the events this encoder has not seen yet."""
+        events = game.events
+        if not self.shared:
+            taken = list(events)
+            events.clear()
+            return taken
+        total = game.event_count
+        if self._seen is None:
+            new = 0
+        elif events is not self._queue or total < self._seen:
+            # The game restarted since the last call: everything queued is new
+            new = min(total, len(events))
+        else:
+            new = min(total - self._seen, len(events))
+        self._seen = total
+        self._queue = events
+        return list(events)[len(events) - new:] if new else []
+
+
+def _encode_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert cell colors in a game event to hex palette strings."""
+    if "colors" not in event:
+        return event
+    return {**event, "colors": [bytes(_color_code(color) for color in row).decode()
+                                for row in event["colors"]]}
+
+
+class JsonStateEncoder:
+    """Protocol 1: the full ``get_state`` dict as JSON every frame."""
+
+    format = "json"
+    version = 1
+
+    def __init__(self, shared: bool = False):
+        """Initialize the encoder.
+
+        Args:
+            shared: Serve spectators (see the module docstring)
+        """
+        self._events = _EventReader(shared)
+        self._state: Optional[Dict[str, Any]] = None
+
+    def greeting(self) -> Optional[str]:
+        """Get a message to send before the first state, if any."""
+        return None
+
+    def encode(self, game) -> Optional[str]:
+        """Encode the current state of a game, including pending events."""
+        state = game.get_state()
+        state["events"] = self._events.take(game)
+        self._state = state
+        return json.dumps(state)
+
+    def keyframe(self) -> Optional[str]:
+        """Get the last encoded state without its events, or None."""
+        if self._state is None:
+            return None
+        return json.dumps({**self._state, "events": []})
+
+
+class DeltaStateEncoder:
+    """Protocol 2: a snapshot followed by per-frame deltas.
+
+    One encoder belongs to one client. Each call compares the game against
+    what this encoder last sent, so frames skipped by a slow connection are
+    folded into the next delta.
+    """
+
+    format = "delta"
+    version = PROTOCOL_VERSION
+
+    def __init__(self, shared: bool = False):
+        """Initialize an encoder that has sent nothing yet.
+
+        Args:
+            shared: Serve spectators (see the module docstring)
+        """
+        self.frame = 0
+        self._rows: Optional[List[str]] = None
+        self._fields: Dict[str, Any] = {}
+        self._cells = _CellTranslator(_HEX_DIGITS)
+        self._events = _EventReader(shared)
+
+    def greeting(self) -> Optional[str]:
+        """Get a message to send before the first state, if any."""
+        return None
+
+    def board_rows(self, board) -> List[str]:
+        """Encode each board row as hex palette indices.
+
+        Args:
+            board: BitBoard or list-based Board
+
+        Returns:
+            One string of BOARD_WIDTH hex digits per row
+        """
+        encoded = self._cells.cells(board).decode()
+        return [encoded[y * BOARD_WIDTH:(y + 1) * BOARD_WIDTH] for y in range(BOARD_HEIGHT)]
+
+    def state_fields(self, game) -> Dict[str, Any]:
+        """Collect the compared top-level fields of a game."""
+        piece = game.current_tetromino
+        return {
+            "piece": None if piece is None or game.game_over
+            else [piece.shape_type, piece.rotation, piece.x, piece.y],
+            "next": game.next_tetromino.shape_type if game.next_tetromino else None,
+            "score": game.score,
+            "lines": game.lines_cleared,
+            "level": game.level,
+            "game_over": game.game_over,
+            "paused": game.paused,
+            "flash": list(game.flash_lines) if game.flash_timer > 0 else [],
+        }
+
+    def snapshot(self, game) -> Dict[str, Any]:
+        """Build a full snapshot and make it the new delta baseline."""
+        self._events.take(game)
+        self._rows = self.board_rows(game.board)
+        self._fields = self.state_fields(game)
+        self.frame += 1
+        return self._baseline()
+
+    def _baseline(self) -> Dict[str, Any]:
+        """Get the last sent state as a snapshot message."""
+        return {
+            "type": "snapshot",
+            "v": PROTOCOL_VERSION,
+            "frame": self.frame,
+            "palette": PALETTE,
+            "pieces": _piece_tables(),
+            "board": self._rows,
+            **self._fields,
+        }
+
+    def delta(self, game) -> Optional[Dict[str, Any]]:
+        """Build a delta against the last message, or None if nothing changed."""
+        message: Dict[str, Any] = {}
+
+        rows = self.board_rows(game.board)
+        previous_rows = self._rows
+        changed = [[y, row] for y, row in enumerate(rows) if row != previous_rows[y]]
+        if changed:
+            message["rows"] = changed
+            self._rows = rows
+
+        fields = self.state_fields(game)
+        previous = self._fields
+        for name in STATE_FIELDS:
+            if fields[name] != previous[name]:
+                message[name] = fields[name]
+        self._fields = fields
+
+        events = self._events.take(game)
+        if events:
+            message["events"] = [_encode_event(event) for event in events]
+
+        if not message:
+            return None
+        self.frame += 1
+        return {"type": "delta", "v": PROTOCOL_VERSION, "frame": self.frame, **message}
+
+    def encode(self, game) -> Optional[str]:
+        """Encode the next message for a game, or None if nothing changed."""
+        message = self.snapshot(game) if self._rows is None else self.delta(game)
+        if message is None:
+            return None
+        return json.dumps(message, separators=(",", ":"))
+
+    def keyframe(self) -> Optional[str]:
+        """Get a snapshot of the last sent state, or None before the first.
+
+        Deltas encoded afterwards apply on top of it.
+        """
+        if self._rows is None:
+            return None
+        return json.dumps(self._baseline(), separators=(",", ":"))
+
+
+class BinaryStateEncoder:
+    """Protocol 1 state packed into a fixed binary layout.
+
+    Every changed frame is one binary message holding the whole state; a
+    frame identical to the previous one is not sent. Palette and piece
+    tables travel once in the JSON greeting.
+    """
+
+    format = "binary"
+    version = 1
+
+    def __init__(self, shared: bool = False):
+        """Initialize an encoder that has sent nothing yet.
+
+        Args:
+            shared: Serve spectators (see the module docstring)
+        """
+        self._events = _EventReader(shared)
+        self._cells = _CellTranslator(bytes(range(16)))
+        self._last_cells: Optional[bytes] = None
+        self._packed_board = b""
+        self._last_frame: Optional[bytes] = None
+
+    def greeting(self) -> Optional[str]:
+        """Get the JSON hello describing the binary frames."""
+        return json.dumps({
+            "type": "hello",
+            "format": "binary",
+            "binary_version": BINARY_FORMAT_VERSION,
+            "palette": PALETTE,
+            "pieces": _piece_tables(),
+            "board": [BOARD_WIDTH, BOARD_HEIGHT],
+        }, separators=(",", ":"))
+
+    def pack_board(self, board) -> bytes:
+        """Pack the board into 4-bit palette indices."""
+        cells = self._cells.cells(board)
+        if cells != self._last_cells:
+            self._packed_board = _pack_nibbles(cells)
+            self._last_cells = cells
+        return self._packed_board
+
+    def frame(self, game, events: Optional[List[Dict[str, Any]]] = None) -> bytes:
+        """Pack the current state of a game into one binary frame.
+
+        Args:
+            game: Game to pack
+            events: Effect events to include (the game's pending events by default)
+        """
+        piece = game.current_tetromino
+        if piece is None or game.game_over:
+            shape, rotation, x, y = 0, 0, 0, 0
+        else:
+            shape, rotation, x, y = _SHAPE_CODES[piece.shape_type], piece.rotation, piece.x, piece.y
+        next_piece = game.next_tetromino
+        flash = 0
+        if game.flash_timer > 0:
+            for line in game.flash_lines:
+                flash |= 1 << line
+
+        header = BINARY_HEADER.pack(
+            BINARY_FORMAT_VERSION,
+            (1 if game.game_over else 0) | (2 if game.paused else 0),
+            min(game.score, _MAX_SCORE), game.lines_cleared, game.level,
+            shape, rotation, x, y,
+            _SHAPE_CODES[next_piece.shape_type] if next_piece else 0,
+            flash,
+        )
+
+        events = [event for event in (game.events if events is None else events)
+                  if event["type"] in EVENT_CODES]
+        records = bytearray((len(events),))
+        for event in events:
+            rows = event.get("rows", ())
+            records += EVENT_RECORD.pack(EVENT_CODES[event["type"]], event["seed"], len(rows))
+            for y, colors in zip(rows, event.get("colors", ())):
+                records.append(y)
+                records += _pack_nibbles(bytes(_palette_index(color) for color in colors))
+        return header + self.pack_board(game.board) + records
+
+    def encode(self, game) -> Optional[bytes]:
+        """Encode the current frame, or None if it matches the last one."""
+        frame = self.frame(game, self._events.take(game))
+        if frame == self._last_frame:
+            return None
+        self._last_frame = frame
+        return frame
+
+    def keyframe(self) -> Optional[bytes]:
+        """Get the last encoded frame without its events, or None."""
+        if self._last_frame is None:
+            return None
+        return self._last_frame[:_STATE_BYTES] + b"\x00"
+
+
+StateEncoder = Union[JsonStateEncoder, DeltaStateEncoder, BinaryStateEncoder]
+
+
+def create_encoder(version: Optional[str], format: Optional[str] = None,
+                   shared: bool = False) -> StateEncoder:
+    """Get the encoder for the protocol requested by a client.
+
+    Args:
+        version: Value of the ``v`` query parameter, or None
+        format: Value of the ``format`` query parameter, or None
+        shared: Create an encoder serving spectators
+
+    Returns:
+        BinaryStateEncoder for format "binary", DeltaStateEncoder for
+        version "2", otherwise JsonStateEncoder
+    """
+    if format == "binary":
+        return BinaryStateEncoder(shared)
+    if version == str(PROTOCOL_VERSION):
+        return DeltaStateEncoder(shared)
+    return JsonStateEncoder(shared)
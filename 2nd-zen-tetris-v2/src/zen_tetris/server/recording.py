@@ -0,0 +1,162 @@
+"""
+Input recordings of web games and their headless replay.
+
+A game is fully determined by its starting point and the actions applied
+before each substep: pieces and effect seeds come from seeded random
+streams and every substep advances the same fixed time, whatever rate the
+server ticked the game at. A recording is therefore
+just a seed (or, for a resumed game, the snapshot it resumed from) plus
+(frame, action) pairs. Replaying runs the substeps back to back without a
+clock, thousands of times faster than real time, and must end with the
+recorded result.
+
+Recordings are JSON files:
+
+    {"version": 1, "session": "...", "seed": 2471337, "snapshot": null,
+     "tick_ms": 16.666666666666668, "frames": 5400,
+     "inputs": [[12, "move_left"], [40, "hard_drop"], ...],
+     "result": {"score": 300, "lines": 3, "level": 1, "pieces": 41, "game_over": false}}
+
+``snapshot`` is base64 of ``snapshot_game`` bytes when set.
+"""
+
+import base64
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from ..constants import FPS
+from ..web_game import WebZenTetrisGame
+from .snapshot import restore_game
+
+RECORDING_VERSION = 1
+
+
+class RecordingError(ValueError):
+    """Raised when a file cannot be read as a recording."""
+
+
+class InputLog:
+    """Actions applied to one game, by frame, from a known start.
+
+    Attach it as a game's ``input_log`` and the game records every action
+    it handles against its substep counter.
+    """
+
+    def __init__(self, seed: Optional[int] = None, snapshot: Optional[bytes] = None,
+                 tick_ms: float = 1000.0 / FPS):
+        """Initialize an empty log.
+
+        Args:
+            seed: Seed the game was created with
+            snapshot: Snapshot the game was restored from, instead of a seed
+            tick_ms: Game time per substep (``frame``) in milliseconds
+        """
+        self.seed = seed
+        self.snapshot = snapshot
+        self.tick_ms = tick_ms
+        self.inputs: List[Tuple[int, str]] = []
+
+    def record(self, frame: int, action: str):
+        """Record an action handled before substep ``frame`` ran."""
+        self.inputs.append((frame, action))
+
+    def to_dict(self, game: WebZenTetrisGame, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get the recording of a game played with this log.
+
+        Args:
+            game: The recorded game, in its final state
+            session_id: Session the game belonged to, if any
+        """
+        return {
+            "version": RECORDING_VERSION,
+            "session": session_id,
+            "seed": self.seed,
+            "snapshot": base64.b64encode(self.snapshot).decode() if self.snapshot else None,
+            "tick_ms": self.tick_ms,
+            "frames": game.frame,
+            "inputs": [list(entry) for entry in self.inputs],
+            "result": game_result(game),
+        }
+
+
+def game_result(game: WebZenTetrisGame) -> Dict[str, Any]:
+    """Get the values a replay must reproduce."""
+    return {
+        "score": game.score,
+        "lines": game.lines_cleared,
+        "level": game.level,
+        "pieces": game.pieces_placed,
+        "game_over": game.game_over,
+    }
+
+
+def save_recording(path: str, recording: Dict[str, Any]):
+    """Write a recording, creating its directory if needed."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(recording, f, separators=(",", ":"))
+
+
+def load_recording(path: str) -> Dict[str, Any]:
+    """Read a recording.
+
+    Raises:
+        RecordingError: If the file is not a recording this version can replay
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            recording = json.load(f)
+    except ValueError as e:
+        raise RecordingError(f"{path} is not valid JSON: {e}") from e
+    if not isinstance(recording, dict) or recording.get("version") != RECORDING_VERSION:
+        raise RecordingError(f"{path} is not a version {RECORDING_VERSION} recording")
+    return recording
+
+
+def replay_recording(recording: Dict[str, Any],
+                     game_class: Type[WebZenTetrisGame] = WebZenTetrisGame) -> WebZenTetrisGame:
+    """Re-simulate a recorded game as fast as possible.
+
+    Args:
+        recording: Recording from ``InputLog.to_dict`` or ``load_recording``
+        game_class: Class of the game to simulate
+
+    Returns:
+        The game after the last recorded tick
+    """
+    if recording["snapshot"]:
+        game = restore_game(base64.b64decode(recording["snapshot"]), game_class)
+    else:
+        game = game_class(recording["seed"])
+
+    tick_ms = recording["tick_ms"]
+    inputs = recording["inputs"]
+    count = len(inputs)
+    index = 0
+    tick = game.tick
+    handle_input = game.handle_input
+    for frame in range(recording["frames"]):
+        while index < count and inputs[index][0] == frame:
+            handle_input(inputs[index][1])
+            index += 1
+        tick(tick_ms)
+    # Inputs handled after the last tick
+    for _, action in inputs[index:]:
+        handle_input(action)
+    return game
+
+
+def verify_recording(recording: Dict[str, Any],
+                     game_class: Type[WebZenTetrisGame] = WebZenTetrisGame) -> List[str]:
+    """Replay a recording and compare the result with the recorded one.
+
+    Returns:
+        Descriptions of the values that differ (empty when the replay matches)
+    """
+    result = game_result(replay_recording(recording, game_class))
+    expected = recording["result"]
+    return [f"{name}: recorded {expected[name]}, replayed {result[name]}"
+            for name in result if result[name] != expected.get(name)]
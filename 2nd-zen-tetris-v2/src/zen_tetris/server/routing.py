@@ -0,0 +1,80 @@
+"""
+Consistent hashing of session IDs to worker processes.
+"""
+
+import bisect
+import hashlib
+from typing import Iterable, List, Set, Tuple
+
+# Ring positions per worker; more spread sessions more evenly
+DEFAULT_REPLICAS = 64
+
+
+def _position(key: str) -> int:
+    """Hash a string to a 64-bit ring position.
+
+    ``hash()`` is salted per process, so workers would disagree; a fixed
+    digest gives every process the same ring.
+    """
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'big')
+
+
+class HashRing:
+    """Maps keys to nodes so adding or removing a node moves few keys.
+
+    Each node owns ``replicas`` points on a ring of 64-bit hashes; a key
+    belongs to the node owning the first point at or after the key's hash.
+    Removing a node only moves the keys it owned, and adding one only
+    takes keys from its neighbours.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = DEFAULT_REPLICAS):
+        """Initialize the ring.
+
+        Args:
+            nodes: Initial node names (e.g. worker URLs)
+            replicas: Ring positions per node
+        """
+        self.replicas = replicas
+        self._nodes: Set[str] = set()
+        self._points: List[Tuple[int, str]] = []
+        self._positions: List[int] = []
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> List[str]:
+        """Nodes on the ring, sorted."""
+        return sorted(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._nodes
+
+    def add(self, node: str):
+        """Add a node (no effect if it is already on the ring)."""
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for replica in range(self.replicas):
+            bisect.insort(self._points, (_position(f"{node}#{replica}"), node))
+        self._positions = [position for position, _ in self._points]
+
+    def remove(self, node: str):
+        """Remove a node; its keys move to the following points."""
+        self._nodes.discard(node)
+        self._points = [point for point in self._points if point[1] != node]
+        self._positions = [position for position, _ in self._points]
+
+    def node_for(self, key: str) -> str:
+        """Get the node owning a key.
+
+        Raises:
+            LookupError: If the ring is empty
+        """
+        if not self._points:
+            raise LookupError("HashRing has no nodes")
+        index = bisect.bisect_left(self._positions, _position(key))
+        return self._points[index % len(self._points)][1]
@@ -0,0 +1,488 @@
+"""
+Fixed-timestep game loop shared by all web sessions.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Union
+
+from ..constants import FPS
+from ..web_game import WebZenTetrisGame
+from .broadcast import Broadcast, Spectator, watch_id
+from .metrics import ServerMetrics
+from .protocol import JsonStateEncoder, StateEncoder
+
+# Inputs buffered per session before new ones are dropped
+MAX_PENDING_INPUTS = 64
+
+# Most ticks simulated in one loop iteration when the loop falls behind
+MAX_CATCH_UP_TICKS = 5
+
+# Share of wall time the process may spend on the CPU before the tick rate drops
+HIGH_LOAD = 0.8
+
+# The tick rate goes back up only if the load, scaled to the faster rate, stays below this
+LOW_LOAD = 0.5
+
+# Seconds of load measured for each tick rate decision
+ADAPT_WINDOW = 2.0
+
+# Session lifecycle states (GameSession.state)
+ACTIVE = "active"         # Playing: ticked and sent every tick
+IDLE = "idle"             # Running but no input for a while: ticked, sent less often
+PAUSED = "paused"         # Paused: neither ticked nor sent until input arrives
+GAME_OVER = "game_over"   # Finished: neither ticked nor sent until input arrives
+ABANDONED = "abandoned"   # No input for too long: evicted by the session manager
+SESSION_STATES = (ACTIVE, IDLE, PAUSED, GAME_OVER, ABANDONED)
+
+# Seconds without input before a running game counts as idle
+IDLE_AFTER = 30.0
+
+# States per second sent to an idle session
+IDLE_SEND_RATE = 10
+
+Sender = Callable[[Union[str, bytes]], Awaitable[None]]
+
+
+class GameSession:
+    """One browser connection: its game, queued input and outgoing messages.
+
+    A receiver task feeds ``inputs``; the scheduler drains it every tick and
+    marks the state as changed. ``send_loop`` encodes the state only when it
+    is about to send, so a slow client skips frames instead of delaying
+    everyone else, and delta encoders always diff against what was sent.
+
+    ``state`` is the session's lifecycle state, updated by the scheduler
+    each tick. Paused and finished games cost nothing until an input
+    arrives; see ``GameScheduler``.
+    """
+
+    def __init__(self, session_id: str, game: WebZenTetrisGame, send: Sender, encoder=None):
+        """Initialize a session.
+
+        Args:
+            session_id: Unique session identifier
+            game: Game played in this session
+            send: Coroutine function sending one text or binary message to the client
+            encoder: State encoder for the client's protocol (JSON by default)
+        """
+        self.session_id = session_id
+        self.watch_id = watch_id(session_id)
+        self.game = game
+        self.send = send
+        self.encoder = encoder or JsonStateEncoder()
+        self.inputs: asyncio.Queue = asyncio.Queue(maxsize=MAX_PENDING_INPUTS)
+        self.closed = False
+        self.state = ACTIVE
+        # Monotonic time of the player's latest input
+        self.last_input = time.monotonic()
+        # Whether the game changed since its state was last published
+        self.changed = True
+
+        # Counters for diagnostics
+        self.inputs_dropped = 0
+        self.frames_skipped = 0
+        self.messages_sent = 0
+        self.bytes_sent = 0
+
+        # Set by the scheduler running this session
+        self.metrics: Optional[ServerMetrics] = None
+
+        self._replies: Deque[str] = deque()
+        self._dirty = False
+        self._finishing = False
+        self._ready = asyncio.Event()
+
+        greeting = self.encoder.greeting()
+        if greeting is not None:
+            self.reply(greeting)
+
+    def push_input(self, action: str) -> bool:
+        """Queue a player action for the next tick.
+
+        Returns:
+            False if the queue was full and the action was dropped
+        """
+        self.last_input = time.monotonic()
+        try:
+            self.inputs.put_nowait(action)
+        except asyncio.QueueFull:
+            self.inputs_dropped += 1
+            return False
+        return True
+
+    def apply_inputs(self) -> bool:
+        """Apply all queued actions to the game in arrival order.
+
+        Returns:
+            True if any action was applied
+        """
+        inputs = self.inputs
+        if inputs.empty():
+            return False
+        if self.metrics is not None:
+            self.metrics.input_queue_depth.observe(inputs.qsize())
+        while not inputs.empty():
+            self.game.handle_input(inputs.get_nowait())
+        self.changed = True
+        return True
+
+    def mark_dirty(self):
+        """Note that the game advanced and its state should be sent."""
+        if self._dirty:
+            self.frames_skipped += 1
+        self._dirty = True
+        self._ready.set()
+
+    def reply(self, message: str):
+        """Queue a message that must not be skipped (e.g. a pong)."""
+        self._replies.append(message)
+        self._ready.set()
+
+    async def send_loop(self):
+        """Deliver queued replies and the latest state until closed or finished."""
+        try:
+            while not self.closed:
+                await self._ready.wait()
+                self._ready.clear()
+                while self._replies:
+                    await self._deliver(self._replies.popleft())
+                if self._finishing:
+                    # The final message is out
+                    self.closed = True
+                    break
+                if self._dirty:
+                    self._dirty = False
+                    metrics = self.metrics
+                    if metrics is None:
+                        message = self.encoder.encode(self.game)
+                    else:
+                        start = time.perf_counter()
+                        message = self.encoder.encode(self.game)
+                        metrics.observe_encode(self.encoder.format, time.perf_counter() - start, message)
+                    if message is not None:
+                        await self._deliver(message)
+        except Exception:
+            # The connection is gone; the receiver task reports the disconnect
+            self.close()
+
+    async def _deliver(self, message: Union[str, bytes]):
+        """Send one message and count it."""
+        metrics = self.metrics
+        if metrics is None:
+            await self.send(message)
+        else:
+            start = time.perf_counter()
+            await self.send(message)
+            metrics.send_seconds.observe(time.perf_counter() - start)
+        self.messages_sent += 1
+        self.bytes_sent += len(message)
+
+    def close(self):
+        """Stop the send loop."""
+        self.closed = True
+        self._ready.set()
+
+    def finish(self, message: str):
+        """Stop the send loop once a last message has been delivered."""
+        self._finishing = True
+        self.reply(message)
+
+
+class TickStats:
+    """Timing counters for the shared game loop."""
+
+    def __init__(self, interval: float):
+        """Initialize counters.
+
+        Args:
+            interval: Target tick interval in seconds
+        """
+        self.interval = interval
+        self.ticks = 0            # Simulation ticks run
+        self.iterations = 0       # Loop wake-ups (ticks + state broadcast)
+        self.catch_up_ticks = 0   # Extra ticks run to make up for lateness
+        self.dropped_ticks = 0    # Ticks abandoned beyond MAX_CATCH_UP_TICKS
+        self.overruns = 0         # Iterations whose work exceeded the interval
+        self.rate_changes = 0     # Times the adaptive tick rate moved
+        self.game_seconds = 0.0   # Game time advanced by all ticks
+        self.work_total = 0.0
+        self.work_max = 0.0
+        self.lateness_max = 0.0
+        self.started_at = time.perf_counter()
+
+    def record(self, ticks: int, work: float, lateness: float):
+        """Record one loop iteration.
+
+        Args:
+            ticks: Ticks run in the iteration
+            work: Seconds spent ticking and publishing
+            lateness: Seconds the iteration started after its deadline
+        """
+        self.iterations += 1
+        self.ticks += ticks
+        self.game_seconds += ticks * self.interval
+        self.catch_up_ticks += ticks - 1
+        self.work_total += work
+        self.work_max = max(self.work_max, work)
+        self.lateness_max = max(self.lateness_max, lateness)
+        if work > self.interval:
+            self.overruns += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Get the counters as JSON-friendly values."""
+        elapsed = time.perf_counter() - self.started_at
+        return {
+            "target_hz": round(1 / self.interval, 1),
+            "actual_hz": round(self.ticks / elapsed, 1) if elapsed > 0 else 0.0,
+            "game_seconds": round(self.game_seconds, 3),
+            "game_speed": round(self.game_seconds / elapsed, 3) if elapsed > 0 else 0.0,
+            "rate_changes": self.rate_changes,
+            "ticks": self.ticks,
+            "catch_up_ticks": self.catch_up_ticks,
+            "dropped_ticks": self.dropped_ticks,
+            "overruns": self.overruns,
+            "work_ms_avg": round(self.work_total / self.iterations * 1000, 3) if self.iterations else 0.0,
+            "work_ms_max": round(self.work_max * 1000, 3),
+            "lateness_ms_max": round(self.lateness_max * 1000, 3),
+        }
+
+
+class GameScheduler:
+    """Advances every session's game at a fixed rate from a single task.
+
+    Each wake-up runs as many fixed ticks as are due (up to
+    ``max_catch_up``), then publishes one state per session. Games always
+    advance by exactly ``tick_ms`` per tick, independent of event loop
+    jitter.
+
+    With a ``min_tick_rate``, the rate adapts to load: when the process
+    spends more than ``HIGH_LOAD`` of its time on the CPU it steps down to
+    the next divisor of ``tick_rate`` (60, 30, 20 Hz), and it steps back up
+    once there is room again. Games run in fixed substeps, so a slower tick
+    only sends fewer states; the game itself plays at the same speed.
+
+    Only running games are ticked. A paused or finished game is skipped
+    and its unchanged state is not sent again until an input wakes it, and
+    a game without input for ``idle_after`` seconds is sent
+    ``IDLE_SEND_RATE`` states per second, so the loop's cost follows the
+    players actually playing rather than the open tabs.
+    """
+
+    def __init__(self, tick_rate: int = FPS, max_catch_up: int = MAX_CATCH_UP_TICKS,
+                 min_tick_rate: Optional[int] = None, idle_after: float = IDLE_AFTER):
+        """Initialize the scheduler.
+
+        Args:
+            tick_rate: Ticks per second (the fastest rate when adaptive)
+            max_catch_up: Most ticks run in one iteration when behind
+            min_tick_rate: Slowest rate to fall back to under load; None
+                keeps the rate fixed
+            idle_after: Seconds without input before a running game is idle
+        """
+        # Rates to choose from, fastest first; each divides tick_rate so a
+        # tick is always a whole number of the fastest rate's ticks
+        floor = min_tick_rate or tick_rate
+        self.tick_rates = [tick_rate // n for n in range(1, tick_rate + 1)
+                           if tick_rate % n == 0 and tick_rate // n >= floor]
+        self.tick_rate = tick_rate
+        self.interval = 1.0 / tick_rate
+        self.tick_ms = 1000.0 / tick_rate
+        self.max_catch_up = max_catch_up
+        self.idle_after = idle_after
+        self.sessions: Dict[str, GameSession] = {}
+        # Spectators by session ID; only watched sessions have an entry
+        self.broadcasts: Dict[str, Broadcast] = {}
+        self.stats = TickStats(self.interval)
+        self.metrics = ServerMetrics()
+        self._task: Optional[asyncio.Task] = None
+        self._sample = 0
+        self._publishes = 0
+
+    def add(self, session: GameSession):
+        """Start ticking a session."""
+        session.metrics = self.metrics
+        self.sessions[session.session_id] = session
+
+    def remove(self, session_id: str) -> Optional[GameSession]:
+        """Stop ticking a session."""
+        session = self.sessions.pop(session_id, None)
+        if session is not None:
+            self.metrics.retire(session)
+        return session
+
+    def watch(self, session_id: str, spectator: Spectator, encoder: StateEncoder):
+        """Start sending a session's frames to a spectator.
+
+        The spectator stays subscribed while the session is away (e.g. its
+        player reconnecting) and receives frames again when it is back.
+
+        Args:
+            session_id: Session to watch
+            spectator: The viewer
+            encoder: Shared encoder for the viewer's wire format
+        """
+        broadcast = self.broadcasts.get(session_id)
+        if broadcast is None:
+            broadcast = self.broadcasts[session_id] = Broadcast()
+        broadcast.subscribe(spectator, encoder)
+
+    def unwatch(self, session_id: str, spectator: Spectator):
+        """Stop sending frames to a spectator."""
+        broadcast = self.broadcasts.get(session_id)
+        if broadcast is not None and broadcast.unsubscribe(spectator):
+            self.metrics.spectator_frames_dropped += spectator.frames_dropped
+            if not len(broadcast):
+                del self.broadcasts[session_id]
+
+    def end_broadcast(self, session_id: str):
+        """Disconnect every spectator of a session that will not come back."""
+        broadcast = self.broadcasts.pop(session_id, None)
+        if broadcast is not None:
+            for spectator in broadcast.spectators:
+                self.metrics.spectator_frames_dropped += spectator.frames_dropped
+                spectator.close()
+
+    def find_watched(self, watch_id: str) -> Optional[GameSession]:
+        """Get the running session with a spectator watch ID."""
+        for session in self.sessions.values():
+            if session.watch_id == watch_id:
+                return session
+        return None
+
+    def set_tick_rate(self, tick_rate: int):
+        """Change the tick rate; the next tick is the first at the new rate."""
+        self.tick_rate = tick_rate
+        self.interval = 1.0 / tick_rate
+        self.tick_ms = 1000.0 / tick_rate
+        self.stats.interval = self.interval
+
+    def adapt(self, load: float) -> int:
+        """Choose the tick rate for the next window from the last one's load.
+
+        Args:
+            load: Share of wall time the process spent on the CPU
+
+        Returns:
+            The tick rate now in use
+        """
+        rates = self.tick_rates
+        index = rates.index(self.tick_rate)
+        if load > HIGH_LOAD and index + 1 < len(rates):
+            index += 1
+        elif index > 0 and load * rates[index - 1] / rates[index] < LOW_LOAD:
+            # Most of the cost (ticks, encoding, sending) scales with the rate
+            index -= 1
+        if rates[index] != self.tick_rate:
+            self.set_tick_rate(rates[index])
+            self.stats.rate_changes += 1
+        return self.tick_rate
+
+    def state_counts(self) -> Dict[str, int]:
+        """Count the sessions in each lifecycle state (evicted ones are gone)."""
+        counts = dict.fromkeys(SESSION_STATES[:-1], 0)
+        for session in self.sessions.values():
+            counts[session.state] = counts.get(session.state, 0) + 1
+        return counts
+
+    def start(self):
+        """Start the loop on the running event loop."""
+        if self._task is None:
+            self.stats = TickStats(self.interval)
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        """Stop the loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def tick(self):
+        """Apply queued input and advance every running game by one tick."""
+        sessions = list(self.sessions.values())
+        # Timing every game would cost as much as an idle update, so time one per tick
+        sampled = sessions[self._sample % len(sessions)] if sessions else None
+        self._sample += 1
+        idle_since = time.monotonic() - self.idle_after
+        for session in sessions:
+            try:
+                session.apply_inputs()
+                game = session.game
+                if game.game_over or game.paused:
+                    # Nothing moves until an input wakes the game
+                    session.state = GAME_OVER if game.game_over else PAUSED
+                    continue
+                session.state = IDLE if session.last_input < idle_since else ACTIVE
+                session.changed = True
+                if session is sampled:
+                    start = time.perf_counter()
+                    session.game.tick(self.tick_ms)
+                    self.metrics.update_seconds.observe(time.perf_counter() - start)
+                else:
+                    session.game.tick(self.tick_ms)
+            except Exception as e:
+                print(f"Game tick error in session {session.session_id}: {e}")
+                self.remove(session.session_id)
+                session.close()
+
+    def publish(self):
+        """Mark changed games' states for sending and fan them out to spectators.
+
+        Idle games are only published every few calls; their changes keep
+        until then.
+        """
+        self._publishes += 1
+        idle_turn = self._publishes % max(1, round(self.tick_rate / IDLE_SEND_RATE)) == 0
+        broadcasts = self.broadcasts
+        for session_id, session in self.sessions.items():
+            publish = session.changed and (idle_turn or session.state != IDLE)
+            if publish:
+                session.changed = False
+                session.mark_dirty()
+            broadcast = broadcasts.get(session_id) if broadcasts else None
+            # Before the session's send loop runs, so no effect event is drained yet.
+            # A new or lagging spectator needs a keyframe even if nothing changed.
+            if broadcast is not None and (publish or broadcast.unsynced):
+                try:
+                    broadcast.publish(session.game)
+                except Exception as e:
+                    # Only this game's spectators lose their stream; the player keeps playing
+                    print(f"Spectator broadcast error in session {session_id}: {e}")
+                    self.end_broadcast(session_id)
+
+    async def run(self):
+        """Run fixed ticks forever."""
+        clock = time.perf_counter
+        next_tick = clock()
+        window_start, window_cpu = next_tick, time.process_time()
+
+        while True:
+            start = clock()
+            interval = self.interval
+            lateness = max(0.0, start - next_tick)
+            due = 1 + int(lateness / interval)
+            if due > self.max_catch_up:
+                # Too far behind: drop the backlog rather than spiral
+                self.stats.dropped_ticks += due - self.max_catch_up
+                due = self.max_catch_up
+                next_tick = start - (due - 1) * interval
+
+            for _ in range(due):
+                self.tick()
+                next_tick += interval
+            self.publish()
+
+            work = clock() - start
+            self.stats.record(due, work, lateness)
+            self.metrics.loop_work_seconds.observe(work)
+            self.metrics.loop_lateness_seconds.observe(lateness)
+            if len(self.tick_rates) > 1 and start - window_start >= ADAPT_WINDOW:
+                cpu = time.process_time()
+                self.adapt((cpu - window_cpu) / (start - window_start))
+                window_start, window_cpu = start, cpu
+            await asyncio.sleep(max(0.0, next_tick - clock()))
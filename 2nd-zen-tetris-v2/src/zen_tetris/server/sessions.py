@@ -0,0 +1,265 @@
+"""
+Session layer for one web worker: routing, resuming and persistence.
+"""
+
+import asyncio
+import json
+import os
+import secrets
+import time
+import uuid
+from typing import Dict, Iterable, Optional, Tuple
+
+from ..web_game import WebZenTetrisGame
+from .recording import InputLog, save_recording
+from .routing import HashRing
+from .scheduler import ABANDONED, GameScheduler, GameSession
+from .snapshot import SnapshotError, restore_game, snapshot_game
+from .store import MemoryStore, SessionStore
+
+# Seconds between snapshots of running games
+SNAPSHOT_INTERVAL = 2.0
+
+# Games snapshotted before the persist loop lets ticks run again
+SNAPSHOT_BATCH = 64
+
+# Worker name used when the server runs alone
+LOCAL_WORKER = "local"
+
+# Seconds without input before a session is evicted
+ABANDON_AFTER = 600.0
+
+
+def _snapshot_key(game: WebZenTetrisGame) -> tuple:
+    """Get a cheap value that changes whenever a game is worth saving again."""
+    piece = game.current_tetromino
+    return (game.pieces_placed, game.score, game.lines_cleared, game.game_over, game.paused,
+            None if piece is None else (piece.rotation, piece.x, piece.y))
+
+
+class SessionManager:
+    """Finds, creates, resumes and saves the sessions owned by this worker.
+
+    Session IDs are spread over workers with a HashRing, so every worker
+    agrees on where a session lives and can send a client to the right
+    one. New sessions get IDs that hash to the worker creating them.
+
+    Running games are snapshotted to the store every ``snapshot_interval``
+    seconds and when their client disconnects. A client reconnecting with
+    its session ID (after a page reload or a worker restart) continues from
+    the latest snapshot.
+
+    With a ``recordings`` directory, every game is also recorded: new games
+    get an explicit seed, and the inputs a game handled are written as a
+    replayable recording when its client disconnects or the server stops.
+    A game resumed from a snapshot starts a new recording from that
+    snapshot.
+
+    Sessions whose player sent no input for ``abandon_after`` seconds are
+    evicted: saved like a disconnected session, sent an
+    ``{"type": "evicted"}`` message and closed once it is delivered, freeing their game and
+    spectators. The player can still resume from the snapshot later.
+    """
+
+    def __init__(self, scheduler: GameScheduler, store: Optional[SessionStore] = None,
+                 workers: Iterable[str] = (), worker: str = LOCAL_WORKER,
+                 snapshot_interval: float = SNAPSHOT_INTERVAL, recordings: Optional[str] = None,
+                 abandon_after: Optional[float] = ABANDON_AFTER):
+        """Initialize the manager.
+
+        Args:
+            scheduler: Scheduler ticking this worker's sessions
+            store: Snapshot storage shared by all workers (in-memory by default)
+            workers: Names of all workers, e.g. their websocket base URLs
+                (just this worker when empty)
+            worker: Name of this worker
+            snapshot_interval: Seconds between periodic snapshots
+            recordings: Directory for input recordings (no recording when None)
+            abandon_after: Seconds without input before a session is evicted
+                (never when None)
+
+        Raises:
+            ValueError: If ``worker`` is not one of ``workers``
+        """
+        self.scheduler = scheduler
+        self.store = store if store is not None else MemoryStore()
+        self.worker = worker
+        self.ring = HashRing(workers or [worker])
+        if worker not in self.ring:
+            raise ValueError(f"Worker {worker!r} is not in the worker list {self.ring.nodes}")
+        self.snapshot_interval = snapshot_interval
+        self.recordings = recordings
+        self.abandon_after = abandon_after
+
+        # Counters for diagnostics
+        self.resumed = 0
+        self.snapshots_saved = 0
+        self.recordings_saved = 0
+        self.evicted = 0
+
+        self._saved_keys: Dict[str, tuple] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def owner(self, session_id: str) -> str:
+        """Get the worker a session belongs to."""
+        return self.ring.node_for(session_id)
+
+    def is_local(self, session_id: str) -> bool:
+        """Check whether a session belongs to this worker."""
+        return self.owner(session_id) == self.worker
+
+    def new_session_id(self) -> str:
+        """Create a session ID owned by this worker."""
+        while True:
+            session_id = str(uuid.uuid4())
+            if self.is_local(session_id):
+                return session_id
+
+    async def open_game(self, session_id: Optional[str] = None) -> Tuple[str, WebZenTetrisGame, bool]:
+        """Get the game for a connecting client.
+
+        A session still running here (e.g. the old connection of a reloaded
+        page) is taken over; otherwise the latest snapshot is restored. A
+        new game is started when neither exists.
+
+        Args:
+            session_id: Session the client wants to resume, if any
+
+        Returns:
+            (session ID, game, whether the game was resumed)
+        """
+        if session_id and self.is_local(session_id):
+            live = self.scheduler.remove(session_id)
+            if live is not None:
+                live.close()
+                self.resumed += 1
+                return session_id, live.game, True
+
+            data = await asyncio.to_thread(self.store.load, session_id)
+            if data is not None:
+                try:
+                    game = restore_game(data)
+                except SnapshotError as e:
+                    print(f"Cannot resume session {session_id}: {e}")
+                else:
+                    if self.recordings is not None:
+                        game.input_log = InputLog(snapshot=data, tick_ms=game.substep_ms)
+                    self.resumed += 1
+                    return session_id, game, True
+
+        seed = secrets.randbits(32)
+        game = WebZenTetrisGame(seed)
+        if self.recordings is not None:
+            game.input_log = InputLog(seed=seed, tick_ms=game.substep_ms)
+        return self.new_session_id(), game, False
+
+    async def release(self, session: GameSession):
+        """Stop a disconnected session and save it for a later resume."""
+        session_id = session.session_id
+        # A newer connection may have taken the session over
+        if self.scheduler.sessions.get(session_id) is not session:
+            return
+        self.scheduler.remove(session_id)
+        self._saved_keys.pop(session_id, None)
+        await self._save({session_id: snapshot_game(session.game)})
+        await self._save_recording(session)
+
+    async def evict_abandoned(self) -> int:
+        """Release every session without input for ``abandon_after`` seconds.
+
+        Returns:
+            Number of sessions evicted
+        """
+        if self.abandon_after is None:
+            return 0
+        cutoff = time.monotonic() - self.abandon_after
+        abandoned = [session for session in self.scheduler.sessions.values() if session.last_input < cutoff]
+        for session in abandoned:
+            session.state = ABANDONED
+            await self.release(session)
+            self.scheduler.end_broadcast(session.session_id)
+            # The send loop stops after this notice; the client then stays disconnected
+            session.finish(json.dumps({"type": "evicted"}))
+            self.evicted += 1
+        return len(abandoned)
+
+    async def save_all(self, force: bool = False):
+        """Snapshot every running game that changed since it was last saved.
+
+        Games are packed in batches between which the event loop runs, so
+        ticks are not delayed by a long save.
+
+        Args:
+            force: Save unchanged games too
+        """
+        snapshots = {}
+        for count, session in enumerate(list(self.scheduler.sessions.values()), 1):
+            key = _snapshot_key(session.game)
+            if force or self._saved_keys.get(session.session_id) != key:
+                snapshots[session.session_id] = snapshot_game(session.game)
+                self._saved_keys[session.session_id] = key
+            if count % SNAPSHOT_BATCH == 0:
+                await asyncio.sleep(0)
+
+        live = self.scheduler.sessions
+        for session_id in [session_id for session_id in self._saved_keys if session_id not in live]:
+            del self._saved_keys[session_id]
+        await self._save(snapshots)
+
+    async def _save(self, snapshots: Dict[str, bytes]):
+        """Write snapshots without blocking the event loop."""
+        if snapshots:
+            await asyncio.to_thread(self.store.save_many, snapshots)
+            self.snapshots_saved += len(snapshots)
+
+    async def _save_recording(self, session: GameSession):
+        """Write the recording of a session's game, if it is recorded."""
+        log = session.game.input_log
+        if log is None or self.recordings is None or session.game.frame == 0:
+            return
+        recording = log.to_dict(session.game, session.session_id)
+        path = os.path.join(self.recordings, f"{session.session_id}-{time.time_ns()}.json")
+        await asyncio.to_thread(save_recording, path, recording)
+        self.recordings_saved += 1
+
+    async def run(self):
+        """Save running games and evict abandoned ones periodically forever."""
+        while True:
+            await asyncio.sleep(self.snapshot_interval)
+            try:
+                await self.evict_abandoned()
+                await self.save_all()
+            except Exception as e:
+                print(f"Session snapshot error: {e}")
+
+    def start(self):
+        """Start periodic snapshots on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        """Stop periodic snapshots and save every running game."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.save_all(force=True)
+        for session in list(self.scheduler.sessions.values()):
+            try:
+                await self._save_recording(session)
+            except OSError as e:
+                print(f"Cannot save recording of session {session.session_id}: {e}")
+
+    def stats(self) -> Dict[str, object]:
+        """Get routing and persistence counters as JSON-friendly values."""
+        return {
+            "worker": self.worker,
+            "workers": len(self.ring),
+            "resumed": self.resumed,
+            "snapshots_saved": self.snapshots_saved,
+            "recordings_saved": self.recordings_saved,
+            "evicted": self.evicted,
+        }
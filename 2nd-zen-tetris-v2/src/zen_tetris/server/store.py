@@ -0,0 +1,125 @@
+"""
+Key-value storage for session snapshots.
+
+Stores map session IDs to snapshot bytes. ``MemoryStore`` lives and dies
+with one process; ``SqliteStore`` is a local stand-in for a shared
+key-value service: every worker on the machine opens the same file, so a
+restarted or different worker can pick up a session where it was left.
+"""
+
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Union
+
+
+class MemoryStore:
+    """Snapshots kept in a dict in this process."""
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._data: Dict[str, bytes] = {}
+
+    def load(self, session_id: str) -> Optional[bytes]:
+        """Get the latest snapshot of a session, or None."""
+        return self._data.get(session_id)
+
+    def save_many(self, snapshots: Dict[str, bytes]):
+        """Store snapshots, replacing older ones of the same sessions."""
+        self._data.update(snapshots)
+
+    def delete(self, session_id: str):
+        """Forget a session."""
+        self._data.pop(session_id, None)
+
+    def keys(self) -> List[str]:
+        """Get the IDs of all stored sessions."""
+        return list(self._data)
+
+    def close(self):
+        """Release resources (nothing to do)."""
+
+
+class SqliteStore:
+    """Snapshots in a SQLite file shared by the workers of one machine.
+
+    Methods are safe to call from worker threads (e.g. through
+    ``asyncio.to_thread``); writes from one call happen in one transaction.
+    """
+
+    def __init__(self, path: str):
+        """Open or create the store.
+
+        Args:
+            path: Database file
+        """
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        # WAL lets workers read while another one writes
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "id TEXT PRIMARY KEY, data BLOB NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def load(self, session_id: str) -> Optional[bytes]:
+        """Get the latest snapshot of a session, or None."""
+        with self._lock:
+            row = self._db.execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return bytes(row[0]) if row else None
+
+    def save_many(self, snapshots: Dict[str, bytes]):
+        """Store snapshots, replacing older ones of the same sessions."""
+        if not snapshots:
+            return
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO sessions (id, data, updated) VALUES (?, ?, ?)",
+                    [(session_id, data, now) for session_id, data in snapshots.items()],
+                )
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def delete(self, session_id: str):
+        """Forget a session."""
+        with self._lock:
+            self._db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def keys(self) -> List[str]:
+        """Get the IDs of all stored sessions."""
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT id FROM sessions")]
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+
+SessionStore = Union[MemoryStore, SqliteStore]
+
+
+def create_store(spec: Optional[str]) -> SessionStore:
+    """Get the store described by a configuration string.
+
+    Args:
+        spec: "memory" (or None) for a MemoryStore, "sqlite:<path>" for a
+            SqliteStore
+
+    Returns:
+        A new store
+
+    Raises:
+        ValueError: If the string names no known store
+    """
+    if not spec or spec == "memory":
+        return MemoryStore()
+    if spec.startswith("sqlite:"):
+        return SqliteStore(spec[len("sqlite:"):])
+    raise ValueError(f"Unknown session store {spec!r} (use 'memory' or 'sqlite:<path>')")
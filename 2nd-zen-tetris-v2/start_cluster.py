@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+ZEN Tetris v2 - Multi-worker Web Launcher
+Runs several web server processes that share session snapshots, and
+restarts any worker that exits.
+
+Each worker listens on its own port. Session IDs are assigned to workers
+by consistent hashing, so a client connecting to the wrong worker is sent
+to the right one, and a client of a restarted worker resumes its game
+from the shared snapshot store.
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+
+def worker_command(host: str, port: int) -> List[str]:
+    """Get the command line running one worker."""
+    return [sys.executable, "-m", "uvicorn", "web_server:app",
+            "--host", host, "--port", str(port), "--log-level", "warning"]
+
+
+def start_worker(host: str, port: int, env: Dict[str, str]) -> subprocess.Popen:
+    """Start one worker process."""
+    print(f"🚀 Worker starting on port {port}")
+    return subprocess.Popen(worker_command(host, port), env=env)
+
+
+def main():
+    """Launch and supervise the workers."""
+    parser = argparse.ArgumentParser(description="Run ZEN Tetris v2 on several worker processes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="number of worker processes")
+    parser.add_argument("--host", default="127.0.0.1", help="address the workers listen on")
+    parser.add_argument("--port", type=int, default=8000, help="port of the first worker")
+    parser.add_argument("--public-host", default=None,
+                        help="host name browsers use to reach the workers (default: --host)")
+    parser.add_argument("--store", default="sqlite:zen_sessions.db",
+                        help="session store shared by the workers ('sqlite:<path>')")
+    parser.add_argument("--recordings", default=None, help="directory for input recordings of every game")
+    args = parser.parse_args()
+
+    if not os.path.exists("web_server.py"):
+        print("❌ Error: Please run this script from the project root directory.")
+        sys.exit(1)
+    if not args.store.startswith("sqlite:"):
+        print("❌ Error: Workers can only share a sqlite store.")
+        sys.exit(1)
+
+    public_host = args.public_host or args.host
+    ports = [args.port + i for i in range(args.workers)]
+    urls = {port: f"ws://{public_host}:{port}" for port in ports}
+
+    print("🎋 ZEN Tetris v2 - Cluster Launcher")
+    print("=" * 50)
+    print(f"👥 Workers: {args.workers}")
+    print(f"💾 Session store: {args.store}")
+    print(f"🌐 Open any worker, e.g. http://{public_host}:{ports[0]}")
+    print("=" * 50)
+
+    def env_for(port: int) -> Dict[str, str]:
+        env = {
+            **os.environ,
+            "ZEN_TETRIS_STORE": args.store,
+            "ZEN_TETRIS_WORKERS": ",".join(urls.values()),
+            "ZEN_TETRIS_WORKER": urls[port],
+        }
+        if args.recordings:
+            env["ZEN_TETRIS_RECORDINGS"] = os.path.abspath(args.recordings)
+        return env
+
+    def interrupt(signum, frame):
+        raise KeyboardInterrupt
+
+    # Shut down cleanly when a process manager stops the launcher too
+    signal.signal(signal.SIGTERM, interrupt)
+
+    processes = {port: start_worker(args.host, port, env_for(port)) for port in ports}
+    try:
+        while True:
+            time.sleep(1.0)
+            for port, process in processes.items():
+                code = process.poll()
+                if code is not None:
+                    # Its sessions resume from their last snapshot once it is back
+                    print(f"⚠️  Worker on port {port} exited with code {code}, restarting")
+                    processes[port] = start_worker(args.host, port, env_for(port))
+    except KeyboardInterrupt:
+        print("\n🎋 Shutting down workers...")
+    finally:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        print("Thanks for playing! 🧘‍♀️")
+
+
+if __name__ == "__main__":
+    main()
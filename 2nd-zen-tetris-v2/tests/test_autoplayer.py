@@ -0,0 +1,74 @@
+"""
+Tests for AutoPlayer - 配置探索AIのテスト
+"""
+import unittest
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from zen_tetris.ai import AutoPlayer, enumerate_placements, evaluate_boards, run_game, run_games
+from zen_tetris.ai.autoplayer import board_rows
+from zen_tetris.core import TetrisEngine, Tetromino
+from zen_tetris.core.board import Board
+from zen_tetris.constants import BOARD_WIDTH, BOARD_HEIGHT, COLORS
+
+
+class TestAutoPlayer(unittest.TestCase):
+
+    def test_placements_match_engine_hard_drop(self):
+        """全配置がエンジンの操作で同じ盤面になる"""
+        setup = TetrisEngine(seed=5)
+        for _ in range(6):
+            setup.step("hard_drop")
+        rows = board_rows(setup.board)
+        player = AutoPlayer()
+
+        for shape_type in "IOTSZJL":
+            for placement in enumerate_placements(rows, shape_type):
+                engine = TetrisEngine(seed=0)
+                engine.board.rows = list(rows)
+                piece = Tetromino(shape_type)
+                piece.x = piece.state.spawn_x
+                engine.current_tetromino = piece
+
+                for action in player.actions_for(engine, placement):
+                    engine.step(action)
+                self.assertEqual(tuple(engine.board.rows), placement.rows,
+                                 f"{shape_type} rotation {placement.rotation} x {placement.x}")
+
+    def test_board_rows_from_list_board(self):
+        """リスト版Boardからも行マスクを取得できる"""
+        board = Board()
+        board.grid[BOARD_HEIGHT - 1][0] = COLORS['I']
+        board.grid[BOARD_HEIGHT - 1][BOARD_WIDTH - 1] = COLORS['I']
+        rows = board_rows(board)
+        self.assertEqual(rows[-1], 1 | 1 << (BOARD_WIDTH - 1))
+        self.assertEqual(rows[:-1], (0,) * (BOARD_HEIGHT - 1))
+
+    def test_evaluation_prefers_flat_boards_without_holes(self):
+        """穴のない平らな盤面の評価が高い"""
+        empty = (0,) * BOARD_HEIGHT
+        flat = (0,) * (BOARD_HEIGHT - 1) + (0b1111,)
+        hole = (0,) * (BOARD_HEIGHT - 2) + (0b1111, 0b1110)
+        scores = evaluate_boards([empty, flat, hole], [0, 0, 0])
+        self.assertGreater(scores[0], scores[1])
+        self.assertGreater(scores[1], scores[2])
+
+    def test_autoplayer_clears_lines(self):
+        """AIが長時間プレイしてラインを消去できる"""
+        result = run_game(seed=0, max_pieces=150, lookahead=False)
+        self.assertFalse(result.game_over)
+        self.assertEqual(result.pieces, 150)
+        self.assertGreater(result.lines, 40)
+
+    def test_run_games_is_deterministic(self):
+        """同じシードなら同じ結果になる"""
+        first = run_games([1, 2], max_pieces=30)
+        second = run_games([1, 2], max_pieces=30)
+        self.assertEqual([(r.score, r.lines) for r in first], [(r.score, r.lines) for r in second])
+
+
+if __name__ == '__main__':
+    unittest.main()
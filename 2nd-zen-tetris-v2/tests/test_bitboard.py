@@ -0,0 +1,184 @@
+"""
+Tests for BitBoard class - ビットボードがBoardと同じ結果を返すことをテスト
+"""
+import unittest
+import random
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from zen_tetris.components.bitboard import BitBoard, FULL_ROW
+from zen_tetris.components.board import Board
+from zen_tetris.components.tetromino import Tetromino
+from zen_tetris.constants import BOARD_WIDTH, BOARD_HEIGHT, COLORS, TETROMINO_SHAPES
+
+
+class TestBitBoard(unittest.TestCase):
+
+    def setUp(self):
+        """各テストの前に実行される初期化"""
+        self.board = BitBoard()
+
+    def assert_same_board(self, bitboard, board):
+        """ビットボードとリスト版ボードの内容が一致することを確認"""
+        for y in range(BOARD_HEIGHT):
+            for x in range(BOARD_WIDTH):
+                self.assertEqual(bitboard.get_block_color(x, y), board.grid[y][x])
+        self.assertEqual(bitboard.is_empty(), board.is_empty())
+        self.assertEqual(bitboard.get_column_heights(), board.get_column_heights())
+        self.assertEqual(bitboard.get_column_holes(), board.get_column_holes())
+
+    def test_board_initialization(self):
+        """ビットボードの初期化テスト"""
+        self.assertEqual(self.board.rows, [0] * BOARD_HEIGHT)
+        self.assertEqual(len(self.board.grid), BOARD_HEIGHT)
+        self.assertEqual(len(self.board.grid[0]), BOARD_WIDTH)
+        self.assertTrue(self.board.is_empty())
+
+    def test_grid_view_writes_through(self):
+        """grid経由の書き込みがビットマスクと色配列に反映される"""
+        self.board.grid[BOARD_HEIGHT - 1][3] = COLORS['T']
+
+        self.assertEqual(self.board.rows[BOARD_HEIGHT - 1], 1 << 3)
+        self.assertEqual(self.board.get_block_color(3, BOARD_HEIGHT - 1), COLORS['T'])
+        self.assertEqual(list(self.board.grid[BOARD_HEIGHT - 1]).count(None), BOARD_WIDTH - 1)
+
+        # Noneを書き込むと空に戻る
+        self.board.grid[BOARD_HEIGHT - 1][3] = None
+        self.assertTrue(self.board.is_empty())
+
+    def test_completed_lines_and_clear(self):
+        """完成ラインの検出とビットシフトによる消去テスト"""
+        for x in range(BOARD_WIDTH):
+            self.board.grid[19][x] = COLORS['T']
+            self.board.grid[17][x] = COLORS['L']
+        self.board.grid[18][0] = COLORS['I']
+        self.board.grid[16][4] = COLORS['O']
+
+        self.assertEqual(self.board.rows[19], FULL_ROW)
+        self.assertEqual(self.board.get_completed_lines(), [17, 19])
+
+        self.board.clear_lines([17, 19])
+
+        # 残ったブロックが2ライン分下に落ちる
+        self.assertEqual(self.board.get_completed_lines(), [])
+        self.assertEqual(self.board.get_block_color(0, 19), COLORS['I'])
+        self.assertEqual(self.board.get_block_color(4, 18), COLORS['O'])
+        self.assertEqual(self.board.rows[:2], [0, 0])
+        self.assertEqual(len(self.board.colors), BOARD_WIDTH * BOARD_HEIGHT)
+
+    def test_collision_matches_board(self):
+        """全形状・全回転・全位置で衝突判定がBoardと一致する"""
+        board = Board()
+        rng = random.Random(1)
+        for y in range(BOARD_HEIGHT // 2, BOARD_HEIGHT):
+            for x in range(BOARD_WIDTH):
+                if rng.random() < 0.5:
+                    board.grid[y][x] = COLORS['S']
+                    self.board.grid[y][x] = COLORS['S']
+
+        for shape_type in TETROMINO_SHAPES:
+            tetromino = Tetromino(shape_type)
+            for _ in range(4):
+                for x in range(-4, BOARD_WIDTH + 2):
+                    for y in range(-3, BOARD_HEIGHT + 2):
+                        tetromino.x = x
+                        tetromino.y = y
+                        self.assertEqual(self.board.check_collision(tetromino),
+                                         board.check_collision(tetromino),
+                                         f"{shape_type} {tetromino.shape} at ({x}, {y})")
+                tetromino.rotate()
+
+    def test_random_games_match_board(self):
+        """ランダムな配置と消去を繰り返してもBoardと同じ状態になる"""
+        rng = random.Random(7)
+        board = Board()
+        shape_types = list(TETROMINO_SHAPES)
+
+        for _ in range(300):
+            tetromino = Tetromino(rng.choice(shape_types))
+            for _ in range(rng.randrange(4)):
+                tetromino.rotate()
+            tetromino.x = rng.randrange(BOARD_WIDTH - len(tetromino.shape[0]) + 1)
+            tetromino.y = 0
+            if board.check_collision(tetromino):
+                board = Board()
+                self.board = BitBoard()
+                continue
+
+            # 落下位置まで移動
+            while not board.check_collision(tetromino):
+                tetromino.y += 1
+            tetromino.y -= 1
+
+            board.place_tetromino(tetromino)
+            self.board.place_tetromino(tetromino)
+            self.assertEqual(self.board.get_completed_lines(), board.get_completed_lines())
+
+            board.clear_lines(board.get_completed_lines())
+            self.board.clear_lines(self.board.get_completed_lines())
+            self.assert_same_board(self.board, board)
+
+    def test_clear_exposes_holes(self):
+        """最上段のブロックが消えると下の穴が穴でなくなる"""
+        board = Board()
+        for x in range(BOARD_WIDTH):
+            for target in (board, self.board):
+                target.grid[15][x] = COLORS['T']
+                if x != 2:
+                    target.grid[17][x] = COLORS['L']
+        for target in (board, self.board):
+            target.grid[19][2] = COLORS['I']
+        self.assertEqual(self.board.get_column_heights()[2], 5)
+        self.assertEqual(self.board.get_column_holes()[2], 3)
+
+        board.clear_lines([15])
+        self.board.clear_lines([15])
+
+        # 列2は最下段のブロックだけが残る
+        self.assertEqual(self.board.get_column_heights()[2], 1)
+        self.assertEqual(self.board.get_column_holes()[2], 0)
+        self.assertEqual(self.board.get_column_heights()[0], 3)
+        self.assertEqual(self.board.get_column_holes()[0], 2)
+        self.assert_same_board(self.board, board)
+
+    def test_rows_assignment_recounts(self):
+        """行マスクを代入すると列の高さと穴が数え直される"""
+        self.board.rows = [0] * (BOARD_HEIGHT - 3) + [0b1, 0, 0b11]
+        self.assertEqual(self.board.get_column_heights()[:3], [3, 1, 0])
+        self.assertEqual(self.board.get_column_holes()[:3], [1, 0, 0])
+
+    def test_landing_matches_stepping(self):
+        """着地位置が1マスずつ落とした結果と一致する"""
+        board = Board()
+        rng = random.Random(3)
+        for y in range(BOARD_HEIGHT // 2, BOARD_HEIGHT):
+            for x in range(BOARD_WIDTH):
+                if rng.random() < 0.4:
+                    board.grid[y][x] = COLORS['S']
+                    self.board.grid[y][x] = COLORS['S']
+
+        for shape_type in TETROMINO_SHAPES:
+            tetromino = Tetromino(shape_type)
+            for _ in range(4):
+                for x in range(BOARD_WIDTH - len(tetromino.shape[0]) + 1):
+                    for y in range(-2, BOARD_HEIGHT):
+                        tetromino.x = x
+                        tetromino.y = y
+                        if board.check_collision(tetromino):
+                            continue
+                        while not board.check_collision(tetromino):
+                            tetromino.y += 1
+                        expected = tetromino.y - 1
+                        tetromino.y = y
+                        self.assertEqual(self.board.landing_y(tetromino), expected,
+                                         f"{shape_type} {tetromino.shape} at ({x}, {y})")
+                        self.assertEqual(board.landing_y(tetromino), expected)
+                        self.assertEqual(tetromino.y, y)
+                tetromino.rotate()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,225 @@
+"""
+Tests for spectator broadcast - 観戦者への一度だけのエンコードと配信をテスト
+"""
+import unittest
+import asyncio
+import json
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from zen_tetris.server import (
+    DeltaStateEncoder, GameScheduler, GameSession, Spectator, create_encoder, watch_id
+)
+from zen_tetris.server.protocol import BINARY_HEADER
+from zen_tetris.core import Tetromino
+from zen_tetris.web_game import WebZenTetrisGame
+from zen_tetris.constants import BOARD_WIDTH, BOARD_HEIGHT, COLORS
+
+
+class Recorder:
+    """受け取ったメッセージを記録する送信先"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def __call__(self, message):
+        self.messages.append(message)
+
+
+class BlockedSender(Recorder):
+    """解除されるまで送信が終わらない遅い観戦者"""
+
+    def __init__(self):
+        super().__init__()
+        self.open = asyncio.Event()
+
+    async def __call__(self, message):
+        await self.open.wait()
+        self.messages.append(message)
+
+
+class CountingEncoder(DeltaStateEncoder):
+    """エンコード回数を数える"""
+
+    def __init__(self):
+        super().__init__(shared=True)
+        self.calls = 0
+
+    def encode(self, game):
+        self.calls += 1
+        return super().encode(game)
+
+
+def rebuild(messages):
+    """スナップショットと差分から盤面と現在のピースを復元する"""
+    rows, piece = None, None
+    for message in messages:
+        data = json.loads(message)
+        if data["type"] == "snapshot":
+            rows = list(data["board"])
+        for y, row in data.get("rows", []):
+            rows[y] = row
+        piece = data.get("piece", piece)
+    return rows, piece
+
+
+class TestBroadcast(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        """各テストの前に実行される初期化"""
+        self.scheduler = GameScheduler()
+        self.session = GameSession("a", WebZenTetrisGame(seed=1), Recorder(), DeltaStateEncoder())
+        self.scheduler.add(self.session)
+        self.tasks = []
+
+    async def asyncTearDown(self):
+        for task in self.tasks:
+            task.cancel()
+
+    def spectate(self, send, encoder=None, max_queue=8):
+        """観戦者を追加して送信ループを始める"""
+        return self.spectate_session("a", send, encoder, max_queue)
+
+    def spectate_session(self, session_id, send, encoder=None, max_queue=8):
+        """指定したセッションに観戦者を追加する"""
+        spectator = Spectator(send, max_queue)
+        self.tasks.append(asyncio.create_task(spectator.send_loop()))
+        self.scheduler.watch(session_id, spectator, encoder or create_encoder("2", None, shared=True))
+        return spectator
+
+    async def clear_line(self):
+        """一番下の行を揃えてハードドロップで消す"""
+        game = self.session.game
+        piece = Tetromino('I')
+        piece.x = piece.state.spawn_x
+        game.current_tetromino = piece
+        for x in range(BOARD_WIDTH):
+            if not piece.x <= x < piece.x + 4:
+                game.board.grid[BOARD_HEIGHT - 1][x] = COLORS['T']
+        await self.frame("hard_drop")
+
+    async def frame(self, action=None):
+        """入力を適用して1フレーム進め、配信する"""
+        if action:
+            self.session.push_input(action)
+        self.scheduler.tick()
+        self.scheduler.publish()
+        await asyncio.sleep(0)
+
+    async def test_frame_encoded_once_for_all_spectators(self):
+        """同じ形式の観戦者には1回だけエンコードした同じメッセージが届く"""
+        encoder = CountingEncoder()
+        senders = [Recorder() for _ in range(5)]
+        for sender in senders:
+            self.spectate(sender, encoder)
+        for action in ("move_left", None, "rotate", "hard_drop"):
+            await self.frame(action)
+
+        self.assertEqual(encoder.calls, 4)
+        first = senders[0].messages
+        self.assertEqual(json.loads(first[0])["type"], "snapshot")
+        for sender in senders[1:]:
+            self.assertEqual(len(sender.messages), len(first))
+            self.assertTrue(all(a is b for a, b in zip(sender.messages, first)))
+
+    async def test_slow_spectator_drops_frames_and_resyncs(self):
+        """遅い観戦者はゲームを止めずにフレームを捨て、キーフレームから追いつく"""
+        slow = BlockedSender()
+        spectator = self.spectate(slow, max_queue=4)
+        for frame in range(60):
+            await self.frame("move_left" if frame % 2 else "move_right")
+
+        # キューは上限を超えず、ゲームは進み続ける
+        self.assertLessEqual(len(spectator._queue), 4)
+        self.assertGreater(spectator.frames_dropped, 0)
+        self.assertEqual(self.session.game.frame, 60)
+
+        slow.open.set()
+        for action in ("hard_drop", "rotate", None):
+            await self.frame(action)
+        await asyncio.sleep(0.01)
+
+        # 捨てたフレームの後はスナップショットから再開し、現在の状態と一致する
+        resumed = [json.loads(message)["type"] for message in slow.messages]
+        self.assertIn("snapshot", resumed[1:])
+        expected = DeltaStateEncoder()
+        snapshot = json.loads(expected.encode(self.session.game))
+        self.assertEqual(rebuild(slow.messages), (snapshot["board"], snapshot["piece"]))
+
+    async def test_spectators_and_player_all_get_effect_events(self):
+        """ライン消去のイベントはプレイヤーと観戦者の両方に届く"""
+        binary = Recorder()
+        delta = Recorder()
+        self.spectate(binary, create_encoder(None, "binary", shared=True))
+        self.spectate(delta)
+        player = self.session.send
+        sender = asyncio.create_task(self.session.send_loop())
+        self.tasks.append(sender)
+        await self.frame()
+
+        await self.clear_line()
+        await asyncio.sleep(0.01)
+
+        def events(messages):
+            return [event["type"] for message in messages if isinstance(message, str)
+                    for event in json.loads(message).get("events", [])]
+
+        self.assertEqual(events(player.messages), ["line_clear"])
+        self.assertEqual(events(delta.messages), ["line_clear"])
+        # バイナリ形式: hello の後のフレームのうち1つにイベントが1件入る
+        frames = [message for message in binary.messages if isinstance(message, bytes)]
+        counts = [frame[BINARY_HEADER.size + BOARD_WIDTH * BOARD_HEIGHT // 2] for frame in frames]
+        self.assertEqual(sum(counts), 1)
+
+    async def test_spectators_get_events_after_restart(self):
+        """リスタートでイベント数が0に戻っても観戦者はライン消去を受け取る"""
+        delta = Recorder()
+        self.spectate(delta)
+        await self.frame()
+        await self.clear_line()
+        # リスタートと次のライン消去が配信の間に起きる（イベント数は再び1）
+        self.session.game.handle_input("restart")
+        await self.clear_line()
+        await asyncio.sleep(0.01)
+
+        events = [event["type"] for message in delta.messages
+                  for event in json.loads(message).get("events", [])]
+        self.assertEqual(events, ["line_clear", "line_clear"])
+
+    async def test_failing_encoder_ends_only_that_broadcast(self):
+        """観戦用エンコーダーのエラーはその配信だけを終わらせ、ゲームループは止めない"""
+        class BrokenEncoder(DeltaStateEncoder):
+            def encode(self, game):
+                raise ValueError("broken")
+
+        spectator = self.spectate(Recorder(), BrokenEncoder(shared=True))
+        other = GameSession("b", WebZenTetrisGame(seed=2), Recorder(), DeltaStateEncoder())
+        self.scheduler.add(other)
+        other_spectator = self.spectate_session("b", Recorder())
+
+        await self.frame("move_left")
+        await self.frame()
+
+        self.assertTrue(spectator.closed)
+        self.assertNotIn("a", self.scheduler.broadcasts)
+        self.assertIn("b", self.scheduler.broadcasts)
+        self.assertFalse(other_spectator.closed)
+        self.assertEqual(self.session.game.frame, 2)
+
+    async def test_watch_id_lookup_and_unwatch(self):
+        """観戦IDでセッションを探し、最後の観戦者が抜けると配信を止める"""
+        self.assertEqual(self.scheduler.find_watched(watch_id("a")), self.session)
+        self.assertNotEqual(watch_id("a"), "a")
+        self.assertIsNone(self.scheduler.find_watched("missing"))
+
+        spectator = self.spectate(Recorder())
+        self.assertIn("a", self.scheduler.broadcasts)
+        self.scheduler.unwatch("a", spectator)
+        self.assertNotIn("a", self.scheduler.broadcasts)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+Tests for TetrisEngine - pygameなしで動くヘッドレスエンジンをテスト
+"""
+import unittest
+import subprocess
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from zen_tetris.core import TetrisEngine, StepResult, Tetromino
+from zen_tetris.core.rules import drop_interval, line_clear_score
+from zen_tetris.constants import BOARD_WIDTH, BOARD_HEIGHT, COLORS, DROP_SPEED, MIN_DROP_SPEED
+
+
+class TestTetrisEngine(unittest.TestCase):
+
+    def setUp(self):
+        """各テストの前に実行される初期化"""
+        self.engine = TetrisEngine(seed=1)
+
+    def test_core_does_not_import_pygame(self):
+        """コアエンジンがpygameを読み込まない"""
+        src = os.path.join(os.path.dirname(__file__), '..', 'src')
+        code = ("import sys; sys.path.insert(0, %r); import zen_tetris.core; "
+                "print('pygame' in sys.modules)" % src)
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                                text=True, check=True).stdout
+        self.assertEqual(output.strip(), 'False')
+
+    def test_same_seed_same_pieces(self):
+        """同じシードなら同じピース列になる"""
+        other = TetrisEngine(seed=1)
+        for _ in range(20):
+            self.assertEqual(self.engine.current_tetromino.shape_type,
+                             other.current_tetromino.shape_type)
+            self.engine.step("hard_drop")
+            other.step("hard_drop")
+        self.assertEqual(self.engine.board.rows, other.board.rows)
+        self.assertEqual(self.engine.score, other.score)
+
+    def test_hard_drop_locks_piece(self):
+        """ハードドロップで即座にロックされ次のピースが出る"""
+        next_piece = self.engine.next_tetromino
+        result = self.engine.step("hard_drop")
+
+        self.assertIsInstance(result, StepResult)
+        self.assertTrue(result.locked)
+        self.assertEqual(self.engine.pieces_placed, 1)
+        self.assertIs(self.engine.current_tetromino, next_piece)
+        self.assertNotEqual(self.engine.board.rows[BOARD_HEIGHT - 1], 0)
+
+    def test_hard_drop_matches_soft_drops(self):
+        """ハードドロップが1マスずつ落とした場合と同じ位置に着地する"""
+        other = TetrisEngine(seed=1)
+        for _ in range(30):
+            rows = 0
+            while other.move(0, 1):
+                rows += 1
+            other.lock()
+            self.assertEqual(self.engine.hard_drop(), rows)
+            self.assertEqual(self.engine.board.rows, other.board.rows)
+            self.assertEqual(self.engine.board.get_column_heights(), other.board.get_column_heights())
+
+    def test_gravity_uses_elapsed_time(self):
+        """経過時間に応じてピースが落下する"""
+        y = self.engine.current_tetromino.y
+        self.engine.step(dt=DROP_SPEED - 1)
+        self.assertEqual(self.engine.current_tetromino.y, y)
+        self.engine.step(dt=1)
+        self.assertEqual(self.engine.current_tetromino.y, y + 1)
+
+    def test_pause_stops_time(self):
+        """一時停止中は時間が進まず操作も無視される"""
+        self.engine.step("pause")
+        y = self.engine.current_tetromino.y
+        self.engine.step("hard_drop", dt=DROP_SPEED * 10)
+        self.assertEqual(self.engine.current_tetromino.y, y)
+        self.assertEqual(self.engine.pieces_placed, 0)
+
+    def test_line_clear_scoring(self):
+        """ライン消去でスコアとコンボが更新される"""
+        piece = Tetromino('I')
+        piece.x = piece.state.spawn_x
+        self.engine.current_tetromino = piece
+        # Iミノが入る4列だけ空けて最下段を埋める
+        for x in range(BOARD_WIDTH):
+            if not piece.x <= x < piece.x + 4:
+                self.engine.board.grid[BOARD_HEIGHT - 1][x] = COLORS['T']
+
+        result = self.engine.step("hard_drop")
+
+        self.assertEqual(result.lines_cleared, 1)
+        self.assertEqual(self.engine.lines_cleared, 1)
+        self.assertEqual(self.engine.score, line_clear_score(1, 1, 0))
+        self.assertEqual(self.engine.combo_count, 1)
+        self.assertTrue(self.engine.board.is_empty())
+
+    def test_clear_delay_keeps_lines_until_elapsed(self):
+        """clear_delay の間は完成ラインが残る"""
+        engine = TetrisEngine(seed=2)
+        engine.clear_delay = 200
+        for x in range(BOARD_WIDTH):
+            engine.board.grid[BOARD_HEIGHT - 1][x] = COLORS['T']
+        engine.step("hard_drop")
+
+        self.assertEqual(engine.flash_lines, [BOARD_HEIGHT - 1])
+        engine.step(dt=100)
+        self.assertEqual(engine.lines_cleared, 0)
+        result = engine.step(dt=100)
+        self.assertEqual(result.lines_cleared, 1)
+        self.assertEqual(engine.flash_lines, [])
+
+    def test_lock_during_clear_delay_keeps_piece_on_stack(self):
+        """消去待ちのライン上に置いたピースは消去後も積み上がったまま"""
+        engine = TetrisEngine(seed=2)
+        engine.clear_delay = 200
+        piece = Tetromino('I')
+        piece.x = piece.state.spawn_x
+        engine.current_tetromino = piece
+        for x in range(BOARD_WIDTH):
+            if not piece.x <= x < piece.x + 4:
+                engine.board.grid[BOARD_HEIGHT - 1][x] = COLORS['T']
+        engine.step("hard_drop")
+        self.assertEqual(engine.flash_lines, [BOARD_HEIGHT - 1])
+
+        # 消去待ちの最下段の上にOミノを落とす
+        piece = Tetromino('O')
+        engine.current_tetromino = piece
+        result = engine.step("hard_drop")
+
+        self.assertEqual(result.lines_cleared, 1)
+        self.assertEqual(engine.board.rows[BOARD_HEIGHT - 2:], [0b11, 0b11])
+
+    def test_game_over_and_restart(self):
+        """積み上がるとゲームオーバーになり、restartで再開できる"""
+        for _ in range(200):
+            if self.engine.step("hard_drop").game_over:
+                break
+        self.assertTrue(self.engine.game_over)
+
+        self.engine.step("restart")
+        self.assertFalse(self.engine.game_over)
+        self.assertTrue(self.engine.board.is_empty())
+        self.assertEqual(self.engine.score, 0)
+
+    def test_drop_interval_has_floor(self):
+        """レベルが上がっても落下間隔は下限を下回らない"""
+        self.assertEqual(drop_interval(1), DROP_SPEED)
+        self.assertEqual(drop_interval(100), MIN_DROP_SPEED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Tests for server metrics - ヒストグラムとPrometheus形式の出力をテスト
+"""
+import unittest
+import asyncio
+import json
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from zen_tetris.server import DeltaStateEncoder, GameScheduler, GameSession, Histogram, SessionManager
+from zen_tetris.web_game import WebZenTetrisGame
+
+
+async def ignore(message):
+    """送信先のないクライアント"""
+
+
+def samples(text):
+    """コメント以外の行を名前（ラベル込み）と値の辞書にする"""
+    result = {}
+    for line in text.splitlines():
+        if not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            result[name] = float(value)
+    return result
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_buckets_are_cumulative(self):
+        """各バケットは上限以下の観測数を累積で数える"""
+        histogram = Histogram([1, 5], (("format", "delta"),))
+        for value in (0.5, 1, 3, 10):
+            histogram.observe(value)
+
+        lines = list(histogram.samples("size"))
+        self.assertEqual(lines, [
+            'size_bucket{format="delta",le="1"} 2',
+            'size_bucket{format="delta",le="5"} 3',
+            'size_bucket{format="delta",le="+Inf"} 4',
+            'size_sum{format="delta"} 14.5',
+            'size_count{format="delta"} 4',
+        ])
+        self.assertEqual(histogram.count, 4)
+
+
+class TestServerMetrics(unittest.IsolatedAsyncioTestCase):
+
+    async def test_loop_and_sessions_reported(self):
+        """ティック・入力・送信の計測値が出力に含まれる"""
+        scheduler = GameScheduler()
+        session = GameSession("a", WebZenTetrisGame(seed=1), ignore, DeltaStateEncoder())
+        scheduler.add(session)
+        task = asyncio.create_task(session.send_loop())
+
+        session.push_input("move_left")
+        session.push_input("rotate")
+        for _ in range(3):
+            scheduler.tick()
+            scheduler.publish()
+            await asyncio.sleep(0.01)
+        session.close()
+        await task
+
+        values = samples(scheduler.metrics.render(scheduler, SessionManager(scheduler)))
+        # 1ティックに1つのゲームだけを計測する
+        self.assertEqual(values["zen_tetris_game_update_seconds_count"], 3)
+        self.assertEqual(values['zen_tetris_input_batch_size_bucket{le="2"}'], 1)
+        self.assertEqual(values['zen_tetris_state_message_bytes_count{format="delta"}'], session.messages_sent)
+        self.assertEqual(values["zen_tetris_messages_sent_total"], session.messages_sent)
+        self.assertEqual(values["zen_tetris_bytes_sent_total"], session.bytes_sent)
+        self.assertEqual(values["zen_tetris_sessions_resumed_total"], 0)
+
+    async def test_totals_keep_removed_sessions(self):
+        """終了したセッションの送信数も合計に残る"""
+        scheduler = GameScheduler()
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        session = GameSession("a", WebZenTetrisGame(seed=1), send)
+        scheduler.add(session)
+        session.reply(json.dumps({"type": "pong"}))
+        task = asyncio.create_task(session.send_loop())
+        await asyncio.sleep(0.01)
+        session.close()
+        await task
+        scheduler.remove("a")
+
+        values = samples(scheduler.metrics.render(scheduler))
+        self.assertEqual(values["zen_tetris_messages_sent_total"], len(sent))
+        self.assertEqual(values["zen_tetris_sessions"], 0)
+
+    async def test_session_ids_not_exposed(self):
+        """セッションIDは再開・乗っ取りに使えるので、メトリクスに出さない"""
+        scheduler = GameScheduler()
+        session_id = "5f0c6a1e-2b7d-4c1a-9e3f-0d8b7a6c5e4f"
+        session = GameSession(session_id, WebZenTetrisGame(seed=1), ignore)
+        scheduler.add(session)
+        task = asyncio.create_task(session.send_loop())
+        scheduler.tick()
+        scheduler.publish()
+        await asyncio.sleep(0.01)
+        session.close()
+        await task
+
+        text = scheduler.metrics.render(scheduler, SessionManager(scheduler))
+        self.assertGreater(session.messages_sent, 0)
+        self.assertNotIn(session_id, text)
+
+
+if __name__ == '__main__':
+    unittest.main()
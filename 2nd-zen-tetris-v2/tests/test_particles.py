@@ -0,0 +1,158 @@
+"""
+Tests for particles - NumPyエンジンとスプライトアトラスをテスト
+"""
+import unittest
+import sys
+import os
+
+import numpy as np
+import pygame
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from zen_tetris.effects.engine import FIELDS, ParticleEngine
+from zen_tetris.effects.particles import ParticleSystem
+from zen_tetris.effects.sprites import ALPHA_LEVELS, ROTATION_BUCKETS, SIZE_BUCKETS, ParticleSpriteAtlas
+from zen_tetris.constants import PARTICLE_GRAVITY, PARTICLE_LIFETIME
+
+RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+
+
+class TestParticleEngine(unittest.TestCase):
+
+    def setUp(self):
+        """各テストの前に実行される初期化"""
+        self.engine = ParticleEngine(capacity=100, seed=1)
+
+    def test_batch_spawn(self):
+        """複数の発生源から一度にパーティクルを作る"""
+        self.engine.spawn([10, 20, 30], [5, 5, 5], [RED, BLUE, RED], count=4)
+        self.assertEqual(len(self.engine), 12)
+        self.assertEqual(self.engine.x[:12].tolist(), [10] * 4 + [20] * 4 + [30] * 4)
+        self.assertEqual(self.engine.colors().tolist(), [list(RED)] * 4 + [list(BLUE)] * 4 + [list(RED)] * 4)
+        self.assertEqual(self.engine.palette, [RED, BLUE])
+
+    def test_spawn_with_numpy_colors(self):
+        """色をNumPy配列で渡しても発生できる"""
+        self.engine.spawn([10, 20], [5, 5], np.array([RED, BLUE], dtype=np.uint8), count=2)
+        self.engine.spawn(30, 5, np.array(BLUE))
+        self.assertEqual(self.engine.colors().tolist(), [list(RED)] * 2 + [list(BLUE)] * 3)
+        self.assertEqual(self.engine.palette, [RED, BLUE])
+        self.assertIsInstance(self.engine.palette[0][0], int)
+
+    def test_update_integrates_physics(self):
+        """速度・重力・寿命が1フレーム分進む"""
+        self.engine.spawn(100, 100, RED, count=5)
+        x, y, vx, vy = (self.engine.data[:4, :5].copy())
+        self.engine.update()
+        np.testing.assert_allclose(self.engine.x[:5], x + vx, rtol=1e-6)
+        np.testing.assert_allclose(self.engine.y[:5], y + vy, rtol=1e-6)
+        np.testing.assert_allclose(self.engine.vy[:5], vy + PARTICLE_GRAVITY, rtol=1e-6)
+        self.assertTrue(np.all(self.engine.life[:5] == PARTICLE_LIFETIME - 1))
+
+    def test_swap_remove_keeps_survivors(self):
+        """死んだパーティクルだけが消え、残りの値はそのまま"""
+        self.engine.spawn(np.arange(20), 0, RED)
+        life = self.engine.life
+        life[[0, 3, 17, 19]] = 1
+        alive = [i for i in range(20) if i not in (0, 3, 17, 19)]
+        expected = sorted((self.engine.x[alive] + self.engine.vx[alive]).tolist())
+
+        self.engine.update()
+
+        self.assertEqual(len(self.engine), 16)
+        self.assertEqual(sorted(self.engine.x[:16].tolist()), expected)
+        self.assertTrue(np.all(self.engine.life[:16] > 0))
+
+    def test_capacity_evicts_oldest(self):
+        """上限を超えると寿命の短い古いパーティクルから消える"""
+        self.engine.spawn(0, 0, RED, count=60)
+        for _ in range(10):
+            self.engine.update()
+        self.engine.spawn(0, 0, BLUE, count=60)
+
+        self.assertEqual(len(self.engine), 100)
+        colors = self.engine.colors().tolist()
+        self.assertEqual(colors.count(list(BLUE)), 60)
+        self.assertEqual(colors.count(list(RED)), 40)
+
+    def test_oversized_batch(self):
+        """上限より大きい一括生成でも上限を守る"""
+        self.engine.spawn(0, 0, RED, count=250)
+        self.assertEqual(len(self.engine), 100)
+
+    def test_particles_expire(self):
+        """寿命が尽きるとすべて消える"""
+        self.engine.spawn([0, 50], [0, 50], RED, count=10)
+        for _ in range(PARTICLE_LIFETIME):
+            self.engine.update()
+        self.assertEqual(len(self.engine), 0)
+
+    def test_same_seed_same_particles(self):
+        """同じシードなら同じパーティクルになる"""
+        other = ParticleEngine(capacity=100, seed=1)
+        for engine in (self.engine, other):
+            engine.spawn([1, 2], [3, 4], RED, count=5)
+            engine.update()
+        np.testing.assert_array_equal(self.engine.data[:, :10], other.data[:, :10])
+        self.assertEqual(len(FIELDS), self.engine.data.shape[0])
+
+
+class TestParticleSystem(unittest.TestCase):
+
+    def test_effects_spawn_in_engine(self):
+        """エフェクトがエンジンにまとめて追加される"""
+        system = ParticleSystem(seed=2)
+        system.create_explosions([10, 40], [10, 10], [RED, BLUE], count=15)
+        system.create_tetris_effect(800, 600)
+        self.assertEqual(system.get_particle_count(), 30 + 80)
+        system.clear()
+        self.assertEqual(system.get_particle_count(), 0)
+
+    def test_draw_blits_sprites(self):
+        """スプライトでパーティクルが描画される"""
+        system = ParticleSystem(seed=2, atlas=ParticleSpriteAtlas([RED]))
+        system.create_explosion(50, 50, RED, count=10)
+        surface = pygame.Surface((100, 100))
+        system.draw(surface)
+        self.assertGreater(pygame.mask.from_threshold(surface, RED, (60, 60, 60, 255)).count(), 0)
+
+
+class TestParticleSpriteAtlas(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """アトラスの生成は一度だけ"""
+        cls.atlas = ParticleSpriteAtlas([RED])
+
+    def test_rects_inside_atlas(self):
+        """すべてのスプライトの領域がアトラスに収まる"""
+        self.assertEqual(self.atlas.rects.shape, (1, SIZE_BUCKETS, ALPHA_LEVELS, ROTATION_BUCKETS, 4))
+        width, height = self.atlas.surfaces[0].get_size()
+        rects = self.atlas.rects.reshape(-1, 4)
+        self.assertTrue(np.all(rects[:, 0] + rects[:, 2] <= width))
+        self.assertTrue(np.all(rects[:, 1] + rects[:, 3] <= height))
+
+    def test_new_color_rendered_on_demand(self):
+        """未知の色は初めて使うときに描かれる"""
+        atlas = ParticleSpriteAtlas([])
+        self.assertEqual(atlas.slots_for([BLUE, RED, BLUE]).tolist(), [0, 1, 0])
+        self.assertEqual(len(atlas.surfaces), 2)
+
+    def test_blit_sequence_centers_sprites(self):
+        """スプライトが粒子の中心に置かれ、透明な粒子は省かれる"""
+        blits = self.atlas.blit_sequence(
+            np.array([0, 0]), np.array([40.0, 10.0]), np.array([30.0, 10.0]),
+            np.array([6.0, 6.0]), np.array([0.0, 0.0]), np.array([255, 0])
+        )
+        self.assertEqual(len(blits), 1)
+        surface, dest, area = blits[0]
+        self.assertIs(surface, self.atlas.surfaces[0])
+        self.assertEqual(dest, (28, 18))
+        self.assertEqual(area[2:], [24, 24])
+
+
+if __name__ == '__main__':
+    unittest.main()
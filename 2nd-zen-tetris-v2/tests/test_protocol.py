@@ -0,0 +1,257 @@
+"""
+Tests for state protocol - スナップショットと差分エンコードのテスト
+"""
+import unittest
+import json
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from zen_tetris.server.protocol import (
+    BINARY_HEADER, EVENT_CODES, EVENT_RECORD, PALETTE, BinaryStateEncoder, DeltaStateEncoder,
+    JsonStateEncoder, create_encoder
+)
+from zen_tetris.core import Tetromino
+from zen_tetris.web_game import WebZenTetrisGame
+from zen_tetris.constants import BOARD_WIDTH, BOARD_HEIGHT, COLORS
+
+
+class ProtocolClient:
+    """テスト用に差分を適用して状態を復元するクライアント"""
+
+    FIELDS = ("piece", "next", "score", "lines", "level", "game_over", "paused", "flash")
+
+    def __init__(self):
+        self.rows = None
+        self.fields = {}
+        self.events = []
+
+    def apply(self, message):
+        data = json.loads(message)
+        if data["type"] == "snapshot":
+            self.rows = list(data["board"])
+        for y, row in data.get("rows", []):
+            self.rows[y] = row
+        for name in self.FIELDS:
+            if name in data:
+                self.fields[name] = data[name]
+        self.events.extend(data.get("events", []))
+
+    def board(self):
+        """get_state と同じ形式の盤面"""
+        return [[{"filled": digit != "0", "color": list(PALETTE[int(digit, 16)]) if digit != "0" else None}
+                 for digit in row] for row in self.rows]
+
+
+def complete_bottom_row(game):
+    """Iピースのハードドロップで最下段がそろう盤面にする"""
+    piece = Tetromino('I')
+    piece.x = piece.state.spawn_x
+    game.current_tetromino = piece
+    for x in range(BOARD_WIDTH):
+        if not piece.x <= x < piece.x + 4:
+            game.board.grid[BOARD_HEIGHT - 1][x] = COLORS['T']
+
+
+class TestDeltaStateEncoder(unittest.TestCase):
+
+    def setUp(self):
+        """各テストの前に実行される初期化"""
+        self.game = WebZenTetrisGame(seed=3)
+        self.encoder = DeltaStateEncoder()
+        self.client = ProtocolClient()
+
+    def test_snapshot_then_nothing(self):
+        """最初はスナップショット、変化がなければNone"""
+        snapshot = json.loads(self.encoder.encode(self.game))
+        self.assertEqual(snapshot["type"], "snapshot")
+        self.assertEqual(snapshot["v"], 2)
+        self.assertEqual(len(snapshot["board"]), BOARD_HEIGHT)
+        self.assertEqual(snapshot["board"][0], "0" * BOARD_WIDTH)
+        self.assertIsNone(self.encoder.encode(self.game))
+
+    def test_delta_contains_only_changes(self):
+        """差分には変化した項目だけが含まれる"""
+        self.encoder.encode(self.game)
+        self.game.step("move_right")
+        delta = json.loads(self.encoder.encode(self.game))
+        self.assertEqual(delta["type"], "delta")
+        self.assertEqual(set(delta) - {"type", "v", "frame"}, {"piece"})
+
+        self.game.step("hard_drop")
+        delta = json.loads(self.encoder.encode(self.game))
+        self.assertIn("rows", delta)
+        self.assertIn("piece", delta)
+        self.assertNotIn("score", delta)
+
+    def test_line_clear_event(self):
+        """ライン消去イベントに消えた行の色が含まれる"""
+        self.encoder.encode(self.game)
+        complete_bottom_row(self.game)
+        self.game.step("hard_drop")
+
+        delta = json.loads(self.encoder.encode(self.game))
+        event = delta["events"][0]
+        self.assertEqual(event["type"], "line_clear")
+        self.assertEqual(event["rows"], [BOARD_HEIGHT - 1])
+        t_index = format(PALETTE.index(COLORS['T']), 'x')
+        i_index = format(PALETTE.index(COLORS['I']), 'x')
+        self.assertEqual(event["colors"][0], t_index * 3 + i_index * 4 + t_index * 3)
+        self.assertIsInstance(event["seed"], int)
+        self.assertEqual(len(self.game.events), 0)
+
+    def test_json_state_carries_events(self):
+        """プロトコル1でもイベントが一度だけ送られる"""
+        encoder = JsonStateEncoder()
+        complete_bottom_row(self.game)
+        self.game.step("hard_drop")
+
+        state = json.loads(encoder.encode(self.game))
+        self.assertNotIn("particles", state)
+        self.assertEqual([event["type"] for event in state["events"]], ["line_clear"])
+        self.assertEqual(json.loads(encoder.encode(self.game))["events"], [])
+
+    def test_deltas_rebuild_full_state(self):
+        """差分を適用し続けると get_state と同じ盤面になる"""
+        actions = ["move_left", "rotate", "hard_drop", "move_right", "move_right", "hard_drop"]
+        for i in range(120):
+            self.game.step(actions[i % len(actions)], dt=16)
+            message = self.encoder.encode(self.game)
+            if message is not None:
+                self.client.apply(message)
+
+        state = json.loads(json.dumps(self.game.get_state()))
+        self.assertEqual(self.client.board(), state["board"])
+        self.assertEqual(self.client.fields["score"], state["score"])
+        self.assertEqual(self.client.fields["next"], self.game.next_tetromino.shape_type)
+
+    def test_skipped_frames_fold_into_next_delta(self):
+        """送らなかったフレームの変化は次の差分にまとめられる"""
+        self.client.apply(self.encoder.encode(self.game))
+        for _ in range(3):
+            self.game.step("hard_drop")
+        self.client.apply(self.encoder.encode(self.game))
+
+        state = json.loads(json.dumps(self.game.get_state()))
+        self.assertEqual(self.client.board(), state["board"])
+
+    def test_create_encoder_negotiation(self):
+        """v=2 で差分プロトコル、format=binary でバイナリ、それ以外は従来のJSON"""
+        self.assertIsInstance(create_encoder("2"), DeltaStateEncoder)
+        self.assertIsInstance(create_encoder(None), JsonStateEncoder)
+        self.assertIsInstance(create_encoder("1"), JsonStateEncoder)
+        self.assertIsInstance(create_encoder(None, "binary"), BinaryStateEncoder)
+
+
+class TestEffectEvents(unittest.TestCase):
+
+    def clear_line(self, game):
+        """1ライン消してイベントを返す"""
+        complete_bottom_row(game)
+        game.step("hard_drop")
+        return list(game.events)
+
+    def test_same_seed_same_effects(self):
+        """同じシードのゲームは同じエフェクトの種を出す"""
+        first = self.clear_line(WebZenTetrisGame(seed=5))
+        second = self.clear_line(WebZenTetrisGame(seed=5))
+        self.assertEqual(first[0]["seed"], second[0]["seed"])
+
+    def test_effects_do_not_change_piece_sequence(self):
+        """エフェクトの種がピースの順番に影響しない"""
+        cleared = WebZenTetrisGame(seed=5)
+        plain = WebZenTetrisGame(seed=5)
+        self.clear_line(cleared)
+        plain.step("hard_drop")
+        self.assertEqual(cleared.next_tetromino.shape_type, plain.next_tetromino.shape_type)
+
+    def test_no_server_particles(self):
+        """サーバーはパーティクルの状態を持たない"""
+        game = WebZenTetrisGame(seed=5)
+        self.clear_line(game)
+        self.assertFalse(hasattr(game, "particle_system"))
+
+
+class TestBinaryStateEncoder(unittest.TestCase):
+
+    def setUp(self):
+        """各テストの前に実行される初期化"""
+        self.game = WebZenTetrisGame(seed=3)
+        self.encoder = BinaryStateEncoder()
+
+    def decode_board(self, frame):
+        """4ビットの盤面を色のリストに戻す"""
+        packed = frame[BINARY_HEADER.size:BINARY_HEADER.size + BOARD_WIDTH * BOARD_HEIGHT // 2]
+        cells = []
+        for byte in packed:
+            cells.extend([byte & 0x0F, byte >> 4])
+        return [[PALETTE[cells[y * BOARD_WIDTH + x]] for x in range(BOARD_WIDTH)]
+                for y in range(BOARD_HEIGHT)]
+
+    def test_greeting_describes_tables(self):
+        """最初のJSONにパレットとピース表が含まれる"""
+        hello = json.loads(self.encoder.greeting())
+        self.assertEqual(hello["type"], "hello")
+        self.assertEqual(hello["format"], "binary")
+        self.assertEqual(len(hello["palette"]), len(PALETTE))
+        self.assertEqual(len(hello["pieces"]["T"]), 4)
+
+    def test_frame_layout(self):
+        """ヘッダー・盤面・パーティクルが固定長で詰められる"""
+        self.game.board.grid[BOARD_HEIGHT - 1][0] = COLORS['T']
+        self.game.board.grid[BOARD_HEIGHT - 1][9] = COLORS['L']
+        self.game.score = 1234
+
+        frame = self.encoder.encode(self.game)
+        self.assertIsInstance(frame, bytes)
+        self.assertEqual(len(frame), BINARY_HEADER.size + 100 + 1)
+
+        header = BINARY_HEADER.unpack_from(frame)
+        piece = self.game.current_tetromino
+        self.assertEqual(header[2], 1234)
+        self.assertEqual(header[6:9], (piece.rotation, piece.x, piece.y))
+
+        board = self.decode_board(frame)
+        self.assertEqual(board, [[self.game.board.get_block_color(x, y) for x in range(BOARD_WIDTH)]
+                                 for y in range(BOARD_HEIGHT)])
+
+    def test_long_game_counters_fit(self):
+        """長いゲームのレベル・ライン数・スコアでもフレームを作れる"""
+        self.game.level = 300
+        self.game.lines_cleared = 70000
+        self.game.score = 2 ** 33
+
+        header = BINARY_HEADER.unpack_from(self.encoder.encode(self.game))
+        self.assertEqual(header[2:5], (0xFFFFFFFF, 70000, 300))
+
+    def test_event_records(self):
+        """ライン消去イベントが種と消えた行の色を持つ"""
+        complete_bottom_row(self.game)
+        self.game.step("hard_drop")
+        event = self.game.events[0]
+
+        frame = self.encoder.encode(self.game)
+        offset = BINARY_HEADER.size + 100
+        self.assertEqual(frame[offset], 1)
+        code, seed, rows = EVENT_RECORD.unpack_from(frame, offset + 1)
+        self.assertEqual((code, seed, rows), (EVENT_CODES["line_clear"], event["seed"], 1))
+
+        offset += 1 + EVENT_RECORD.size
+        self.assertEqual(frame[offset], BOARD_HEIGHT - 1)
+        packed = frame[offset + 1:offset + 1 + BOARD_WIDTH // 2]
+        cells = [PALETTE[nibble] for byte in packed for nibble in (byte & 0x0F, byte >> 4)]
+        self.assertEqual(cells, event["colors"][0])
+        self.assertEqual(len(self.game.events), 0)
+
+    def test_unchanged_frame_not_sent(self):
+        """前回と同じフレームは送らない"""
+        self.assertIsNotNone(self.encoder.encode(self.game))
+        self.assertIsNone(self.encoder.encode(self.game))
+        self.game.step("move_left")
+        self.assertIsNotNone(self.encoder.encode(self.game))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Tests for input recordings - 入力の記録と高速リプレイをテスト
+"""
+import unittest
+import glob
+import json
+import os
+import random
+import sys
+import tempfile
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from zen_tetris.server import (
+    GameScheduler, GameSession, InputLog, MemoryStore, RecordingError, SessionManager, load_recording,
+    replay_recording, verify_recording
+)
+from zen_tetris.web_game import WebZenTetrisGame
+
+ACTIONS = ["move_left", "move_right", "rotate", "hard_drop", "move_down", "pause", "restart"]
+
+
+async def ignore(message):
+    """送信先のないクライアント"""
+
+
+def play(scheduler, session, rng, ticks):
+    """サーバーと同じ順序でランダムな入力を適用しながらティックを進める"""
+    for _ in range(ticks):
+        if rng.random() < 0.2:
+            # 一時停止と再開始はまれにする
+            action = rng.choice(ACTIONS) if rng.random() < 0.05 else rng.choice(ACTIONS[:5])
+            session.push_input(action)
+        scheduler.tick()
+
+
+class TestReplay(unittest.TestCase):
+
+    def test_replay_reproduces_game(self):
+        """記録した入力をリプレイすると同じゲームになる"""
+        scheduler = GameScheduler()
+        game = WebZenTetrisGame(seed=7)
+        game.input_log = InputLog(seed=7, tick_ms=scheduler.tick_ms)
+        session = GameSession("a", game, ignore)
+        scheduler.add(session)
+        play(scheduler, session, random.Random(3), 6000)
+        game.handle_input("hard_drop")
+
+        recording = json.loads(json.dumps(game.input_log.to_dict(game, "a")))
+        replayed = replay_recording(recording)
+        self.assertEqual(replayed.frame, game.frame)
+        self.assertEqual(replayed.board.rows, game.board.rows)
+        self.assertEqual((replayed.score, replayed.pieces_placed, replayed.current_tetromino.shape_type),
+                         (game.score, game.pieces_placed, game.current_tetromino.shape_type))
+        self.assertEqual(verify_recording(recording), [])
+
+    def test_replay_across_tick_rate_changes(self):
+        """ティックレートが途中で変わっても記録は同じゲームを再現する"""
+        scheduler = GameScheduler(min_tick_rate=20)
+        game = WebZenTetrisGame(seed=11)
+        game.input_log = InputLog(seed=11, tick_ms=game.substep_ms)
+        session = GameSession("a", game, ignore)
+        scheduler.add(session)
+        rng = random.Random(4)
+        for rate in (60, 20, 30, 60):
+            scheduler.set_tick_rate(rate)
+            play(scheduler, session, rng, 500)
+
+        recording = json.loads(json.dumps(game.input_log.to_dict(game, "a")))
+        self.assertEqual(replay_recording(recording).board.rows, game.board.rows)
+        self.assertEqual(verify_recording(recording), [])
+
+    def test_tampered_score_detected(self):
+        """記録と異なるスコアは検出される"""
+        game = WebZenTetrisGame(seed=1)
+        game.input_log = InputLog(seed=1)
+        for _ in range(3):
+            game.handle_input("hard_drop")
+            game.tick(game.input_log.tick_ms)
+        recording = game.input_log.to_dict(game)
+        recording["result"]["score"] += 100
+
+        differences = verify_recording(recording)
+        self.assertEqual(len(differences), 1)
+        self.assertIn("score", differences[0])
+
+    def test_load_rejects_other_files(self):
+        """記録ではないファイルは RecordingError になる"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "other.json")
+            with open(path, "w") as f:
+                json.dump({"type": "game_state"}, f)
+            with self.assertRaises(RecordingError):
+                load_recording(path)
+
+
+class TestSessionRecording(unittest.IsolatedAsyncioTestCase):
+
+    async def test_sessions_recorded_and_resumed_from_snapshot(self):
+        """切断したセッションの記録が保存され、再開後の記録はスナップショットから始まる"""
+        with tempfile.TemporaryDirectory() as directory:
+            store = MemoryStore()
+            scheduler = GameScheduler()
+            manager = SessionManager(scheduler, store, recordings=directory)
+            rng = random.Random(5)
+
+            session_id = None
+            for _ in range(2):
+                session_id, game, _ = await manager.open_game(session_id)
+                session = GameSession(session_id, game, ignore)
+                scheduler.add(session)
+                play(scheduler, session, rng, 2000)
+                await manager.release(session)
+
+            paths = sorted(glob.glob(os.path.join(directory, "*.json")))
+            self.assertEqual(len(paths), 2)
+            self.assertEqual(manager.recordings_saved, 2)
+            recordings = [load_recording(path) for path in paths]
+            self.assertEqual(sorted(recording["snapshot"] is None for recording in recordings), [False, True])
+            for recording in recordings:
+                self.assertEqual(recording["session"], session_id)
+                self.assertEqual(verify_recording(recording), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
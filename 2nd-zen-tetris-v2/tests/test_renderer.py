@@ -0,0 +1,130 @@
+"""
+Tests for GameRenderer - レイヤーキャッシュと差分描画をテスト
+"""
+import unittest
+import sys
+import os
+
+import pygame
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from zen_tetris.components.board import Board
+from zen_tetris.components.renderer import BOARD_RECT, GameRenderer
+from zen_tetris.components.tetromino import Tetromino
+from zen_tetris.core.engine import TetrisEngine
+from zen_tetris.effects.particles import ParticleSystem
+from zen_tetris.constants import BLOCK_SIZE, BOARD_HEIGHT, BOARD_OFFSET_X, BOARD_OFFSET_Y, COLORS, WINDOW_HEIGHT, WINDOW_WIDTH
+
+
+class RenderedGame(TetrisEngine):
+    """ウィンドウなしで描画できるゲーム"""
+
+    board_class = Board
+    piece_class = Tetromino
+
+    def reset(self):
+        self.flash_timer = 0
+        self.particle_system = ParticleSystem(seed=1)
+        super().reset()
+
+
+class TestGameRenderer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """フォントは一度だけ用意する"""
+        pygame.font.init()
+        cls.fonts = (pygame.font.Font(None, 48), pygame.font.Font(None, 32), pygame.font.Font(None, 24))
+
+    def setUp(self):
+        """各テストの前に実行される初期化"""
+        self.game = RenderedGame(seed=2)
+        self.screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.renderer = GameRenderer(self.screen, *self.fonts)
+
+    def full_frame(self):
+        """同じ状態を最初から描いた画面"""
+        screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        GameRenderer(screen, *self.fonts).render(self.game)
+        return pygame.image.tobytes(screen, "RGB")
+
+    def assert_matches_full_frame(self):
+        self.assertEqual(pygame.image.tobytes(self.screen, "RGB"), self.full_frame())
+
+    def test_first_frame_is_full(self):
+        """最初のフレームは画面全体を更新する"""
+        self.assertEqual(self.renderer.render(self.game), [self.screen.get_rect()])
+
+    def test_idle_frame_updates_only_piece(self):
+        """変化がなければ落下中のピースとゴーストの周りだけを更新する"""
+        self.renderer.render(self.game)
+        dirty = self.renderer.render(self.game)
+        area = sum(rect.width * rect.height for rect in dirty)
+        self.assertLess(area, WINDOW_WIDTH * WINDOW_HEIGHT // 25)
+        self.assert_matches_full_frame()
+
+    def test_moves_and_locks_match_full_redraw(self):
+        """移動・固定・パーティクルの後も全体描画と同じ画面になる"""
+        self.renderer.render(self.game)
+        for action in ("move_left", "move_left", "rotate", "hard_drop", "move_right", "hard_drop"):
+            self.game.step(action)
+            self.game.particle_system.create_explosion(200, 300, COLORS['T'], 5)
+            self.game.particle_system.update()
+            self.renderer.render(self.game)
+            self.assert_matches_full_frame()
+
+    def test_board_change_redraws_board(self):
+        """盤面が変わると盤面の領域が更新される"""
+        self.renderer.render(self.game)
+        self.game.step("hard_drop")
+        self.assertIn(BOARD_RECT, self.renderer.render(self.game))
+
+    def test_flashing_lines_match_board_draw(self):
+        """消去中のラインの点滅が Board.draw と同じになる"""
+        self.renderer.render(self.game)
+        grid = self.game.board.grid
+        for x in range(10):
+            grid[BOARD_HEIGHT - 1][x] = COLORS['S']
+            if x % 3:
+                grid[BOARD_HEIGHT - 2][x] = COLORS['Z']
+        self.game.flash_lines = [BOARD_HEIGHT - 2]
+        self.game.flash_timer = 5
+        self.renderer.render(self.game)
+
+        expected = self.renderer.static.copy()
+        self.game.board.draw(expected, BOARD_OFFSET_X, BOARD_OFFSET_Y, self.game.flash_lines, 5)
+        piece = self.game.current_tetromino
+        GameRenderer._draw_ghost(expected, piece, self.game.board.landing_y(piece))
+        piece.draw(expected, BOARD_OFFSET_X, BOARD_OFFSET_Y)
+        area = BOARD_RECT.inflate(4, 4).clip(self.screen.get_rect())
+        self.assertEqual(pygame.image.tobytes(self.screen.subsurface(area), "RGB"),
+                         pygame.image.tobytes(expected.subsurface(area), "RGB"))
+
+    def test_ghost_marks_landing_row(self):
+        """ゴーストがハードドロップの着地位置に描かれる"""
+        self.renderer.render(self.game)
+        piece = self.game.current_tetromino
+        landing = self.game.board.landing_y(piece)
+        dx, dy = piece.state.blocks[0]
+        block = pygame.Rect(BOARD_OFFSET_X + (piece.x + dx) * BLOCK_SIZE,
+                            BOARD_OFFSET_Y + (landing + dy) * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE)
+        self.assertNotEqual(self.screen.get_at(block.inflate(-2, -2).topleft),
+                            self.renderer.base.get_at(block.inflate(-2, -2).topleft))
+
+        self.game.step("hard_drop")
+        self.assertEqual(self.game.board.get_block_color(piece.x + dx, landing + dy), piece.color)
+
+    def test_overlay_drawn_once(self):
+        """ポーズ画面は表示したときだけ描画する"""
+        self.renderer.render(self.game)
+        self.game.step("pause")
+        self.assertEqual(self.renderer.render(self.game), [self.screen.get_rect()])
+        self.assertEqual(self.renderer.render(self.game), [])
+        self.game.step("pause")
+        self.assertEqual(self.renderer.render(self.game), [self.screen.get_rect()])
+
+
+if __name__ == '__main__':
+    unittest.main()
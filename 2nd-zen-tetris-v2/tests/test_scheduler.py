@@ -0,0 +1,274 @@
+"""
+Tests for GameScheduler - 固定タイムステップのゲームループをテスト
+"""
+import unittest
+import asyncio
+import json
+import time
+import sys
+import os
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from zen_tetris.server import (
+    GAME_OVER, IDLE, PAUSED, BinaryStateEncoder, DeltaStateEncoder, GameScheduler, GameSession
+)
+from zen_tetris.web_game import WebZenTetrisGame
+from zen_tetris.constants import DROP_SPEED
+
+
+class RecordingSender:
+    """送信されたメッセージを記録する"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def __call__(self, message):
+        self.messages.append(json.loads(message))
+
+
+class SlowGame(WebZenTetrisGame):
+    """1ティックに時間がかかるゲーム"""
+
+    delay = 0.03
+
+    def tick(self, dt):
+        time.sleep(self.delay)
+        super().tick(dt)
+
+
+class TestGameScheduler(unittest.IsolatedAsyncioTestCase):
+
+    async def test_inputs_applied_on_next_tick(self):
+        """キューに入れた入力が次のティックで適用される"""
+        scheduler = GameScheduler()
+        session = GameSession("a", WebZenTetrisGame(seed=1), RecordingSender())
+        scheduler.add(session)
+
+        session.push_input("hard_drop")
+        self.assertEqual(session.game.pieces_placed, 0)
+        scheduler.tick()
+        self.assertEqual(session.game.pieces_placed, 1)
+        self.assertTrue(session.inputs.empty())
+
+    async def test_fixed_timestep_gravity(self):
+        """ティックごとに固定時間だけゲームが進む"""
+        scheduler = GameScheduler(tick_rate=50)
+        session = GameSession("a", WebZenTetrisGame(seed=1), RecordingSender())
+        scheduler.add(session)
+
+        y = session.game.current_tetromino.y
+        for _ in range(int(DROP_SPEED / scheduler.tick_ms)):
+            scheduler.tick()
+        self.assertEqual(session.game.current_tetromino.y, y + 1)
+
+    async def test_game_speed_independent_of_tick_rate(self):
+        """20Hzで進めても60Hzと同じ速さ・同じ結果でゲームが進む"""
+        fast = WebZenTetrisGame(seed=3)
+        slow = WebZenTetrisGame(seed=3)
+        actions = ["move_left", "rotate", None, "move_right", "hard_drop", None]
+        for i in range(600):
+            action = actions[i % len(actions)]
+            if action:
+                slow.handle_input(action)
+                fast.handle_input(action)
+            slow.tick(50)
+            for _ in range(3):
+                fast.tick(1000 / 60)
+
+        self.assertEqual(slow.frame, fast.frame)
+        self.assertEqual(slow.board.rows, fast.board.rows)
+        self.assertEqual((slow.score, slow.pieces_placed, slow.current_tetromino.y),
+                         (fast.score, fast.pieces_placed, fast.current_tetromino.y))
+
+    async def test_adaptive_tick_rate(self):
+        """負荷が高いとティックレートを下げ、余裕ができると戻す"""
+        scheduler = GameScheduler(min_tick_rate=20)
+        self.assertEqual(scheduler.tick_rates, [60, 30, 20])
+
+        self.assertEqual(scheduler.adapt(0.9), 30)
+        self.assertEqual(scheduler.adapt(0.9), 20)
+        self.assertEqual(scheduler.adapt(0.9), 20)
+        # 30Hzに戻すと負荷が0.6になるので、まだ戻さない
+        self.assertEqual(scheduler.adapt(0.4), 20)
+        self.assertEqual(scheduler.adapt(0.2), 30)
+        self.assertEqual(scheduler.adapt(0.2), 60)
+        self.assertEqual(scheduler.stats.rate_changes, 4)
+        self.assertEqual(scheduler.tick_ms, 1000 / 60)
+
+        fixed = GameScheduler()
+        self.assertEqual(fixed.tick_rates, [60])
+        self.assertEqual(fixed.adapt(1.0), 60)
+
+    async def run_frames(self, scheduler, frames):
+        """ティックと配信を繰り返し、送信ループを動かす"""
+        for _ in range(frames):
+            scheduler.tick()
+            scheduler.publish()
+            await asyncio.sleep(0)
+
+    async def test_paused_and_finished_games_sleep_until_input(self):
+        """一時停止中とゲームオーバーのゲームは進めも送りもせず、入力で起きる"""
+        scheduler = GameScheduler()
+        sender = RecordingSender()
+        session = GameSession("a", WebZenTetrisGame(seed=1), sender)
+        scheduler.add(session)
+        task = asyncio.create_task(session.send_loop())
+
+        session.push_input("pause")
+        await self.run_frames(scheduler, 30)
+        self.assertEqual(session.state, PAUSED)
+        self.assertEqual(len(sender.messages), 1)
+        self.assertTrue(sender.messages[0]["paused"])
+        frame = session.game.frame
+
+        session.push_input("pause")
+        await self.run_frames(scheduler, 3)
+        self.assertNotEqual(session.state, PAUSED)
+        self.assertEqual(session.game.frame, frame + 3)
+        self.assertEqual(len(sender.messages), 4)
+
+        session.game.game_over = True
+        await self.run_frames(scheduler, 30)
+        self.assertEqual(session.state, GAME_OVER)
+        self.assertEqual(len(sender.messages), 4)
+
+        session.close()
+        await task
+
+    async def test_idle_games_sent_less_often(self):
+        """入力のないまま動いているゲームは送信頻度を落とす"""
+        scheduler = GameScheduler(idle_after=30)
+        sender = RecordingSender()
+        session = GameSession("a", WebZenTetrisGame(seed=1), sender)
+        scheduler.add(session)
+        task = asyncio.create_task(session.send_loop())
+
+        session.last_input -= 60
+        await self.run_frames(scheduler, 60)
+        self.assertEqual(session.state, IDLE)
+        self.assertEqual(session.game.frame, 60)
+        self.assertEqual(len(sender.messages), 10)
+
+        # 入力が来ると毎ティック送信に戻る
+        session.push_input("move_left")
+        await self.run_frames(scheduler, 6)
+        self.assertEqual(len(sender.messages), 16)
+
+        session.close()
+        await task
+
+    async def test_send_loop_skips_stale_states(self):
+        """送信が追いつかない場合は最新の状態だけを送る"""
+        sender = RecordingSender()
+        session = GameSession("a", WebZenTetrisGame(seed=1), sender)
+        session.mark_dirty()
+        session.game.step("hard_drop")
+        session.mark_dirty()
+        session.reply(json.dumps({"type": "pong"}))
+
+        task = asyncio.create_task(session.send_loop())
+        await asyncio.sleep(0.01)
+        session.close()
+        await task
+
+        self.assertEqual(len(sender.messages), 2)
+        self.assertEqual(sender.messages[0], {"type": "pong"})
+        self.assertEqual(sender.messages[1]["type"], "game_state")
+        # ハードドロップ後の状態が送られる
+        self.assertEqual(sender.messages[1]["board"], json.loads(json.dumps(session.game.get_state()))["board"])
+        self.assertEqual(session.frames_skipped, 1)
+
+    async def test_delta_session_sends_nothing_when_unchanged(self):
+        """差分プロトコルでは変化がなければ送信しない"""
+        sender = RecordingSender()
+        session = GameSession("a", WebZenTetrisGame(seed=1), sender, DeltaStateEncoder())
+        task = asyncio.create_task(session.send_loop())
+
+        session.mark_dirty()
+        await asyncio.sleep(0.01)
+        session.mark_dirty()
+        await asyncio.sleep(0.01)
+        session.game.step("move_left")
+        session.mark_dirty()
+        await asyncio.sleep(0.01)
+        session.close()
+        await task
+
+        self.assertEqual([m["type"] for m in sender.messages], ["snapshot", "delta"])
+        self.assertIn("piece", sender.messages[1])
+
+    async def test_binary_session_greets_first(self):
+        """バイナリ形式ではJSONのhelloの後にバイナリフレームが届く"""
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        session = GameSession("a", WebZenTetrisGame(seed=1), send, BinaryStateEncoder())
+        task = asyncio.create_task(session.send_loop())
+        session.mark_dirty()
+        await asyncio.sleep(0.01)
+        session.close()
+        await task
+
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(json.loads(messages[0])["type"], "hello")
+        self.assertIsInstance(messages[1], bytes)
+
+    async def test_run_keeps_tick_rate(self):
+        """ループが目標のティックレートを保つ"""
+        scheduler = GameScheduler(tick_rate=100)
+        sender = RecordingSender()
+        session = GameSession("a", WebZenTetrisGame(seed=1), sender)
+        scheduler.add(session)
+        task = asyncio.create_task(session.send_loop())
+
+        start = time.perf_counter()
+        scheduler.start()
+        await asyncio.sleep(0.3)
+        await scheduler.stop()
+        elapsed = time.perf_counter() - start
+        session.close()
+        await task
+
+        expected = elapsed * 100
+        self.assertGreater(scheduler.stats.ticks, expected * 0.8)
+        self.assertLessEqual(scheduler.stats.ticks, expected + 2)
+        self.assertGreater(len(sender.messages), 0)
+
+    async def test_slow_ticks_catch_up(self):
+        """処理が遅れるとまとめてティックを実行して追いつく"""
+        scheduler = GameScheduler(tick_rate=100, max_catch_up=10)
+        scheduler.add(GameSession("a", SlowGame(seed=1), RecordingSender()))
+
+        start = time.perf_counter()
+        scheduler.start()
+        await asyncio.sleep(0.4)
+        await scheduler.stop()
+        elapsed = time.perf_counter() - start
+
+        stats = scheduler.stats
+        self.assertGreater(stats.overruns, 0)
+        self.assertGreater(stats.catch_up_ticks, 0)
+        self.assertGreater(stats.ticks, stats.iterations)
+        self.assertLessEqual(stats.ticks, elapsed * 100 + 2)
+
+    async def test_failing_session_is_removed(self):
+        """エラーを出したセッションだけが外される"""
+        scheduler = GameScheduler()
+        broken = GameSession("broken", WebZenTetrisGame(seed=1), RecordingSender())
+        broken.game.tick = None  # 呼び出すとTypeError
+        healthy = GameSession("healthy", WebZenTetrisGame(seed=1), RecordingSender())
+        scheduler.add(broken)
+        scheduler.add(healthy)
+
+        scheduler.tick()
+
+        self.assertEqual(list(scheduler.sessions), ["healthy"])
+        self.assertTrue(broken.closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,307 @@
+"""
+Tests for the session layer - スナップショット・ストア・ハッシュリング・セッション再開をテスト
+"""
+import unittest
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from zen_tetris.server import (
+    ABANDONED, GameScheduler, GameSession, HashRing, MemoryStore, SessionManager, SnapshotError, Spectator,
+    SqliteStore, create_encoder, create_store, restore_game, snapshot_game
+)
+from zen_tetris.server.snapshot import SNAPSHOT_SIZE
+from zen_tetris.web_game import WebZenTetrisGame
+from zen_tetris.constants import BOARD_HEIGHT, BOARD_WIDTH, COLORS
+
+ACTIONS = ["move_left", "move_right", "rotate", "hard_drop", "move_down", None]
+
+
+async def ignore(message):
+    """送信先のないクライアント"""
+
+
+def play(game, rng, frames):
+    """ランダムな入力でゲームを進める"""
+    for _ in range(frames):
+        game.step(rng.choice(ACTIONS))
+        game.tick(1000 / 60)
+        if game.game_over:
+            game.step("restart")
+
+
+def assert_same_game(test, game, other):
+    """2つのゲームの状態が一致することを確認"""
+    test.assertEqual(game.board.rows, other.board.rows)
+    test.assertEqual([list(row) for row in game.board.grid], [list(row) for row in other.board.grid])
+    test.assertEqual(game.board.get_column_holes(), other.board.get_column_holes())
+    for name in ("score", "lines_cleared", "level", "combo_count", "pieces_placed", "game_over",
+                 "paused", "flash_lines", "flash_timer", "drop_timer", "clear_timer"):
+        test.assertEqual(getattr(game, name), getattr(other, name), name)
+    for name in ("current_tetromino", "next_tetromino"):
+        piece, other_piece = getattr(game, name), getattr(other, name)
+        test.assertEqual((piece.shape_type, piece.rotation, piece.x, piece.y),
+                         (other_piece.shape_type, other_piece.rotation, other_piece.x, other_piece.y))
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def test_restored_game_continues_identically(self):
+        """復元したゲームは同じ入力で元のゲームと同じように進む"""
+        rng = random.Random(1)
+        game = WebZenTetrisGame(seed=4)
+        play(game, rng, 2000)
+
+        data = snapshot_game(game)
+        self.assertEqual(len(data), SNAPSHOT_SIZE)
+        restored = restore_game(data)
+        assert_same_game(self, game, restored)
+
+        seed = rng.random()
+        play(game, random.Random(seed), 3000)
+        play(restored, random.Random(seed), 3000)
+        assert_same_game(self, game, restored)
+        self.assertEqual([event["seed"] for event in game.events],
+                         [event["seed"] for event in restored.events])
+
+    def test_snapshot_during_line_clear(self):
+        """消去待ちのラインと点滅も保存される"""
+        game = WebZenTetrisGame(seed=1)
+        for x in range(BOARD_WIDTH - 1):
+            game.board.grid[BOARD_HEIGHT - 1][x] = COLORS['I']
+        piece = game.current_tetromino
+        while piece.shape_type != 'I':
+            game.current_tetromino = piece = game._create_random_tetromino()
+        piece.rotate()
+        piece.x = BOARD_WIDTH - 1 - piece.state.blocks[0][0]
+        game.step("hard_drop")
+        self.assertTrue(game.flash_lines)
+
+        restored = restore_game(snapshot_game(game))
+        assert_same_game(self, game, restored)
+        for _ in range(30):
+            game.tick(1000 / 60)
+            restored.tick(1000 / 60)
+        self.assertEqual(restored.lines_cleared, game.lines_cleared)
+        self.assertEqual(restored.flash_lines, [])
+
+    def test_corrupt_snapshot_rejected(self):
+        """壊れたスナップショットは SnapshotError になる"""
+        data = snapshot_game(WebZenTetrisGame(seed=1))
+        with self.assertRaises(SnapshotError):
+            restore_game(data[:-1])
+        with self.assertRaises(SnapshotError):
+            restore_game(b"\xff" + data[1:])
+
+
+class TestHashRing(unittest.TestCase):
+
+    def setUp(self):
+        """各テストの前に実行される初期化"""
+        self.keys = [f"session-{i}" for i in range(2000)]
+
+    def test_same_mapping_in_every_process(self):
+        """同じノード構成なら別のインスタンスでも同じ割り当てになる"""
+        ring = HashRing(["a", "b", "c"])
+        other = HashRing(["c", "a", "b"])
+        self.assertEqual([ring.node_for(key) for key in self.keys],
+                         [other.node_for(key) for key in self.keys])
+
+    def test_keys_spread_over_nodes(self):
+        """キーが各ノードにおおむね均等に分かれる"""
+        ring = HashRing(["a", "b", "c", "d"])
+        counts = {node: 0 for node in ring.nodes}
+        for key in self.keys:
+            counts[ring.node_for(key)] += 1
+        for count in counts.values():
+            self.assertGreater(count, len(self.keys) / 4 * 0.6)
+
+    def test_adding_node_moves_few_keys(self):
+        """ノードを追加しても新しいノードに移るキーだけが動く"""
+        ring = HashRing(["a", "b", "c"])
+        before = {key: ring.node_for(key) for key in self.keys}
+        ring.add("d")
+        moved = [key for key in self.keys if ring.node_for(key) != before[key]]
+        self.assertTrue(all(ring.node_for(key) == "d" for key in moved))
+        self.assertLess(len(moved), len(self.keys) / 2)
+
+        ring.remove("d")
+        self.assertEqual({key: ring.node_for(key) for key in self.keys}, before)
+        self.assertEqual(len(ring), 3)
+
+
+class TestStores(unittest.TestCase):
+
+    def check_store(self, store):
+        """保存・読み込み・削除の基本動作"""
+        self.assertIsNone(store.load("a"))
+        store.save_many({"a": b"1", "b": b"2"})
+        store.save_many({"a": b"3"})
+        self.assertEqual(store.load("a"), b"3")
+        self.assertEqual(sorted(store.keys()), ["a", "b"])
+        store.delete("a")
+        self.assertIsNone(store.load("a"))
+
+    def test_memory_store(self):
+        """メモリストア"""
+        self.check_store(create_store("memory"))
+
+    def test_sqlite_store_shared_between_connections(self):
+        """SQLiteストアは別の接続（別のワーカー）からも読める"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "sessions.db")
+            store = create_store(f"sqlite:{path}")
+            self.assertIsInstance(store, SqliteStore)
+            self.check_store(store)
+
+            other = SqliteStore(path)
+            self.assertEqual(other.load("b"), b"2")
+            store.close()
+            other.close()
+
+    def test_unknown_store(self):
+        """不明なストア指定はエラーになる"""
+        with self.assertRaises(ValueError):
+            create_store("redis://localhost")
+
+
+class TestSessionManager(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        """各テストの前に実行される初期化"""
+        self.store = MemoryStore()
+        self.workers = ["ws://w1", "ws://w2", "ws://w3"]
+        self.manager = self.create_manager("ws://w1")
+
+    def create_manager(self, worker):
+        """ストアを共有するワーカーを作る"""
+        return SessionManager(GameScheduler(), self.store, self.workers, worker)
+
+    async def open_session(self, manager, session_id=None):
+        """クライアントの接続を再現する"""
+        session_id, game, resumed = await manager.open_game(session_id)
+        session = GameSession(session_id, game, ignore)
+        manager.scheduler.add(session)
+        return session, resumed
+
+    async def test_new_sessions_belong_to_worker(self):
+        """新しいセッションIDは作成したワーカーに割り当てられる"""
+        for _ in range(20):
+            self.assertEqual(self.manager.owner(self.manager.new_session_id()), "ws://w1")
+        other = self.create_manager("ws://w2")
+        self.assertEqual(other.owner(other.new_session_id()), "ws://w2")
+
+    async def test_unknown_worker_rejected(self):
+        """ワーカー一覧にないワーカー名はエラーになる"""
+        with self.assertRaises(ValueError):
+            self.create_manager("ws://w9")
+
+    async def test_resume_after_worker_restart(self):
+        """ワーカーが再起動しても最後のスナップショットから再開できる"""
+        session, resumed = await self.open_session(self.manager)
+        self.assertFalse(resumed)
+        play(session.game, random.Random(2), 500)
+        await self.manager.save_all()
+
+        # 再起動したワーカーは同じストアから読み込む
+        restarted = self.create_manager("ws://w1")
+        resumed_session, resumed = await self.open_session(restarted, session.session_id)
+        self.assertTrue(resumed)
+        self.assertEqual(resumed_session.session_id, session.session_id)
+        assert_same_game(self, session.game, resumed_session.game)
+
+    async def test_reconnect_takes_over_live_session(self):
+        """接続し直すと動いているセッションのゲームを引き継ぐ"""
+        session, _ = await self.open_session(self.manager)
+        session.game.step("hard_drop")
+        new_session, resumed = await self.open_session(self.manager, session.session_id)
+
+        self.assertTrue(resumed)
+        self.assertTrue(session.closed)
+        self.assertIs(new_session.game, session.game)
+
+        # 古い接続の終了処理は新しいセッションを止めない
+        await self.manager.release(session)
+        self.assertIs(self.manager.scheduler.sessions[session.session_id], new_session)
+
+    async def test_release_saves_snapshot(self):
+        """切断したセッションはスナップショットを残して停止する"""
+        session, _ = await self.open_session(self.manager)
+        session.game.step("hard_drop")
+        await self.manager.release(session)
+
+        self.assertNotIn(session.session_id, self.manager.scheduler.sessions)
+        self.assertEqual(restore_game(self.store.load(session.session_id)).pieces_placed, 1)
+
+    async def test_unchanged_games_not_saved_again(self):
+        """変化のないゲームは定期保存で書き直さない"""
+        session, _ = await self.open_session(self.manager)
+        await self.manager.save_all()
+        await self.manager.save_all()
+        self.assertEqual(self.manager.snapshots_saved, 1)
+        session.game.step("move_left")
+        await self.manager.save_all()
+        self.assertEqual(self.manager.snapshots_saved, 2)
+
+    async def test_abandoned_sessions_evicted(self):
+        """長く入力のないセッションは保存され、通知を送ってから追い出される"""
+        sent = []
+        gate = asyncio.Event()
+
+        async def slow_send(message):
+            await gate.wait()
+            sent.append(message)
+
+        session_id, game, _ = await self.manager.open_game()
+        idle = GameSession(session_id, game, slow_send)
+        self.manager.scheduler.add(idle)
+        playing, _ = await self.open_session(self.manager)
+        idle.game.step("hard_drop")
+        spectator = Spectator(ignore)
+        self.manager.scheduler.watch(idle.session_id, spectator, create_encoder("2", None, shared=True))
+        idle.last_input -= self.manager.abandon_after + 1
+
+        # 状態の送信中に追い出しが起きる
+        idle.mark_dirty()
+        task = asyncio.create_task(idle.send_loop())
+        await asyncio.sleep(0)
+        self.assertEqual(await self.manager.evict_abandoned(), 1)
+        self.assertEqual(list(self.manager.scheduler.sessions), [playing.session_id])
+        self.assertEqual(idle.state, ABANDONED)
+        self.assertTrue(spectator.closed)
+        self.assertEqual(self.manager.scheduler.broadcasts, {})
+        self.assertEqual(self.manager.stats()["evicted"], 1)
+
+        # 送信中の状態の後に通知が届いてから送信ループが終わる
+        gate.set()
+        await asyncio.wait_for(task, 1)
+        self.assertTrue(idle.closed)
+        self.assertEqual(len(sent), 2)
+        self.assertEqual(json.loads(sent[-1]), {"type": "evicted"})
+
+        # 後から接続し直すとスナップショットから再開できる
+        resumed_session, resumed = await self.open_session(self.manager, idle.session_id)
+        self.assertTrue(resumed)
+        self.assertEqual(resumed_session.game.pieces_placed, 1)
+
+    async def test_missing_or_foreign_session_starts_new_game(self):
+        """知らないIDや他のワーカーのIDでは新しいゲームを始める"""
+        session_id, _, resumed = await self.manager.open_game("missing")
+        self.assertFalse(resumed)
+        self.assertTrue(self.manager.is_local(session_id))
+
+        foreign = self.create_manager("ws://w2").new_session_id()
+        session_id, _, resumed = await self.manager.open_game(foreign)
+        self.assertNotEqual(session_id, foreign)
+        self.assertFalse(resumed)
+        self.assertEqual(json.loads(json.dumps(self.manager.stats()))["workers"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
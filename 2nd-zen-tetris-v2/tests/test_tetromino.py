@@ -9,6 +9,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from zen_tetris.components.tetromino import Tetromino
+from zen_tetris.core.pieces import ROTATIONS
 from zen_tetris.constants import TETROMINO_SHAPES, COLORS
 
 
@@ -125,6 +126,53 @@ class TestTetromino(unittest.TestCase):
         
         copy.shape[0][0] = 'X'
         self.assertNotEqual(copy.shape, original.shape)
+    
+    def test_rotation_tables_match_matrix_rotation(self):
+        """回転テーブルが行列の時計回り回転と一致することをテスト"""
+        for shape_type, shape in TETROMINO_SHAPES.items():
+            matrix = [row[:] for row in shape]
+            for rotation, state in enumerate(ROTATIONS[shape_type]):
+                with self.subTest(shape_type=shape_type, rotation=rotation):
+                    self.assertEqual([list(row) for row in state.matrix], matrix)
+                    
+                    # ブロック座標・行マスク・サイズが行列から導出されている
+                    expected_blocks = [(x, y) for y, row in enumerate(matrix)
+                                       for x, cell in enumerate(row) if cell == '1']
+                    self.assertEqual(list(state.blocks), expected_blocks)
+                    for y, row in enumerate(matrix):
+                        for x, cell in enumerate(row):
+                            self.assertEqual(bool(state.row_masks[y] >> x & 1), cell == '1')
+                    self.assertEqual((state.width, state.height), (len(matrix[0]), len(matrix)))
+                
+                rows = len(matrix)
+                matrix = [[matrix[rows - 1 - i][j] for i in range(rows)]
+                          for j in range(len(matrix[0]))]
+    
+    def test_shape_assignment_selects_rotation(self):
+        """shapeへの代入で対応する回転状態が選ばれることをテスト"""
+        tetromino = Tetromino('T')
+        original_shape = [row[:] for row in tetromino.shape]
+        
+        tetromino.rotate()
+        self.assertEqual(tetromino.rotation, 1)
+        
+        tetromino.shape = original_shape
+        self.assertEqual(tetromino.rotation, 0)
+        self.assertEqual(tetromino.shape, original_shape)
+        
+        # 回転で作れない形状は拒否される
+        with self.assertRaises(ValueError):
+            tetromino.shape = [['1', '1', '1', '1']]
+    
+    def test_copy_shares_rotation_tables(self):
+        """コピーが回転テーブルを共有しつつ独立して回転できることをテスト"""
+        original = Tetromino('J')
+        copy = original.copy()
+        self.assertIs(copy.state, original.state)
+        
+        copy.rotate()
+        self.assertEqual(original.rotation, 0)
+        self.assertEqual(copy.rotation, 1)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,74 @@
+"""
+Tests for TextCache - 文字列と数字グリフのキャッシュをテスト
+"""
+import unittest
+import sys
+import os
+
+import pygame
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from zen_tetris.components.text import TextCache
+
+INK = (60, 79, 61)
+GOLD = (212, 175, 55)
+
+
+class TestTextCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """フォントは一度だけ用意する"""
+        pygame.font.init()
+        cls.font = pygame.font.Font(None, 32)
+
+    def setUp(self):
+        """各テストの前に実行される初期化"""
+        self.cache = TextCache(max_entries=4)
+
+    def test_same_text_reuses_surface(self):
+        """同じフォント・文字列・色なら同じサーフェスを返す"""
+        first = self.cache.render(self.font, "PAUSED", INK)
+        self.assertIs(self.cache.render(self.font, "PAUSED", INK), first)
+        self.assertIsNot(self.cache.render(self.font, "PAUSED", GOLD), first)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_least_recently_used_is_evicted(self):
+        """上限を超えると最も長く使われていない文字列が消える"""
+        kept = self.cache.render(self.font, "a", INK)
+        for text in ("b", "c", "d"):
+            self.cache.render(self.font, text, INK)
+        self.cache.render(self.font, "a", INK)
+        self.cache.render(self.font, "e", INK)
+
+        self.assertEqual(len(self.cache), 4)
+        self.assertIs(self.cache.render(self.font, "a", INK), kept)
+        misses = self.cache.misses
+        self.cache.render(self.font, "b", INK)
+        self.assertEqual(self.cache.misses, misses + 1)
+
+    def test_numbers_use_digit_glyphs(self):
+        """数字は1桁ずつのグリフから組み立てる"""
+        cache = TextCache()
+        surface = pygame.Surface((300, 40), pygame.SRCALPHA)
+        for score in range(0, 1000, 7):
+            cache.blit_number(surface, self.font, "Score: ", score, INK, (0, 0))
+        # ラベルと10個の数字だけが描画される
+        self.assertEqual(len(cache), 11)
+
+    def test_number_layout(self):
+        """数字はラベルの右に並び、幅は文字列全体とほぼ同じ"""
+        surface = pygame.Surface((300, 40), pygame.SRCALPHA)
+        rect = self.cache.blit_number(surface, self.font, "Lines: ", 1234, INK, (10, 5))
+        label_width = self.font.size("Lines: ")[0]
+        self.assertEqual(rect.topleft, (10, 5))
+        self.assertAlmostEqual(rect.width, self.font.size("Lines: 1234")[0], delta=2)
+        self.assertGreater(rect.width, label_width)
+        self.assertGreater(pygame.mask.from_surface(surface.subsurface(
+            (10 + label_width, 5, rect.width - label_width, rect.height))).count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,65 +7,64 @@ FastAPI server with WebSocket support for browser-based gameplay.
 import sys
 import os
 import json
+import time
 import asyncio
-import uuid
-from typing import Dict, Any, Optional
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 import uvicorn
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from zen_tetris.web_game import WebZenTetrisGame
+from zen_tetris.server import (
+    ABANDONED, GameScheduler, GameSession, SessionManager, Spectator, create_encoder, create_store
+)
+from zen_tetris.server.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
 
-app = FastAPI(title="ZEN Tetris v2", description="Browser-based zen tetris game")
+# Cluster settings (see start_cluster.py); a lone server needs none of them:
+#   ZEN_TETRIS_STORE    "memory" (default) or "sqlite:<path>" shared by all workers
+#   ZEN_TETRIS_WORKERS  comma-separated websocket base URLs of all workers
+#   ZEN_TETRIS_WORKER   this worker's websocket base URL
+# and for recording every game's inputs (see replay_benchmark.py):
+#   ZEN_TETRIS_RECORDINGS  directory for the recordings
+# and for the game loop:
+#   ZEN_TETRIS_MIN_TICK_RATE  slowest tick rate under load (default 20; 60 keeps it fixed)
+#   ZEN_TETRIS_ABANDON_AFTER  seconds without input before a session is evicted (default 600; 0 never)
+WORKERS = [url for url in os.environ.get("ZEN_TETRIS_WORKERS", "").split(",") if url]
+WORKER = os.environ.get("ZEN_TETRIS_WORKER", WORKERS[0] if WORKERS else "local")
 
-# Templates and static files
-templates = Jinja2Templates(directory="web_templates")
-app.mount("/static", StaticFiles(directory="web_static"), name="static")
+# Shared fixed-step loop advancing every active game, ticking slower under load
+scheduler = GameScheduler(min_tick_rate=int(os.environ.get("ZEN_TETRIS_MIN_TICK_RATE", "20")))
+
+# Routing, resuming and snapshotting of this worker's sessions
+ABANDON_AFTER = float(os.environ.get("ZEN_TETRIS_ABANDON_AFTER", "600"))
+sessions = SessionManager(scheduler, create_store(os.environ.get("ZEN_TETRIS_STORE")), WORKERS, WORKER,
+                          recordings=os.environ.get("ZEN_TETRIS_RECORDINGS"),
+                          abandon_after=ABANDON_AFTER or None)
 
 # Active game sessions
-active_games: Dict[str, WebZenTetrisGame] = {}
-active_connections: Dict[str, WebSocket] = {}
+active_games = scheduler.sessions
 
 
-class ConnectionManager:
-    """Manages WebSocket connections for game sessions."""
-    
-    def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
-    
-    async def connect(self, websocket: WebSocket, session_id: str):
-        """Accept WebSocket connection and create game session."""
-        await websocket.accept()
-        self.active_connections[session_id] = websocket
-        
-        # Create new game instance
-        active_games[session_id] = WebZenTetrisGame()
-        print(f"🎋 New game session created: {session_id}")
-    
-    def disconnect(self, session_id: str):
-        """Remove connection and clean up game session."""
-        if session_id in self.active_connections:
-            del self.active_connections[session_id]
-        if session_id in active_games:
-            del active_games[session_id]
-        print(f"🎋 Game session ended: {session_id}")
-    
-    async def send_game_state(self, session_id: str, game_state: Dict[str, Any]):
-        """Send game state to client."""
-        if session_id in self.active_connections:
-            try:
-                await self.active_connections[session_id].send_text(json.dumps(game_state))
-            except Exception as e:
-                print(f"Error sending game state: {e}")
-                self.disconnect(session_id)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the game loop and snapshots for the lifetime of the server."""
+    scheduler.start()
+    sessions.start()
+    yield
+    await sessions.stop()
+    await scheduler.stop()
+    sessions.store.close()
+
 
+app = FastAPI(title="ZEN Tetris v2", description="Browser-based zen tetris game", lifespan=lifespan)
 
-manager = ConnectionManager()
+# Templates and static files
+templates = Jinja2Templates(directory="web_templates")
+app.mount("/static", StaticFiles(directory="web_static"), name="static")
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -74,61 +73,177 @@ async def get_game(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
+@app.get("/watch", response_class=HTMLResponse)
+async def get_watch_page(request: Request):
+    """Serve the spectator page showing several live boards."""
+    return templates.TemplateResponse("watch.html", {"request": request})
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {
         "status": "healthy",
         "active_sessions": len(active_games),
+        "session_states": scheduler.state_counts(),
+        "scheduler": scheduler.stats.as_dict(),
+        "sessions": sessions.stats(),
+        "cpu_seconds": round(time.process_time(), 3),
         "version": "2.0.0"
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: loop timing, encoding, sending and traffic totals."""
+    return Response(scheduler.metrics.render(scheduler, sessions), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/sessions")
+async def list_sessions():
+    """List this worker's running games for spectators, by watch ID."""
+    return {
+        "worker": sessions.worker,
+        "sessions": [
+            {
+                "watch": session.watch_id,
+                "score": session.game.score,
+                "lines": session.game.lines_cleared,
+                "level": session.game.level,
+                "game_over": session.game.game_over,
+                "state": session.state,
+                "spectators": len(scheduler.broadcasts.get(session_id, ())),
+            }
+            for session_id, session in active_games.items()
+        ],
+    }
+
+
+@app.get("/route/{session_id}")
+async def route(session_id: str):
+    """Get the worker owning a session, for proxies routing by session ID."""
+    return {"session": session_id, "worker": sessions.owner(session_id)}
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    """Main WebSocket endpoint for game communication."""
-    session_id = str(uuid.uuid4())
+    """Main WebSocket endpoint for game communication.
+    
+    This coroutine only receives input; the scheduler advances the game and
+    the session's send loop delivers states.
+    """
+    await websocket.accept()
+    
+    # Clients opt in to the delta protocol with ?v=2 or binary frames with ?format=binary,
+    # and resume a session with ?session=<id>
+    params = websocket.query_params
+    requested = params.get("session")
+    if requested and not sessions.is_local(requested):
+        # The session lives on another worker; the client reconnects there
+        await websocket.send_text(json.dumps({"type": "redirect", "worker": sessions.owner(requested)}))
+        await websocket.close()
+        return
+    
+    encoder = create_encoder(params.get("v"), params.get("format"))
+    
+    async def send(message):
+        if isinstance(message, bytes):
+            await websocket.send_bytes(message)
+        else:
+            await websocket.send_text(message)
+    
+    async def send_until_evicted():
+        await session.send_loop()
+        if session.state == ABANDONED:
+            # Evicted for inactivity and the notice is delivered: end the connection,
+            # which ends the receive loop below
+            try:
+                await websocket.close(code=1000, reason="evicted")
+            except Exception:
+                pass
+    
+    session_id, game, resumed = await sessions.open_game(requested)
+    session = GameSession(session_id, game, send, encoder)
+    session.reply(json.dumps({"type": "session", "id": session_id, "resumed": resumed}))
+    session.mark_dirty()
+    sender = asyncio.create_task(send_until_evicted())
+    scheduler.add(session)
+    print(f"🎋 Game session {'resumed' if resumed else 'created'}: {session_id}")
     
     try:
-        await manager.connect(websocket, session_id)
-        game = active_games[session_id]
-        
-        # Send initial game state
-        await manager.send_game_state(session_id, game.get_state())
-        
-        # Main game loop
-        while True:
+        while not session.closed:
+            data = await websocket.receive_text()
             try:
-                # Handle incoming messages (user input)
-                data = await asyncio.wait_for(websocket.receive_text(), timeout=0.016)  # ~60 FPS
                 message = json.loads(data)
                 
                 if message["type"] == "input":
-                    game.handle_input(message["action"])
+                    session.push_input(message["action"])
                 elif message["type"] == "ping":
-                    await websocket.send_text(json.dumps({"type": "pong"}))
-                    
-            except asyncio.TimeoutError:
-                # No input received, continue game loop
-                pass
+                    session.reply(json.dumps({"type": "pong"}))
             except Exception as e:
                 print(f"Input handling error: {e}")
-                continue
-            
-            # Update game state
-            game.update()
-            
-            # Send updated state to client
-            await manager.send_game_state(session_id, game.get_state())
-            
-            # Control game speed (60 FPS)
-            await asyncio.sleep(1/60)
-            
+    
     except WebSocketDisconnect:
-        manager.disconnect(session_id)
+        pass
     except Exception as e:
         print(f"WebSocket error: {e}")
-        manager.disconnect(session_id)
+    finally:
+        session.close()
+        sender.cancel()
+        try:
+            await sessions.release(session)
+        except Exception as e:
+            print(f"Session save error: {e}")
+        print(f"🎋 Game session ended: {session_id}")
+
+
+@app.websocket("/ws/watch")
+async def spectator_endpoint(websocket: WebSocket):
+    """Spectator WebSocket: ?game=<watch ID>, with the same format parameters as /ws.
+    
+    The game loop encodes each frame once for all spectators of a session
+    and format; this connection only drains its own bounded queue.
+    """
+    await websocket.accept()
+    
+    params = websocket.query_params
+    session = scheduler.find_watched(params.get("game", ""))
+    if session is None:
+        await websocket.send_text(json.dumps({"type": "error", "message": "No such game on this worker"}))
+        await websocket.close()
+        return
+    
+    async def send(message):
+        if isinstance(message, bytes):
+            await websocket.send_bytes(message)
+        else:
+            await websocket.send_text(message)
+    
+    async def send_until_closed():
+        await spectator.send_loop()
+        # The game was evicted (or the connection failed): end the connection
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+    
+    session_id = session.session_id
+    spectator = Spectator(send)
+    sender = asyncio.create_task(send_until_closed())
+    scheduler.watch(session_id, spectator, create_encoder(params.get("v"), params.get("format"), shared=True))
+    
+    try:
+        # Spectators send nothing; wait for the disconnect
+        while not spectator.closed:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        print(f"Spectator WebSocket error: {e}")
+    finally:
+        spectator.close()
+        sender.cancel()
+        scheduler.unwatch(session_id, spectator)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,170 @@
+/**
+ * ZEN Tetris v2 Spectator Client
+ * Shows up to 16 live games of this server, each from its own spectator
+ * WebSocket stream (protocol 2 snapshots and deltas).
+ */
+
+const MAX_BOARDS = 16;
+const SESSION_POLL_MS = 5000;
+const CELL_SIZE = 14;
+
+/**
+ * One watched game: its stream and a small canvas.
+ */
+class SpectatorBoard {
+    constructor(watchId, container) {
+        this.watchId = watchId;
+        this.closed = false;
+        this.dirty = false;
+
+        // Protocol 2 state: tables, board rows and fields
+        this.tables = null;
+        this.rows = null;
+        this.fields = {};
+
+        this.element = document.createElement('div');
+        this.element.className = 'board';
+        this.canvas = document.createElement('canvas');
+        this.canvas.width = 10 * CELL_SIZE;
+        this.canvas.height = 20 * CELL_SIZE;
+        this.ctx = this.canvas.getContext('2d');
+        this.stats = document.createElement('div');
+        this.stats.className = 'board-stats';
+        this.element.append(this.canvas, this.stats);
+        container.appendChild(this.element);
+
+        this.connect();
+    }
+
+    connect() {
+        const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+        const game = encodeURIComponent(this.watchId);
+        this.ws = new WebSocket(`${protocol}//${window.location.host}/ws/watch?game=${game}&v=2`);
+
+        this.ws.onmessage = (event) => {
+            const data = JSON.parse(event.data);
+            if (data.type === 'snapshot') {
+                // Sent when we join and whenever we fell behind and missed deltas
+                this.tables = { palette: data.palette, pieces: data.pieces };
+                this.rows = data.board.slice();
+                this.fields = {};
+                this.applyFields(data);
+            } else if (data.type === 'delta' && this.rows) {
+                for (const [y, row] of data.rows || []) {
+                    this.rows[y] = row;
+                }
+                this.applyFields(data);
+            }
+        };
+
+        this.ws.onclose = () => {
+            this.closed = true;
+            this.element.classList.add('ended');
+        };
+    }
+
+    applyFields(data) {
+        for (const name of ['piece', 'score', 'lines', 'level', 'game_over', 'paused']) {
+            if (name in data) {
+                this.fields[name] = data[name];
+            }
+        }
+        this.dirty = true;
+    }
+
+    draw() {
+        if (!this.dirty || !this.rows) return;
+        this.dirty = false;
+
+        const ctx = this.ctx;
+        ctx.clearRect(0, 0, this.canvas.width, this.canvas.height);
+        for (let y = 0; y < this.rows.length; y++) {
+            for (let x = 0; x < 10; x++) {
+                const index = parseInt(this.rows[y][x], 16);
+                if (index !== 0) {
+                    this.drawCell(x, y, this.tables.palette[index]);
+                }
+            }
+        }
+
+        const piece = this.fields.piece;
+        if (piece) {
+            const [shape, rotation, px, py] = piece;
+            const color = this.tables.palette[Object.keys(this.tables.pieces).indexOf(shape) + 1];
+            for (const [dx, dy] of this.tables.pieces[shape][rotation]) {
+                if (py + dy >= 0) {
+                    this.drawCell(px + dx, py + dy, color);
+                }
+            }
+        }
+
+        const state = this.fields.game_over ? ' ・ ゲームオーバー' : this.fields.paused ? ' ・ ポーズ' : '';
+        this.stats.textContent = `スコア ${this.fields.score} ・ ライン ${this.fields.lines}${state}`;
+    }
+
+    drawCell(x, y, color) {
+        if (!color) return;
+        const [r, g, b] = color;
+        this.ctx.fillStyle = `rgb(${r}, ${g}, ${b})`;
+        this.ctx.fillRect(x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE - 1, CELL_SIZE - 1);
+    }
+
+    close() {
+        this.ws.close();
+        this.element.remove();
+    }
+}
+
+/**
+ * Grid of boards kept in step with the server's running games.
+ */
+class SpectatorScreen {
+    constructor() {
+        this.container = document.getElementById('boards');
+        this.emptyMessage = document.getElementById('emptyMessage');
+        this.boards = new Map();
+
+        this.poll();
+        setInterval(() => this.poll(), SESSION_POLL_MS);
+        requestAnimationFrame(() => this.render());
+    }
+
+    async poll() {
+        let listing;
+        try {
+            const response = await fetch('/sessions');
+            listing = await response.json();
+        } catch (error) {
+            console.log('🎋 Cannot list games:', error);
+            return;
+        }
+
+        // Drop boards whose game has ended, then fill free places with new games
+        const running = new Set(listing.sessions.map((game) => game.watch));
+        for (const [watchId, board] of this.boards) {
+            if (board.closed || !running.has(watchId)) {
+                board.close();
+                this.boards.delete(watchId);
+            }
+        }
+        for (const game of listing.sessions) {
+            if (this.boards.size >= MAX_BOARDS) break;
+            if (!this.boards.has(game.watch)) {
+                this.boards.set(game.watch, new SpectatorBoard(game.watch, this.container));
+            }
+        }
+        this.emptyMessage.style.display = this.boards.size ? 'none' : 'block';
+    }
+
+    render() {
+        for (const board of this.boards.values()) {
+            board.draw();
+        }
+        requestAnimationFrame(() => this.render());
+    }
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    console.log('🎋 Initializing ZEN Tetris v2 Spectator Client...');
+    window.spectatorScreen = new SpectatorScreen();
+});
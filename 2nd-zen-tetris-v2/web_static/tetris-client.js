@@ -3,15 +3,129 @@
  * JavaScript client for browser-based gameplay with WebSocket communication.
  */
 
+// Protocol version requested from the server (2 = snapshot + deltas)
+const PROTOCOL_VERSION = 2;
+
+// Open the page with ?format=binary to receive packed binary frames instead
+const WIRE_FORMAT = new URLSearchParams(window.location.search).get('format') === 'binary' ? 'binary' : 'json';
+
+// Binary frame layout (see zen_tetris/server/protocol.py)
+const BINARY_FORMAT_VERSION = 3;
+const BINARY_HEADER_SIZE = 21;
+const EVENT_RECORD_SIZE = 6;
+const EVENT_TYPES = { 1: 'line_clear', 2: 'tetris' };
+
+/**
+ * Seeded random number generator (mulberry32) returning floats in [0, 1).
+ * Effect events carry a seed so every client draws the same particles.
+ */
+function seededRandom(seed) {
+    let state = seed >>> 0;
+    return () => {
+        state = (state + 0x6d2b79f5) >>> 0;
+        let t = state;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+}
+
+// sessionStorage key remembering this tab's game session
+const SESSION_STORAGE_KEY = 'zenTetrisSession';
+
+// Whether a piece block is inside the 10x20 board
+const isVisible = (block) => block.x >= 0 && block.x < 10 && block.y >= 0 && block.y < 20;
+
+// The server may send as few as 20 states per second under load; the
+// current piece glides from its old to its new cells over at most one
+// state interval instead of jumping
+const MAX_GLIDE_MS = 50;
+const MAX_GLIDE_CELLS = 2;
+
+// Offset between two placements of the same piece, or null if it did not just slide
+function pieceShift(previous, piece) {
+    if (!previous || !piece || previous.length === 0 || previous.length !== piece.length) return null;
+    const dx = piece[0].x - previous[0].x;
+    const dy = piece[0].y - previous[0].y;
+    for (let i = 1; i < piece.length; i++) {
+        if (piece[i].x - previous[i].x !== dx || piece[i].y - previous[i].y !== dy) return null;
+    }
+    return { dx, dy };
+}
+
+// Top-level state fields carried by snapshots and deltas
+const STATE_FIELDS = ['piece', 'next', 'score', 'lines', 'level', 'game_over', 'paused', 'flash'];
+
+// Particle simulation runs at the server's tick rate
+const PARTICLE_STEP_MS = 1000 / 60;
+const PARTICLE_COUNT = 15;
+const PARTICLE_LIFETIME = 60;
+const MAX_PARTICLES = 500;
+
+/**
+ * Particle created locally from an effect event.
+ */
+class LocalParticle {
+    constructor(x, y, color, random) {
+        this.x = x;
+        this.y = y;
+        this.vx = random() * 6 - 3;
+        this.vy = random() * 6 - 8;
+        this.color = color;
+        this.size = random() * 4 + 2;
+        this.life = PARTICLE_LIFETIME;
+        this.rotation = random() * 360;
+        this.rotationSpeed = random() * 10 - 5;
+    }
+    
+    update() {
+        this.x += this.vx;
+        this.y += this.vy;
+        this.vy += 0.3;  // Gravity
+        this.rotation += this.rotationSpeed;
+        this.life -= 1;
+        this.size = Math.max(0.1, this.size * 0.995);
+    }
+    
+    get alpha() {
+        return Math.floor(255 * this.life / PARTICLE_LIFETIME);
+    }
+    
+    isDead() {
+        return this.life <= 0 || this.size <= 0.1;
+    }
+}
+
 class ZenTetrisClient {
     constructor() {
         this.ws = null;
         this.connected = false;
+        
+        // Session to resume after a reload or reconnect, and the worker owning it
+        this.sessionId = sessionStorage.getItem(SESSION_STORAGE_KEY);
+        this.serverUrl = null;
+        this.redirecting = false;
+        // Set when the server evicted an inactive session; a key press reconnects
+        this.evicted = false;
         this.gameState = null;
         this.blockSize = 30;
         this.boardOffsetX = 0;
         this.boardOffsetY = 0;
         
+        // Palette and piece tables from the snapshot or binary hello
+        this.tables = null;
+        
+        // Protocol 2 state: board rows and fields
+        this.proto = null;
+        this.boardCells = [];
+        
+        // Particles simulated locally from effect events
+        this.particles = [];
+        this.particleTime = 0;
+        
+        // Current piece glide between states
+        this.glide = { piece: null, from: { dx: 0, dy: 0 }, start: 0, duration: 0, lastState: 0 };
+        
         // Canvas elements
         this.canvas = document.getElementById('gameCanvas');
         this.ctx = this.canvas.getContext('2d');
@@ -40,12 +154,18 @@ class ZenTetrisClient {
     
     connect() {
         const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-        const wsUrl = `${protocol}//${window.location.host}/ws`;
+        let query = WIRE_FORMAT === 'binary' ? 'format=binary' : `v=${PROTOCOL_VERSION}`;
+        if (this.sessionId) {
+            query += `&session=${encodeURIComponent(this.sessionId)}`;
+        }
+        const server = this.serverUrl || `${protocol}//${window.location.host}`;
+        const wsUrl = `${server}/ws?${query}`;
         
         console.log('🎋 Connecting to ZEN Tetris server...');
         this.updateConnectionStatus('接続中...', false);
         
         this.ws = new WebSocket(wsUrl);
+        this.ws.binaryType = 'arraybuffer';
         
         this.ws.onopen = () => {
             console.log('🎋 Connected to ZEN Tetris server!');
@@ -55,9 +175,36 @@ class ZenTetrisClient {
         
         this.ws.onmessage = (event) => {
             try {
+                if (event.data instanceof ArrayBuffer) {
+                    if (this.tables) {
+                        this.setState(this.decodeBinaryFrame(event.data));
+                    }
+                    return;
+                }
+                
                 const data = JSON.parse(event.data);
-                if (data.type === 'game_state') {
-                    this.gameState = data;
+                if (data.type === 'session') {
+                    this.sessionId = data.id;
+                    sessionStorage.setItem(SESSION_STORAGE_KEY, data.id);
+                } else if (data.type === 'redirect') {
+                    // Our session lives on another worker
+                    this.serverUrl = data.worker;
+                    this.redirecting = true;
+                } else if (data.type === 'evicted') {
+                    // No input for too long; the game is saved and resumes on the next key press
+                    this.evicted = true;
+                } else if (data.type === 'hello') {
+                    if (data.binary_version !== BINARY_FORMAT_VERSION) {
+                        console.warn('🎋 Unsupported binary frame version:', data.binary_version);
+                    }
+                    this.setTables(data);
+                } else if (data.type === 'game_state') {
+                    this.setState(data);
+                } else if (data.type === 'snapshot') {
+                    this.applySnapshot(data);
+                    this.updateUI();
+                } else if (data.type === 'delta') {
+                    this.applyDelta(data);
                     this.updateUI();
                 }
             } catch (error) {
@@ -68,14 +215,20 @@ class ZenTetrisClient {
         this.ws.onclose = () => {
             console.log('🎋 Disconnected from server');
             this.connected = false;
+            if (this.evicted) {
+                this.updateConnectionStatus('放置のため切断 (キーで再開)', false);
+                return;
+            }
             this.updateConnectionStatus('切断', false);
             
-            // Attempt to reconnect after 3 seconds
+            // Follow a redirect at once, otherwise attempt to reconnect after 3 seconds
+            const delay = this.redirecting ? 0 : 3000;
+            this.redirecting = false;
             setTimeout(() => {
                 if (!this.connected) {
                     this.connect();
                 }
-            }, 3000);
+            }, delay);
         };
         
         this.ws.onerror = (error) => {
@@ -91,6 +244,11 @@ class ZenTetrisClient {
     
     setupEventListeners() {
         document.addEventListener('keydown', (event) => {
+            if (this.evicted) {
+                this.evicted = false;
+                this.connect();
+                return;
+            }
             if (!this.connected) return;
             
             let action = null;
@@ -145,6 +303,283 @@ class ZenTetrisClient {
         }
     }
     
+    setTables(data) {
+        // Shape order matches the palette: shape i has palette index i + 1
+        const shapes = Object.keys(data.pieces);
+        const shapeColors = {};
+        shapes.forEach((shape, index) => {
+            shapeColors[shape] = data.palette[index + 1];
+        });
+        
+        this.tables = {
+            palette: data.palette,
+            pieces: data.pieces,
+            shapes: shapes,
+            shapeColors: shapeColors
+        };
+    }
+    
+    decodeBinaryFrame(buffer) {
+        const view = new DataView(buffer);
+        const palette = this.tables.palette;
+        const shapes = this.tables.shapes;
+        
+        // Header
+        const flags = view.getUint8(1);
+        const shape = view.getUint8(12);
+        const next = view.getUint8(16);
+        const flashMask = view.getUint32(17, true);
+        let offset = BINARY_HEADER_SIZE;
+        
+        // Board: two 4-bit palette indices per byte, low nibble first
+        const board = [];
+        for (let y = 0; y < 20; y++) {
+            const row = [];
+            for (let x = 0; x < 10; x++) {
+                const cell = y * 10 + x;
+                const byte = view.getUint8(offset + (cell >> 1));
+                const index = cell & 1 ? byte >> 4 : byte & 0x0f;
+                row.push({ filled: index !== 0, color: palette[index] });
+            }
+            board.push(row);
+        }
+        offset += 100;
+        
+        // Events: type, seed and row count, then each row's y and packed cells
+        const events = [];
+        const count = view.getUint8(offset);
+        offset += 1;
+        for (let i = 0; i < count; i++) {
+            const type = EVENT_TYPES[view.getUint8(offset)];
+            const seed = view.getUint32(offset + 1, true);
+            const rowCount = view.getUint8(offset + 5);
+            offset += EVENT_RECORD_SIZE;
+            
+            const rows = [];
+            const colors = [];
+            for (let r = 0; r < rowCount; r++) {
+                rows.push(view.getUint8(offset));
+                const row = [];
+                for (let x = 0; x < 10; x++) {
+                    const byte = view.getUint8(offset + 1 + (x >> 1));
+                    row.push(palette[x & 1 ? byte >> 4 : byte & 0x0f]);
+                }
+                colors.push(row);
+                offset += 6;
+            }
+            events.push({ type: type, seed: seed, rows: rows, colors: colors });
+        }
+        
+        const flashLines = [];
+        for (let y = 0; y < 20; y++) {
+            if (flashMask & (1 << y)) flashLines.push(y);
+        }
+        
+        let currentPiece = [];
+        let ghostPiece = [];
+        if (shape) {
+            const blocks = this.pieceBlocks(shapes[shape - 1], view.getUint8(13),
+                                            view.getInt8(14), view.getInt8(15));
+            currentPiece = blocks.filter(isVisible);
+            ghostPiece = this.ghostBlocks(blocks, board);
+        }
+        
+        return {
+            type: 'game_state',
+            board: board,
+            current_piece: currentPiece,
+            ghost_piece: ghostPiece,
+            next_piece: next ? this.pieceBlocks(shapes[next - 1], 0, 0, 0) : [],
+            score: view.getUint32(2, true),
+            lines: view.getUint32(6, true),
+            level: view.getUint16(10, true),
+            game_over: (flags & 1) !== 0,
+            paused: (flags & 2) !== 0,
+            flash_lines: flashLines,
+            events: events
+        };
+    }
+    
+    setState(state) {
+        // Full protocol 1 state, from JSON or a decoded binary frame
+        for (const event of state.events || []) {
+            this.handleEvent(event);
+        }
+        if (!state.ghost_piece && state.current_piece) {
+            // Protocol 1 JSON only sends the visible blocks
+            state.ghost_piece = this.ghostBlocks(state.current_piece, state.board);
+        }
+        state.particles = this.particles;
+        this.gameState = state;
+        this.updateUI();
+    }
+    
+    applySnapshot(data) {
+        this.setTables(data);
+        
+        this.proto = {
+            rows: data.board.slice(),
+            fields: {},
+            frame: data.frame
+        };
+        for (const name of STATE_FIELDS) {
+            this.proto.fields[name] = data[name];
+        }
+        this.boardCells = this.proto.rows.map((row) => this.decodeRow(row));
+        this.particles = [];
+        this.rebuildState();
+    }
+    
+    applyDelta(data) {
+        if (!this.proto) return;
+        
+        if (data.rows) {
+            for (const [y, row] of data.rows) {
+                this.proto.rows[y] = row;
+                this.boardCells[y] = this.decodeRow(row);
+            }
+        }
+        for (const name of STATE_FIELDS) {
+            if (name in data) {
+                this.proto.fields[name] = data[name];
+            }
+        }
+        if (data.events) {
+            for (const event of data.events) {
+                this.handleEvent(event);
+            }
+        }
+        this.proto.frame = data.frame;
+        this.rebuildState();
+    }
+    
+    decodeRow(row) {
+        const cells = [];
+        for (const digit of row) {
+            const index = parseInt(digit, 16);
+            cells.push({ filled: index !== 0, color: this.tables.palette[index] });
+        }
+        return cells;
+    }
+    
+    pieceBlocks(shape, rotation, x, y) {
+        const color = this.tables.shapeColors[shape];
+        return this.tables.pieces[shape][rotation].map(([dx, dy]) => ({
+            x: x + dx,
+            y: y + dy,
+            color: color
+        }));
+    }
+    
+    ghostBlocks(blocks, board) {
+        // Where a hard drop would land: one row above the first filled cell
+        // under any block, found from the column tops
+        if (!blocks.length || !board) return [];
+        const tops = [];
+        for (let x = 0; x < 10; x++) {
+            let y = 0;
+            while (y < 20 && !board[y][x].filled) y++;
+            tops.push(y);
+        }
+        let drop = Math.min(...blocks.map((block) => tops[block.x] - block.y - 1));
+        if (drop < 0) {
+            // Tucked under an overhang: step down until a block would hit something
+            const free = (block, dy) => {
+                const y = block.y + dy;
+                return y < 20 && (y < 0 || !board[y][block.x].filled);
+            };
+            drop = 0;
+            while (blocks.every((block) => free(block, drop + 1))) drop++;
+        }
+        if (drop === 0) return [];
+        return blocks
+            .map((block) => ({ x: block.x, y: block.y + drop, color: block.color }))
+            .filter(isVisible);
+    }
+    
+    rebuildState() {
+        // Same shape as a protocol 1 game_state message
+        const fields = this.proto.fields;
+        let currentPiece = [];
+        let ghostPiece = [];
+        if (fields.piece) {
+            const [shape, rotation, x, y] = fields.piece;
+            const blocks = this.pieceBlocks(shape, rotation, x, y);
+            currentPiece = blocks.filter(isVisible);
+            ghostPiece = this.ghostBlocks(blocks, this.boardCells);
+        }
+        
+        this.gameState = {
+            type: 'game_state',
+            board: this.boardCells,
+            current_piece: currentPiece,
+            ghost_piece: ghostPiece,
+            next_piece: fields.next ? this.pieceBlocks(fields.next, 0, 0, 0) : [],
+            score: fields.score,
+            lines: fields.lines,
+            level: fields.level,
+            game_over: fields.game_over,
+            paused: fields.paused,
+            flash_lines: fields.flash,
+            particles: this.particles
+        };
+    }
+    
+    handleEvent(event) {
+        const random = seededRandom(event.seed);
+        if (event.type === 'line_clear') {
+            event.rows.forEach((lineY, i) => {
+                const row = event.colors[i];
+                for (let x = 0; x < row.length; x++) {
+                    // Protocol 2 sends hex palette digits, the others RGB arrays
+                    const cell = row[x];
+                    const color = typeof cell === 'string' ? this.tables.palette[parseInt(cell, 16)] : cell;
+                    if (color) {
+                        this.createExplosion(x * this.blockSize + this.blockSize / 2,
+                                             lineY * this.blockSize + this.blockSize / 2,
+                                             color, PARTICLE_COUNT, random);
+                    }
+                }
+            });
+        } else if (event.type === 'tetris') {
+            const golden = [255, 215, 0];
+            for (let i = 0; i < 80; i++) {
+                this.particles.push(new LocalParticle(
+                    random() * this.canvas.width, random() * this.canvas.height, golden, random
+                ));
+            }
+        }
+    }
+    
+    createExplosion(x, y, color, count, random) {
+        for (let i = 0; i < count; i++) {
+            this.particles.push(new LocalParticle(
+                x + random() * 20 - 10, y + random() * 20 - 10, color, random
+            ));
+        }
+    }
+    
+    updateParticles(currentTime) {
+        if (!this.particleTime) {
+            this.particleTime = currentTime;
+        }
+        // Step at the server tick rate, independent of the display refresh rate
+        while (currentTime - this.particleTime >= PARTICLE_STEP_MS) {
+            this.particleTime += PARTICLE_STEP_MS;
+            if (this.particles.length === 0) continue;
+            for (const particle of this.particles) {
+                particle.update();
+            }
+            this.particles = this.particles.filter((particle) => !particle.isDead());
+        }
+        if (this.particles.length > MAX_PARTICLES) {
+            this.particles = this.particles.slice(-MAX_PARTICLES);
+        }
+        if (this.gameState) {
+            this.gameState.particles = this.particles;
+        }
+    }
+    
     updateUI() {
         if (!this.gameState) return;
         
@@ -173,9 +608,13 @@ class ZenTetrisClient {
             return;
         }
         
+        this.updateParticles(currentTime);
+        this.updateGlide(currentTime);
+        
         this.clearCanvas();
         this.drawBoard();
-        this.drawCurrentPiece();
+        this.drawGhostPiece();
+        this.drawCurrentPiece(currentTime);
         this.drawFlashEffect();
         this.drawParticles();
         this.drawNextPiece();
@@ -229,11 +668,47 @@ class ZenTetrisClient {
         }
     }
     
-    drawCurrentPiece() {
+    drawGhostPiece() {
+        if (!this.gameState.ghost_piece) return;
+        
+        const ctx = this.ctx;
+        const size = this.blockSize;
+        ctx.lineWidth = 2;
+        for (const block of this.gameState.ghost_piece) {
+            const [r, g, b] = block.color;
+            ctx.strokeStyle = `rgba(${r}, ${g}, ${b}, 0.5)`;
+            ctx.strokeRect(block.x * size + 2, block.y * size + 2, size - 4, size - 4);
+        }
+    }
+    
+    updateGlide(currentTime) {
+        // Start a glide when a new state moved the piece by a cell or two
+        const glide = this.glide;
+        const piece = this.gameState.current_piece;
+        if (piece === glide.piece) return;
+        
+        const shift = pieceShift(glide.piece, piece);
+        glide.piece = piece;
+        glide.duration = Math.min(MAX_GLIDE_MS, currentTime - glide.lastState);
+        glide.lastState = currentTime;
+        if (shift && (shift.dx || shift.dy) &&
+            Math.abs(shift.dx) <= MAX_GLIDE_CELLS && Math.abs(shift.dy) <= MAX_GLIDE_CELLS) {
+            glide.from = { dx: -shift.dx, dy: -shift.dy };
+            glide.start = currentTime;
+        } else {
+            glide.from = { dx: 0, dy: 0 };
+        }
+    }
+    
+    drawCurrentPiece(currentTime) {
         if (!this.gameState.current_piece) return;
         
+        const glide = this.glide;
+        const remaining = glide.duration > 0 ? Math.max(0, 1 - (currentTime - glide.start) / glide.duration) : 0;
+        const offsetX = glide.from.dx * remaining;
+        const offsetY = glide.from.dy * remaining;
         for (const block of this.gameState.current_piece) {
-            this.drawBlock(block.x, block.y, block.color, this.ctx);
+            this.drawBlock(block.x + offsetX, block.y + offsetY, block.color, this.ctx);
         }
     }
     